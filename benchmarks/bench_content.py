@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'index du contenu : débit d'extraction et d'indexation en Mo/s
+
+Usage: python benchmarks/bench_content.py [--books 40] [--chapters 30] [--kb 60] [--workers N]
+
+Génère des EPUB synthétiques (`--chapters` documents XHTML de `--kb` Ko
+par livre), compare le retrait du balisage (ancien EPDFViewer.clean_html_tags
+sur le document entier, MarkupStripper par blocs de 64 Ko), puis indexe
+les livres avec content_index.ContentIndexer dans une base temporaire.
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_index import (CONTENT_READ_BLOCK, ContentIndexer, MarkupStripper,  # noqa: E402
+                           init_content_index, search_content)
+from library_db import LibraryDB  # noqa: E402
+
+WORDS = ['prince', 'Mychkine', 'Rogojine', 'Nastassia', 'Aglaé', 'général', 'salon', 'lettre', 'été',
+         'Pétersbourg', 'épileptique', 'idiot', 'cœur', 'train', 'jardin', 'maison', 'soir', 'rire']
+
+
+def chapter_xhtml(rng: random.Random, n: int, size: int) -> str:
+    parts = [f'<?xml version="1.0" encoding="utf-8"?>\n<html xmlns="http://www.w3.org/1999/xhtml">'
+             f'<head><title>Livre</title><style>p {{ margin: 0 }}</style></head>'
+             f'<body><h2 class="chapitre">Chapitre {n}</h2>']
+    length = 0
+    while length < size:
+        words = ' '.join(rng.choices(WORDS, k=rng.randint(30, 80)))
+        paragraph = f'<p class="texte">{words}, <em>dit-il</em> &mdash; <span>{rng.choice(WORDS)}</span>.</p>\n'
+        parts.append(paragraph)
+        length += len(paragraph)
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def write_epub(path: Path, rng: random.Random, chapters: int, size: int):
+    manifest = ''.join(f'<item id="c{i}" href="c{i}.xhtml" media-type="application/xhtml+xml"/>'
+                       for i in range(chapters))
+    spine = ''.join(f'<itemref idref="c{i}"/>' for i in range(chapters))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('mimetype', 'application/epub+zip')
+        zf.writestr('META-INF/container.xml',
+                    '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+                    '<rootfile full-path="OEBPS/content.opf"/></rootfiles></container>')
+        zf.writestr('OEBPS/content.opf',
+                    '<package xmlns="http://www.idpf.org/2007/opf"><metadata/>'
+                    f'<manifest>{manifest}</manifest><spine>{spine}</spine></package>')
+        for i in range(chapters):
+            zf.writestr(f'OEBPS/c{i}.xhtml', chapter_xhtml(rng, i + 1, size))
+
+
+def clean_html_tags(text: str) -> str:
+    """Ancienne version (main.py)"""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = text.replace('&nbsp;', ' ')
+    text = text.replace('&lt;', '<')
+    text = text.replace('&gt;', '>')
+    text = text.replace('&amp;', '&')
+    text = text.replace('&quot;', '"')
+    text = text.replace('&#39;', "'")
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=40)
+    parser.add_argument('--chapters', type=int, default=30)
+    parser.add_argument('--kb', type=int, default=60)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        books = []
+        for i in range(args.books):
+            path = tmp / f"livre{i:04d}.epub"
+            write_epub(path, rng, args.chapters, args.kb * 1024)
+            st = path.stat()
+            books.append({'name': path.name, 'path': path, 'type': 'epub',
+                          'size': st.st_size, 'mtime': st.st_mtime})
+
+        sample = chapter_xhtml(rng, 1, 4 * 1024 * 1024)
+        mb = len(sample.encode('utf-8')) / (1024 * 1024)
+        t0 = time.perf_counter()
+        clean_html_tags(sample)
+        old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        stripper = MarkupStripper()
+        for i in range(0, len(sample), CONTENT_READ_BLOCK):
+            stripper.feed(sample[i:i + CONTENT_READ_BLOCK])
+        stripper.close()
+        new = time.perf_counter() - t0
+        print(f"Balisage retiré ({mb:.1f} Mo XHTML): clean_html_tags {mb / old:.1f} Mo/s, "
+              f"MarkupStripper par blocs {mb / new:.1f} Mo/s")
+
+        db = LibraryDB(tmp / "bench.db")
+        with db.write("schéma") as con:
+            init_content_index(con)
+        indexer = ContentIndexer(db, max_workers=args.workers)
+        indexer.start(books)
+        while indexer.is_running():
+            time.sleep(0.2)
+        print(indexer.progress_text())
+
+        t0 = time.perf_counter()
+        with db.timed("recherche") as con:
+            hits = search_content(con, 'nastassia AND jardin*')
+        print(f"Recherche « nastassia AND jardin* »: {len(hits)} livre(s) en "
+              f"{(time.perf_counter() - t0) * 1000:.1f} ms")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
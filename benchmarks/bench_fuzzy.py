@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche approchée : index de trigrammes contre distance d'édition
+
+Usage: python benchmarks/bench_fuzzy.py [--books 100000] [--brute 20000]
+
+Construit fuzzy_index.TrigramIndex sur un listing synthétique (titres et
+auteurs tirés d'un grand vocabulaire), puis mesure des requêtes avec
+fautes de frappe. Référence: difflib.SequenceMatcher sur chaque livre
+d'un sous-ensemble de `--brute` livres, extrapolé à tout le listing.
+"""
+
+import argparse
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fuzzy_index import TrigramIndex  # noqa: E402
+from live_search import fold  # noqa: E402
+
+FIRST = ['Victor', 'Émile', 'Honoré', 'Gustave', 'Albert', 'Marguerite', 'George', 'Jules', 'Colette', 'Fiodor']
+SYLLABLES = ['ba', 'ri', 'lo', 'que', 'tan', 'mé', 'sor', 'vi', 'gne', 'dou', 'cha', 'pré', 'ïev', 'ski', 'to']
+QUERIES = ['dostoievsky', 'dostoyevski', 'victor hugp', 'miserables', 'flobert bovary', 'zolla germinale']
+
+
+def build(count: int):
+    rng = random.Random(42)
+    vocabulary = [''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(20000)]
+    vocabulary += ['misérables', 'germinal', 'bovary', 'étranger']
+    surnames = [w.capitalize() for w in rng.sample(vocabulary, 3000)] + ['Dostoïevski', 'Hugo', 'Zola', 'Flaubert']
+    books, metadata = [], {}
+    for i in range(count):
+        title = ' '.join(rng.sample(vocabulary, 3)).capitalize()
+        path = f"/bibliotheque/{i:06d}.epub"
+        books.append({'name': f"{title}.epub", 'path': Path(path), 'type': 'epub'})
+        metadata[path] = {'title': title, 'author': f"{rng.choice(FIRST)} {rng.choice(surnames)}"}
+    return books, metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--brute', type=int, default=20_000)
+    args = parser.parse_args()
+
+    books, metadata = build(args.books)
+    index = TrigramIndex()
+    index.build(books, metadata)
+    print(f"{args.books} livres: index construit en {index.build_ms:.0f} ms "
+          f"({len(index.words)} mots, {len(index.postings)} trigrammes)")
+
+    subset = books[:args.brute]
+    keys = [fold(f"{b['name']} {metadata[str(b['path'])]['author']}") for b in subset]
+    for text in QUERIES:
+        t0 = time.perf_counter()
+        ranked = index.search(text)
+        ms = (time.perf_counter() - t0) * 1000
+        top = ranked[0] if ranked else None
+        label = f"{metadata[str(books[top[0]]['path'])]['author']} ({top[1]:.2f})" if top else "-"
+
+        folded = fold(text)
+        t0 = time.perf_counter()
+        for key in keys:
+            difflib.SequenceMatcher(None, folded, key).ratio()
+        brute_ms = (time.perf_counter() - t0) * 1000 * args.books / len(subset)
+        print(f"  {text:18} trigrammes {ms:7.1f} ms  {len(ranked):4d} résultat(s), 1er: {label:28} "
+              f"difflib (extrapolé) {brute_ms:8.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
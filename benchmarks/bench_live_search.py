@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche instantanée : durée de chaque frappe
+
+Usage: python benchmarks/bench_live_search.py [--books 50000] [--text "victor hugo mis"]
+
+Tape `--text` caractère par caractère dans live_search.LiveSearch sur un
+listing synthétique, efface la saisie puis la retape. Pour chaque frappe :
+durée et origine du résultat (parcours complet, affinage des résultats
+précédents, cache), une fois les clés préparées.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from live_search import LiveSearch  # noqa: E402
+
+FIRST = ['Victor', 'Émile', 'Honoré', 'Gustave', 'Albert', 'Marguerite', 'George', 'Jules', 'Colette', 'Simone']
+LAST = ['Hugo', 'Zola', 'Balzac', 'Flaubert', 'Camus', 'Duras', 'Sand', 'Verne', 'Sagan', 'Beauvoir']
+WORDS = ['misérables', 'germinal', 'comédie', 'humaine', 'bovary', 'étranger', 'amant', 'mare', 'voyage',
+         'lune', 'tristesse', 'deuxième', 'sexe', 'nuit', 'mer', 'vingt', 'mille', 'lieues', 'cœur', 'temps']
+PUBLISHERS = ['Gallimard', 'Flammarion', 'Le Livre de Poche', 'Folio', 'Pocket', 'Actes Sud']
+
+
+def build(count: int):
+    rng = random.Random(42)
+    books, metadata = [], {}
+    for i in range(count):
+        title = ' '.join(rng.sample(WORDS, 3)).capitalize()
+        path = f"/bibliotheque/{i:06d}.epub"
+        books.append({'name': f"{title} {i}.epub", 'path': Path(path), 'type': 'epub'})
+        metadata[path] = {'title': title, 'author': f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                          'publisher': rng.choice(PUBLISHERS)}
+    return books, metadata
+
+
+def keystroke(live: LiveSearch, text: str, metadata) -> str:
+    before = (live.hits, live.narrowed, live.full_scans)
+    t0 = time.perf_counter()
+    results = live.filter(text, metadata)
+    ms = (time.perf_counter() - t0) * 1000
+    after = (live.hits, live.narrowed, live.full_scans)
+    source = {0: 'cache', 1: 'affinage', 2: 'complet'}.get(
+        next((i for i in range(3) if after[i] != before[i]), -1), 'vide')
+    return f"  {text!r:22} {ms:7.2f} ms  {source:9} {len(results)} résultat(s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=50_000)
+    parser.add_argument('--text', default='victor hugo mis')
+    args = parser.parse_args()
+
+    books, metadata = build(args.books)
+    live = LiveSearch()
+    live.reset(books)
+
+    t0 = time.perf_counter()
+    live.prepare(metadata)
+    while None in live._keys:
+        time.sleep(0.005)
+    print(f"{args.books} livres, clés calculées en arrière-plan (prepare) en "
+          f"{(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    print("Saisie:")
+    for n in range(1, len(args.text) + 1):
+        print(keystroke(live, args.text[:n], metadata))
+    print("Effacement:")
+    for n in range(len(args.text) - 1, 0, -1):
+        print(keystroke(live, args.text[:n], metadata))
+    print("Nouvelle saisie:")
+    for n in range(1, len(args.text) + 1):
+        print(keystroke(live, args.text[:n], metadata))
+
+
+if __name__ == '__main__':
+    main()
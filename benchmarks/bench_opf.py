@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la résolution de couverture sur un OPF synthétique géant
+
+Usage: python benchmarks/bench_opf.py [--items 50000] [--cover-metas 1]
+
+Compare l'ancien EPDFViewer.extract_epub_cover (double boucle sur tout
+l'arbre) à epub_reader.parse_package (index id -> href en un parcours) et
+à epub_reader.find_cover_path (iterparse, arrêt dès la couverture trouvée).
+--cover-metas ajoute des éléments name="cover" (chacun relançait un
+parcours complet dans l'ancien code).
+"""
+
+import argparse
+import sys
+import time
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from epub_reader import find_cover_path, parse_package  # noqa: E402
+
+CONTAINER = ('<?xml version="1.0"?><container version="1.0" '
+             'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+             '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+             '</rootfiles></container>')
+
+
+def build_epub(items: int, cover_metas: int, cover_position: str) -> bytes:
+    cover_index = {'start': 0, 'middle': items // 2, 'end': items - 1}[cover_position]
+    metas = ''.join(f'<meta name="cover" content="missing{i}"/>' for i in range(cover_metas - 1))
+    metas += f'<meta name="cover" content="item{cover_index}"/>'
+    manifest = ''.join(
+        f'<item id="item{i}" href="text/part{i:06d}.xhtml" media-type="application/xhtml+xml"/>'
+        if i != cover_index else
+        f'<item id="item{i}" href="images/cover.jpg" media-type="image/jpeg"/>'
+        for i in range(items))
+    spine = ''.join(f'<itemref idref="item{i}"/>' for i in range(0, items, 2))
+    opf = (f'<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="2.0">'
+           f'<metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Omnibus</dc:title>{metas}</metadata>'
+           f'<manifest>{manifest}</manifest><spine>{spine}</spine></package>')
+
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('META-INF/container.xml', CONTAINER)
+        zf.writestr('OEBPS/content.opf', opf)
+        zf.writestr('OEBPS/images/cover.jpg', b'\xff\xd8\xff')
+    return buf.getvalue()
+
+
+def legacy_cover_path(zf: zipfile.ZipFile):
+    """Logique de l'ancien extract_epub_cover, sans le décodage de l'image"""
+    root = ET.fromstring(zf.read('META-INF/container.xml'))
+    ns = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container'}
+    opf_path = root.find('.//c:rootfile', ns).get('full-path')
+    opf_dir = str(Path(opf_path).parent)
+    opf_root = ET.fromstring(zf.read(opf_path))
+    for meta in opf_root.iter():
+        if meta.get('name') == 'cover':
+            cover_id = meta.get('content')
+            for item in opf_root.iter():
+                if item.get('id') == cover_id:
+                    href = item.get('href')
+                    if href:
+                        cover_path = f"{opf_dir}/{href}".replace('//', '/')
+                        if cover_path in zf.NameToInfo:
+                            return cover_path
+    return None
+
+
+def timed(fn, data: bytes, repeat: int):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        with zipfile.ZipFile(BytesIO(data)) as zf:
+            t0 = time.perf_counter()
+            result = fn(zf)
+            best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=50_000)
+    parser.add_argument('--cover-metas', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    methods = [
+        ("ancien (double iter)", legacy_cover_path),
+        ("parse_package", lambda zf: parse_package(zf).cover_path),
+        ("find_cover_path", lambda zf: find_cover_path(zf, 'OEBPS/content.opf')),
+    ]
+
+    for position in ('start', 'middle', 'end'):
+        data = build_epub(args.items, args.cover_metas, position)
+        print(f"OPF {args.items} items, {args.cover_metas} meta(s) cover, couverture au {position}:")
+        for label, fn in methods:
+            ms, path = timed(fn, data, args.repeat)
+            print(f"  {label:22} {ms:9.1f} ms  -> {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark des métadonnées PDF : PyPDF2 (lecture complète) contre lecteur mmap
+
+Usage: python benchmarks/bench_pdf_meta.py CORPUS [--limit 500] [--repeat 3]
+
+CORPUS est un dossier de PDF (parcouru récursivement). Affiche le temps
+par fichier des deux lecteurs, le nombre de fichiers pour lesquels le
+lecteur rapide a dû passer la main à PyPDF2 et les champs qui diffèrent.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pdf_reader import read_pdf_metadata_fast, read_pdf_metadata_pypdf  # noqa: E402
+
+
+def timed(fn, path: Path, repeat: int):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            result = fn(path)
+        except Exception as e:
+            result = e
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def summary(label: str, times):
+    p95 = sorted(times)[min(len(times) - 1, int(len(times) * 0.95))]
+    print(f"{label:10} médiane {statistics.median(times):8.2f} ms  p95 {p95:8.2f} ms  "
+          f"max {max(times):8.2f} ms  total {sum(times) / 1000:7.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpus', type=Path)
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(p for p in args.corpus.rglob('*') if p.suffix.lower() == '.pdf')[:args.limit]
+    if not paths:
+        print("Aucun PDF trouvé dans le corpus")
+        return 1
+    total_mb = sum(p.stat().st_size for p in paths) / (1024 * 1024)
+    print(f"{len(paths)} PDF ({total_mb:.1f} Mo)")
+
+    fast_times, pypdf_times = [], []
+    fallbacks, mismatches = [], []
+    for path in paths:
+        ms, fast = timed(read_pdf_metadata_fast, path, args.repeat)
+        fast_times.append(ms)
+        ms, reference = timed(read_pdf_metadata_pypdf, path, args.repeat)
+        pypdf_times.append(ms)
+
+        if isinstance(fast, Exception):
+            fallbacks.append((path.name, fast))
+            continue
+        # PyPDF2 ne lit ni XMP ni /Lang: seuls ses champs non vides sont comparés
+        diff = [k for k, v in reference.items() if v and fast.get(k) != v]
+        if diff:
+            mismatches.append((path.name, diff))
+
+    summary("PyPDF2", pypdf_times)
+    summary("mmap", fast_times)
+    print(f"Repli sur PyPDF2: {len(fallbacks)} fichier(s)")
+    for name, error in fallbacks[:20]:
+        print(f"  {name}: {error!r}")
+    print(f"Champs différents: {len(mismatches)} fichier(s)")
+    for name, fields in mismatches[:20]:
+        print(f"  {name}: {', '.join(fields)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark du rendu de la grille : durée d'une frame de défilement
+
+Usage: python benchmarks/bench_render.py [--books 2000] [--size 1920x1080] [--frames 300] [--covers 0.8]
+
+Ouvre EPDFViewer (pilote vidéo « dummy » par défaut, base dans un dossier
+temporaire) sur un listing synthétique dont une part `--covers` a une
+couverture en cache, puis fait défiler la grille de quelques pixels par
+frame : la grille entière est redessinée à chaque frame. Mesuré avec les
+cartes précomposées (un blit par carte), puis cartes redessinées à chaque
+frame avec le cache de textes, puis sans aucun cache (chaque libellé
+rendu à chaque frame).
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from main import EPDFViewer  # noqa: E402
+from surface_cache import SurfaceCache  # noqa: E402
+
+FIRST = ['Victor', 'Émile', 'Honoré', 'Gustave', 'Albert', 'Marguerite', 'George', 'Jules', 'Colette', 'Simone']
+LAST = ['Hugo', 'Zola', 'Balzac', 'Flaubert', 'Camus', 'Duras', 'Sand', 'Verne', 'Sagan', 'Beauvoir']
+WORDS = ['misérables', 'germinal', 'comédie', 'humaine', 'bovary', 'étranger', 'amant', 'mare', 'voyage',
+         'lune', 'tristesse', 'deuxième', 'sexe', 'nuit', 'mer', 'vingt', 'mille', 'lieues', 'cœur', 'temps']
+
+
+def fill_library(app: EPDFViewer, count: int, covers: float):
+    rng = random.Random(42)
+    books = []
+    # Toutes les couvertures restent en mémoire (pas d'éviction pendant la mesure)
+    app.cover_cache.max_bytes = count * (app.card_width - 10) * 200 * 4
+    for i in range(count):
+        title = ' '.join(rng.sample(WORDS, 3)).capitalize()
+        book_type = 'epub' if i % 4 else 'pdf'
+        path = Path(f"/bibliotheque/{i:06d}.{book_type}")
+        books.append({'name': f"{title} {i}.{book_type}", 'path': path, 'type': book_type,
+                      'size': rng.randint(100_000, 20_000_000), 'mtime': 0.0})
+        app.book_metadata[str(path)] = {'title': title, 'author': f"{rng.choice(FIRST)} {rng.choice(LAST)}"}
+        if rng.random() < covers:
+            cover = pygame.Surface((app.card_width - 10, 200))
+            cover.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+            app.cover_cache.put(str(path), app.to_display_format(cover))
+    app.all_books = books
+    app.books = books.copy()
+    app.update_scroll_limits()
+
+
+def scroll_frames(app: EPDFViewer, frames: int) -> float:
+    """Durée moyenne (ms) d'une frame de défilement"""
+    app.scroll_to(0)
+    app.render()
+    step = 3
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        if not 0 <= app.scroll_offset + step <= app.max_scroll:
+            step = -step
+        app.scroll_to(app.scroll_offset + step)
+        app.render()
+    return (time.perf_counter() - t0) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=2000)
+    parser.add_argument('--size', default='1920x1080')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--covers', type=float, default=0.8)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split('x'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        app = EPDFViewer()
+        app.width, app.height = width, height
+        app.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        app.scrollbar_x = width - app.scrollbar_width - 5
+        fill_library(app, args.books, args.covers)
+        start, end = app.visible_book_range()
+        print(f"{args.books} livres, fenêtre {width}x{height}, {end - start} cartes dessinées par frame")
+
+        composited = scroll_frames(app, args.frames)
+        print(f"Cartes précomposées:        {composited:6.2f} ms/frame "
+              f"({len(app.card_cache)} cartes, {app.card_cache.stats_text()})")
+
+        app.render_book_card = lambda x, y, book: app.draw_book_card(app.screen, x, y, book)
+        cached = scroll_frames(app, args.frames)
+        print(f"Cartes redessinées, textes: {cached:6.2f} ms/frame "
+              f"({len(app.text_cache)} textes, {app.text_cache.stats_text()})")
+
+        app.text_cache = SurfaceCache(max_bytes=0)
+        uncached = scroll_frames(app, args.frames)
+        print(f"Sans aucun cache:           {uncached:6.2f} ms/frame")
+
+        app.indexer.cancel()
+        app.cover_loader.stop()
+        app.db.close()
+        pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark du scan de dossiers : ancien glob/rglob contre scanner.scan_books
+
+Usage: python benchmarks/bench_scan.py [--files 100000] [--dirs 500] [--root DIR]
+
+Sans --root, une arborescence synthétique est créée dans un dossier
+temporaire (fichiers vides .epub/.pdf/.PDF/.txt). Avec --root, le scan est
+mesuré sur un dossier existant (partage NFS/SMB par exemple).
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scanner import scan_books  # noqa: E402
+
+
+def legacy_scan(path: Path, recursive: bool):
+    """Copie de l'ancien EPDFViewer.scan_directory (3 lectures + stat() séparés)"""
+    books = []
+    if not recursive:
+        for d in path.iterdir():
+            if d.is_dir() and not d.name.startswith('.'):
+                books.append({'name': d.name, 'path': d, 'type': 'folder', 'size': 0})
+
+    if recursive:
+        epub_files = list(path.rglob("*.epub"))
+        pdf_files = list(path.rglob("*.pdf"))
+    else:
+        epub_files = list(path.glob("*.epub"))
+        pdf_files = list(path.glob("*.pdf"))
+
+    for f in epub_files:
+        books.append({'name': f.name, 'path': f, 'type': 'epub', 'size': f.stat().st_size})
+    for f in pdf_files:
+        books.append({'name': f.name, 'path': f, 'type': 'pdf', 'size': f.stat().st_size})
+    return books
+
+
+def build_tree(root: Path, files: int, dirs: int):
+    extensions = ['.epub', '.pdf', '.epub', '.PDF', '.txt']
+    per_dir = max(1, files // dirs)
+    created = 0
+    for d in range(dirs):
+        sub = root / f"auteur_{d:05d}"
+        sub.mkdir()
+        for i in range(per_dir):
+            (sub / f"livre_{i:05d}{extensions[i % len(extensions)]}").touch()
+            created += 1
+    # Quelques livres à la racine pour le scan non récursif
+    for i in range(200):
+        (root / f"racine_{i:03d}{extensions[i % len(extensions)]}").touch()
+    return created + 200
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=100_000)
+    parser.add_argument('--dirs', type=int, default=500)
+    parser.add_argument('--root', type=Path, default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = None
+    root = args.root
+    if root is None:
+        tmp = tempfile.mkdtemp(prefix="bench_scan_")
+        root = Path(tmp)
+        t0 = time.perf_counter()
+        total = build_tree(root, args.files, args.dirs)
+        print(f"Arborescence: {total} fichiers, {args.dirs} dossiers "
+              f"({time.perf_counter() - t0:.1f} s de création)")
+
+    try:
+        for recursive in (False, True):
+            label = "récursif" if recursive else "dossier seul"
+            t_old, old = timed(legacy_scan, root, recursive, repeat=args.repeat)
+            t_new, new = timed(scan_books, root, recursive, repeat=args.repeat)
+            old_books = sum(1 for b in old if b['type'] != 'folder')
+            new_books = sum(1 for b in new if b['type'] != 'folder')
+            print(f"[{label}] glob/rglob : {t_old * 1000:9.1f} ms  ({old_books} livres)")
+            print(f"[{label}] scandir    : {t_new * 1000:9.1f} ms  ({new_books} livres, "
+                  f"x{t_old / t_new if t_new else 0:.1f})")
+        print("Note: scandir trouve aussi les extensions en majuscules (.PDF)")
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche : index FTS5 contre regex sur toutes les lignes
+
+Usage: python benchmarks/bench_search.py [--books 100000] [--repeat 5]
+
+Crée une base temporaire de livres synthétiques (table `books` identique à
+celle de l'application), l'indexe avec search_index.init_search_index puis
+mesure quelques requêtes typiques.
+"""
+
+import argparse
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from library_db import CACHE_KB, MMAP_BYTES  # noqa: E402
+from search_index import init_search_index, parse_search, search  # noqa: E402
+
+FIRST = ['Victor', 'Émile', 'Honoré', 'Gustave', 'Albert', 'Marguerite', 'George', 'Jules', 'Colette', 'Simone']
+LAST = ['Hugo', 'Zola', 'Balzac', 'Flaubert', 'Camus', 'Duras', 'Sand', 'Verne', 'Sagan', 'Beauvoir']
+WORDS = ['misérables', 'germinal', 'comédie', 'humaine', 'bovary', 'étranger', 'amant', 'mare', 'voyage',
+         'lune', 'tristesse', 'deuxième', 'sexe', 'nuit', 'mer', 'vingt', 'mille', 'lieues', 'cœur', 'temps']
+PUBLISHERS = ['Gallimard', 'Flammarion', 'Le Livre de Poche', 'Folio', 'Pocket', 'Actes Sud']
+
+QUERIES = ['hugo', 'miser', '"comédie humaine"', 'auteur:zola titre:germ', 'voyage OR lune',
+           'editeur:folio mer', 'miser NOT hugo']
+
+
+def build(db_path: str, count: int):
+    con = sqlite3.connect(db_path)
+    # Mêmes réglages que library_db.LibraryDB
+    con.execute("PRAGMA journal_mode=WAL;")
+    con.execute("PRAGMA synchronous=NORMAL;")
+    con.execute(f"PRAGMA cache_size=-{CACHE_KB};")
+    con.execute(f"PRAGMA mmap_size={MMAP_BYTES};")
+    con.execute("""
+    CREATE TABLE books (
+        id INTEGER PRIMARY KEY, name TEXT, path TEXT UNIQUE, type TEXT, size INTEGER,
+        title TEXT, author TEXT, publisher TEXT, description TEXT, language TEXT, date TEXT, mtime REAL
+    )
+    """)
+    init_search_index(con)
+    rng = random.Random(42)
+    # Vocabulaire des résumés: quelques milliers de mots, fréquences de Zipf.
+    # Les mots des titres sont de fréquence moyenne, les plus fréquents jouent
+    # le rôle des mots vides (« de », « la ») et donnent le pire cas.
+    syllables = ['ba', 'ri', 'lo', 'que', 'tan', 'mé', 'sor', 'vi', 'gne', 'dou', 'cha', 'pré']
+    generated = [''.join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(5000)]
+    vocabulary = generated[:50] + WORDS + generated[50:]
+    zipf = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    rows = []
+    for i in range(count):
+        title = ' '.join(rng.sample(WORDS, 2) + rng.choices(generated[50:], k=2)).capitalize()
+        author = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        rows.append((f"{title} {i}.epub", f"/bibliotheque/{i:06d}.epub", 'epub', 1000, title, author,
+                     rng.choice(PUBLISHERS), ' '.join(rng.choices(vocabulary, zipf, k=60)), 'fr', '2001', 0.0))
+    t0 = time.perf_counter()
+    with con:
+        con.executemany("INSERT INTO books(name, path, type, size, title, author, publisher, description, "
+                        "language, date, mtime) VALUES(?,?,?,?,?,?,?,?,?,?,?)", rows)
+    print(f"{count} livres insérés (triggers FTS compris) en {time.perf_counter() - t0:.1f} s")
+    return con, generated[0]
+
+
+def best_of(fn, repeat: int):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--books', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        con, stop_word = build(str(Path(tmp) / 'books.db'), args.books)
+
+        for text in QUERIES + [stop_word, f'"{stop_word} {stop_word}"']:
+            fts_query, _ = parse_search(text)
+            ms, rows = best_of(lambda: search(con, fts_query), args.repeat)
+            print(f"FTS5   {text:28} {ms:8.1f} ms  {len(rows)} résultat(s)")
+
+        # Référence: toutes les lignes lues puis filtrées en Python
+        regex = re.compile('hugo', re.IGNORECASE)
+
+        def scan():
+            return [r for r in con.execute("SELECT path, name, author, publisher FROM books")
+                    if any(v and regex.search(v) for v in r[1:])]
+        ms, rows = best_of(scan, args.repeat)
+        print(f"regex  {'hugo':28} {ms:8.1f} ms  {len(rows)} résultat(s)")
+        con.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark des vignettes : Image.open + thumbnail() contre imaging.make_thumbnail
+
+Usage: python benchmarks/bench_thumbnail.py CORPUS [--size 170x200] [--limit 200]
+
+CORPUS est un dossier de couvertures réelles (.jpg/.jpeg/.png) et/ou
+d'EPUB (la couverture est extraite de l'archive). Pour chaque méthode et
+chaque image, le temps est mesuré dans le processus principal; le pic de
+RSS est mesuré dans un processus neuf par vignette (POSIX uniquement).
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import sys
+import time
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image  # noqa: E402
+
+from imaging import make_thumbnail  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def load_corpus(corpus: Path, limit: int):
+    """Octets des couvertures du corpus"""
+    covers = []
+    for path in sorted(corpus.rglob('*')):
+        if len(covers) >= limit:
+            break
+        lower = path.name.lower()
+        if lower.endswith(IMAGE_EXTENSIONS):
+            covers.append((path.name, path.read_bytes()))
+        elif lower.endswith('.epub'):
+            try:
+                with zipfile.ZipFile(path) as zf:
+                    names = [n for n in zf.namelist()
+                             if 'cover' in n.lower() and n.lower().endswith(IMAGE_EXTENSIONS)]
+                    if names:
+                        covers.append((path.name, zf.read(names[0])))
+            except Exception:
+                pass
+    return covers
+
+
+def thumb_before(data: bytes, size):
+    image = Image.open(BytesIO(data))
+    image.thumbnail(size)
+    return image
+
+
+def thumb_after(data: bytes, size):
+    return make_thumbnail(Image.open(BytesIO(data)), size)
+
+
+METHODS = {'thumbnail()': thumb_before, 'make_thumbnail': thumb_after}
+
+
+def rss_task(args):
+    """Exécuté dans un processus neuf: croissance du pic de RSS en Ko"""
+    method, data, size = args
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    METHODS[method](data, size)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpus', type=Path)
+    parser.add_argument('--size', default='170x200')
+    parser.add_argument('--limit', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    covers = load_corpus(args.corpus, args.limit)
+    if not covers:
+        print("Aucune couverture trouvée dans le corpus")
+        return 1
+    total_mb = sum(len(d) for _, d in covers) / (1024 * 1024)
+    print(f"{len(covers)} couvertures ({total_mb:.1f} Mo), vignette {size[0]}x{size[1]}")
+
+    for method, fn in METHODS.items():
+        times = []
+        for _, data in covers:
+            best = float('inf')
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                fn(data, size)
+                best = min(best, time.perf_counter() - t0)
+            times.append(best * 1000)
+
+        p95 = sorted(times)[min(len(times) - 1, int(len(times) * 0.95))]
+        line = f"{method:15} médiane {statistics.median(times):7.2f} ms  p95 {p95:7.2f} ms"
+
+        if resource is not None:
+            with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+                rss = pool.map(rss_task, [(method, data, size) for _, data in covers], chunksize=1)
+            line += (f"  pic RSS médian +{statistics.median(rss) / 1024:6.1f} Mo"
+                     f"  max +{max(rss) / 1024:6.1f} Mo")
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
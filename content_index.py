@@ -0,0 +1,541 @@
+"""
+Index du contenu - Texte des chapitres EPUB et des pages PDF dans une table FTS5
+Les documents XHTML du spine sont lus en flux depuis l'archive, débarrassés
+du balisage au fil de la lecture et écrits par morceaux ; le texte des PDF
+est extrait page par page (PyPDF2). L'extraction tourne dans des processus
+isolés (sandbox_pool) limités en temps CPU, mémoire et durée par livre.
+"""
+
+import codecs
+import html
+import os
+import posixpath
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from epub_reader import _find_member, parse_package
+from indexer import IndexRun
+from library_db import LibraryDB
+from parse_failures import STAGE_CONTENT, ParseFailures
+from pdf_reader import iter_pdf_text
+from sandbox_pool import SandboxPool
+from search_index import scope_filter
+
+# Lecture des documents par blocs (octets décompressés)
+CONTENT_READ_BLOCK = 64 * 1024
+# Taille d'un morceau de texte indexé (une ligne FTS5, un extrait par morceau)
+CONTENT_CHUNK_CHARS = 16 * 1024
+# Texte gardé au plus par livre et taille maximale d'un document du spine:
+# bornent la mémoire d'un processus de travail et la taille de l'index
+CONTENT_MAX_BOOK_CHARS = 4 * 1024 * 1024
+CONTENT_MAX_DOCUMENT_BYTES = 16 * 1024 * 1024
+# Livres traités par processus avant son remplacement (mémoire rendue au
+# système), livres écrits par transaction
+CONTENT_TASKS_PER_CHILD = 50
+CONTENT_BATCH_BOOKS = 20
+# Temps CPU accordé à un livre: au-delà son processus est tué (certains
+# PDF font tourner PyPDF2 pendant des minutes)
+CONTENT_CPU_SECONDS = 60
+# Pages PDF envoyées par message par le processus de travail
+CONTENT_PDF_PAGES_PER_MESSAGE = 16
+# Résultats: morceaux classés lus, livres rendus (un morceau par livre)
+CONTENT_MAX_MATCHES = 2000
+CONTENT_MAX_RESULTS = 200
+
+# rowid FTS5 = (id du livre << CHUNK_BITS) | n° du morceau: les morceaux
+# d'un livre forment un intervalle de rowid (suppression sans parcours)
+CHUNK_BITS = 20
+
+# (chapitre, titre du chapitre, texte)
+ContentRow = Tuple[int, str, str]
+
+_TAG = re.compile(r'<!--.*?-->|<!\[CDATA\[|\]\]>|<[!?][^>]*>|<(/?)([A-Za-z][\w:.-]*)[^>]*?(/?)>', re.S)
+_PLAIN_TAG = re.compile(r'<[^>]*>')
+# Suites de blancs et blancs autres que l'espace, dont l'espace insécable de
+# &nbsp; (un espace seul est laissé tel quel)
+_SPACES = re.compile(r'\s\s+|[^\S ]')
+_ENCODING = re.compile(rb'^<\?xml[^>]*encoding=["\']([\w.-]+)["\']')
+_SKIPPED = frozenset(('head', 'script', 'style', 'svg', 'math'))
+_HEADINGS = frozenset(('h1', 'h2', 'h3'))
+# Balises qui changent l'état du MarkupStripper (les autres deviennent un espace)
+_SPECIAL = re.compile(r'<(?:[\w.-]+:)?(?:head|script|style|svg|math|title|h[123])[\s/>]', re.I)
+
+
+class MarkupStripper:
+    """Retire le balisage HTML/XHTML d'un texte reçu par morceaux.
+
+    Une balise ou une entité coupée entre deux morceaux est gardée pour
+    le suivant. Le contenu de head/script/style est ignoré ; le premier
+    titre (h1-h3, à défaut <title>) est retenu dans `label`.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._skip: Optional[str] = None
+        self._capture: Optional[str] = None
+        self._captured: List[str] = []
+        self._title = ''
+        self._heading = ''
+
+    @property
+    def label(self) -> str:
+        return self._heading or self._title
+
+    def feed(self, data: str) -> str:
+        """Texte (entités décodées, espaces réduits) de `data`"""
+        data = self._pending + data
+        self._pending = ''
+        cut = data.rfind('<')
+        if cut != -1 and data.find('>', cut) == -1 and len(data) - cut < CONTENT_READ_BLOCK:
+            data, self._pending = data[:cut], data[cut:]
+        amp = data.rfind('&', max(0, len(data) - 12))
+        if amp != -1 and ';' not in data[amp:]:
+            data, self._pending = data[:amp], data[amp:] + self._pending
+
+        out: List[str] = []
+        pos = 0
+        while True:
+            if self._skip is None and self._capture is None:
+                # Texte courant: balises ordinaires remplacées en une passe
+                m = _SPECIAL.search(data, pos)
+                out.append(_PLAIN_TAG.sub(' ', data[pos:m.start() if m else len(data)]))
+                if m is None:
+                    break
+                pos = m.start()
+            m = _TAG.search(data, pos)
+            if m is None:
+                self._text(data[pos:], out)
+                break
+            if m.start() > pos:
+                self._text(data[pos:m.start()], out)
+            pos = m.end()
+            name = m.group(2)
+            if name is not None:
+                self._tag(name.rpartition(':')[2].lower(), bool(m.group(1)), bool(m.group(3)))
+            out.append(' ')
+        return _SPACES.sub(' ', html.unescape(''.join(out)))
+
+    def close(self) -> str:
+        """Texte resté en attente (balise ou entité jamais terminée)"""
+        rest, self._pending = self._pending, ''
+        if not rest or self._skip is not None:
+            return ''
+        return _SPACES.sub(' ', html.unescape(rest.replace('<', ' ')))
+
+    def _text(self, text: str, out: List[str]):
+        if self._capture is not None:
+            self._captured.append(text)
+        if self._skip is None:
+            out.append(text)
+
+    def _tag(self, name: str, closing: bool, empty: bool):
+        if empty:
+            return
+        if closing:
+            if name == self._skip:
+                self._skip = None
+            if name == self._capture:
+                self._end_capture()
+        elif self._skip is None and name in _SKIPPED:
+            self._skip = name
+        if not closing and self._capture is None:
+            if (name == 'title' and not self._title) or (name in _HEADINGS and not self._heading):
+                self._capture = name
+                self._captured = []
+
+    def _end_capture(self):
+        label = _SPACES.sub(' ', html.unescape(''.join(self._captured))).strip()
+        if label:
+            if self._capture == 'title':
+                self._title = label
+            else:
+                self._heading = label
+        self._capture = None
+        self._captured = []
+
+
+def strip_markup(text: str) -> str:
+    """Texte d'un fragment HTML (ex. description OPF), en une passe"""
+    stripper = MarkupStripper()
+    return (stripper.feed(text) + stripper.close()).strip()
+
+
+# ---------------- Extraction (processus de travail) ----------------
+
+def _decoder_for(first_block: bytes):
+    """Décodeur incrémental d'après le BOM ou la déclaration XML (UTF-8 par défaut)"""
+    if first_block.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = 'utf-16'
+    else:
+        m = _ENCODING.match(first_block.lstrip(codecs.BOM_UTF8))
+        encoding = m.group(1).decode('ascii') if m else 'utf-8-sig'
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = 'utf-8-sig'
+        if encoding.lower().replace('_', '-') == 'utf-8':
+            encoding = 'utf-8-sig'
+    return codecs.getincrementaldecoder(encoding)(errors='replace')
+
+
+def _split_chunks(text: str, final: bool) -> Tuple[List[str], str]:
+    """Morceaux complets de `text` (coupés sur un espace) et reste"""
+    chunks = []
+    while len(text) >= CONTENT_CHUNK_CHARS or (final and text.strip()):
+        cut = len(text)
+        if cut >= CONTENT_CHUNK_CHARS:
+            cut = text.rfind(' ', 0, CONTENT_CHUNK_CHARS)
+            if cut <= 0:
+                cut = CONTENT_CHUNK_CHARS
+        chunks.append(text[:cut].strip())
+        text = text[cut:]
+    return chunks, ('' if final else text)
+
+
+def _read_document(zf: zipfile.ZipFile, info: zipfile.ZipInfo, budget: int) -> Tuple[List[str], str, int]:
+    """Morceaux de texte d'un document du spine, son titre et les octets lus"""
+    stripper = MarkupStripper()
+    decoder = None
+    chunks: List[str] = []
+    buffer = ''
+    read = 0
+    with zf.open(info) as f:
+        while budget > 0:
+            block = f.read(CONTENT_READ_BLOCK)
+            if not block:
+                break
+            read += len(block)
+            if decoder is None:
+                decoder = _decoder_for(block)
+            text = stripper.feed(decoder.decode(block))
+            if text.startswith(' ') and buffer.endswith(' '):
+                text = text[1:]
+            budget -= len(text)
+            done, buffer = _split_chunks(buffer + text, False)
+            chunks.extend(done)
+    if decoder is not None:
+        buffer += stripper.feed(decoder.decode(b'', final=True))
+    done, _ = _split_chunks(buffer + stripper.close(), True)
+    chunks.extend(done)
+    return chunks, stripper.label, read
+
+
+def _epub_text(path_str: str) -> Iterator[Tuple[List[ContentRow], int]]:
+    """([(chapitre, titre, texte)], octets XHTML lus) pour chaque chapitre d'un EPUB"""
+    with zipfile.ZipFile(path_str) as zf:
+        package = parse_package(zf)
+        if package is None:
+            return
+        media_types = {p: mt for p, mt, _ in package.manifest.values()}
+        budget = CONTENT_MAX_BOOK_CHARS
+        lowered: Dict[str, zipfile.ZipInfo] = {}
+        for chapter, member in enumerate(package.spine, 1):
+            if 'html' not in media_types.get(member, 'html') and not member.endswith(('html', 'htm')):
+                continue
+            info = _find_member(zf, member, lowered)
+            if info is None or info.file_size > CONTENT_MAX_DOCUMENT_BYTES:
+                continue
+            chunks, label, read = _read_document(zf, info, budget)
+            label = label[:200] or posixpath.splitext(posixpath.basename(member))[0]
+            budget -= sum(len(chunk) for chunk in chunks)
+            yield [(chapter, label, chunk) for chunk in chunks], read
+            if budget <= 0:
+                break
+
+
+def _pdf_text(path_str: str) -> Iterator[Tuple[List[ContentRow], int]]:
+    """([(page, '', texte)], octets) par groupe de pages d'un PDF"""
+    size = os.path.getsize(path_str)
+    rows: List[ContentRow] = []
+    budget = CONTENT_MAX_BOOK_CHARS
+    for page, text in iter_pdf_text(Path(path_str)):
+        text = _SPACES.sub(' ', text).strip()
+        if text:
+            rows.extend((page, '', chunk) for chunk in _split_chunks(text, True)[0])
+            budget -= len(text)
+        if len(rows) >= CONTENT_PDF_PAGES_PER_MESSAGE or budget <= 0:
+            yield rows, 0
+            rows = []
+        if budget <= 0:
+            break
+    # Octets lus inconnus (PyPDF2): taille du fichier comptée à la fin
+    yield rows, size
+
+
+def extract_text(job: Tuple[str, str, int, float]) -> Iterator[Tuple[List[ContentRow], int]]:
+    """Texte d'un livre au fil de la lecture, dans un processus de sandbox_pool.
+
+    job = (chemin, type, taille, mtime) ; produit des ([(chapitre ou page,
+    titre, texte)], octets lus). Les exceptions (archive ou PDF illisible)
+    remontent au pool, qui les rapporte comme échec du livre.
+    """
+    if job[1] == 'pdf':
+        return _pdf_text(job[0])
+    return _epub_text(job[0])
+
+
+# ---------------- Base ----------------
+
+def init_content_index(con: sqlite3.Connection) -> bool:
+    """Créer les tables du contenu. False si FTS5 est indisponible.
+
+    Ne valide pas: à appeler dans la transaction d'écriture de l'appelant.
+    """
+    try:
+        con.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
+            chapter UNINDEXED, label UNINDEXED, text,
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """)
+    except sqlite3.OperationalError:
+        return False
+    con.execute("""
+    CREATE TABLE IF NOT EXISTS content_books (
+        id INTEGER PRIMARY KEY,
+        path TEXT UNIQUE,
+        size INTEGER,
+        mtime REAL,
+        chunks INTEGER,
+        bytes INTEGER
+    )
+    """)
+    return True
+
+
+def delete_content(con: sqlite3.Connection, paths: List[str]):
+    """Supprimer le texte indexé de `paths` (dans la transaction de l'appelant)"""
+    for path_str in paths:
+        row = con.execute("SELECT id FROM content_books WHERE path = ?", (path_str,)).fetchone()
+        if row:
+            first = row[0] << CHUNK_BITS
+            con.execute("DELETE FROM content_fts WHERE rowid BETWEEN ? AND ?",
+                        (first, first + (1 << CHUNK_BITS) - 1))
+            con.execute("DELETE FROM content_books WHERE id = ?", (row[0],))
+
+
+def search_content(con: sqlite3.Connection, fts_query: str,
+                   limit: int = CONTENT_MAX_RESULTS,
+                   directory: Optional[Path] = None,
+                   recursive: bool = False) -> List[Tuple[str, int, str, str]]:
+    """[(chemin, chapitre, titre du chapitre, extrait)], meilleur morceau de chaque livre.
+
+    Les morceaux sont d'abord classés sans extrait ; snippet() (qui relit et
+    découpe le texte du morceau) n'est calculé que pour le morceau retenu
+    de chaque livre. Avec `directory`, seuls les livres de ce dossier sont
+    classés (avant les limites).
+    """
+    where, params = scope_filter(directory, recursive)
+    best: Dict[int, int] = {}
+    for (rowid,) in con.execute(f"""
+            SELECT f.rowid FROM content_fts f JOIN content_books b ON b.id = (f.rowid >> {CHUNK_BITS})
+            WHERE content_fts MATCH ?{where} ORDER BY f.rank LIMIT ?
+        """, (fts_query, *params, CONTENT_MAX_MATCHES)):
+        book_id = rowid >> CHUNK_BITS
+        if book_id not in best:
+            best[book_id] = rowid
+            if len(best) >= limit:
+                break
+
+    found = {}
+    rowids = list(best.values())
+    for i in range(0, len(rowids), 500):
+        chunk = rowids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        for rowid, path_str, chapter, label, snippet in con.execute(f"""
+                SELECT f.rowid, b.path, f.chapter, f.label, snippet(content_fts, 2, '[', ']', '…', 12)
+                FROM content_fts f JOIN content_books b ON b.id = (f.rowid >> {CHUNK_BITS})
+                WHERE content_fts MATCH ? AND f.rowid IN ({marks})
+            """, (fts_query, *chunk)):
+            found[rowid] = (path_str, chapter, label, snippet)
+    return [found[rowid] for rowid in rowids if rowid in found]
+
+
+# ---------------- Indexation ----------------
+
+class ContentRun(IndexRun):
+    """Une indexation du contenu: IndexRun plus les échecs, octets lus et morceaux écrits"""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = 0
+        self.bytes_read = 0
+        self.chunks = 0
+
+
+class ContentIndexer:
+    """Remplit `content_fts` avec le texte des EPUB et PDF du listing, en arrière-plan.
+
+    Comme LibraryIndexer: un thread pilote les processus de travail et écrit
+    par lots sur la connexion d'écriture de `db` ; seuls les livres
+    nouveaux ou modifiés (taille, mtime) sont relus. Le texte arrive au fil
+    de la lecture ; un livre dont le processus est tué (temps CPU, mémoire,
+    délai) garde le texte déjà reçu et n'est pas relu tant qu'il ne change
+    pas ; échecs et extractions lentes sont enregistrés dans `failures`.
+    """
+
+    def __init__(self, db: LibraryDB, max_workers: Optional[int] = None,
+                 failures: Optional[ParseFailures] = None):
+        self.db = db
+        self.max_workers = max_workers
+        self.failures = failures
+
+        self._state = ContentRun()
+        self._state.started_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------- État ----------------
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def total(self) -> int:
+        return self._state.total
+
+    @property
+    def done(self) -> int:
+        return self._state.done
+
+    @property
+    def failed(self) -> int:
+        return self._state.failed
+
+    @property
+    def bytes_read(self) -> int:
+        return self._state.bytes_read
+
+    @property
+    def chunks(self) -> int:
+        return self._state.chunks
+
+    def megabytes_per_second(self, state: Optional[ContentRun] = None) -> float:
+        state = state or self._state
+        end = state.finished_at if state.finished_at else time.perf_counter()
+        elapsed = end - state.started_at
+        if elapsed <= 0:
+            return 0.0
+        return state.bytes_read / (1024 * 1024) / elapsed
+
+    def progress_text(self) -> str:
+        state = self._state
+        failed = f", {state.failed} en échec" if state.failed else ""
+        return (f"Contenu: {state.done}/{state.total}{failed} "
+                f"({state.bytes_read / (1024 * 1024):.0f} Mo, {self.megabytes_per_second(state):.1f} Mo/s)")
+
+    # ---------------- Contrôle ----------------
+
+    def start(self, books: List[Dict]):
+        """Indexer le texte des EPUB et PDF de `books` (dossiers ignorés)"""
+        self.cancel()
+
+        jobs = [(str(b['path']), b['type'], b.get('size', 0), b.get('mtime'))
+                for b in books if b.get('type') in ('epub', 'pdf')]
+
+        self._state = ContentRun()
+        self._thread = threading.Thread(target=self._run, args=(jobs, self._state),
+                                        name="ContentIndexer", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Arrêter l'indexation (les livres déjà écrits sont conservés).
+
+        Ne bloque pas: comme LibraryIndexer, le thread annulé n'écrit plus
+        rien une fois le signal levé (vérifié sous le verrou d'écriture) et
+        ne touche qu'à son propre ContentRun.
+        """
+        if self._thread is not None:
+            self._state.cancel.set()
+            self._thread = None
+
+    # ---------------- Thread ----------------
+
+    def _run(self, jobs: List[Tuple], state: ContentRun):
+        cancel = state.cancel
+        pool = SandboxPool(extract_text, workers=self.max_workers,
+                           cpu_seconds=CONTENT_CPU_SECONDS, max_tasks=CONTENT_TASKS_PER_CHILD)
+        try:
+            jobs = self._diff(jobs)
+            state.total = len(jobs)
+
+            received: Dict[str, Tuple[List[ContentRow], List[int]]] = {}
+            batch = []
+            for event, job, payload in pool.run(jobs, cancel):
+                path_str = job[0]
+                rows, read = received.setdefault(path_str, ([], [0]))
+                if event == 'item':
+                    rows.extend(payload[0])
+                    read[0] += payload[1]
+                    state.bytes_read += payload[1]
+                    continue
+
+                del received[path_str]
+                if event == 'failed':
+                    error, message, elapsed = payload
+                    state.failed += 1
+                    print(f"Contenu: {Path(path_str).name} abandonné ({error}: {message}), "
+                          f"{len(rows)} morceau(x) gardé(s)")
+                    outcome = (error, message), elapsed
+                else:
+                    outcome = None, payload
+                batch.append((path_str, job[2], job[3], rows, read[0], outcome))
+                state.done += 1
+                if len(batch) >= CONTENT_BATCH_BOOKS:
+                    self._flush(batch, state)
+                    batch = []
+
+            if batch:
+                self._flush(batch, state)
+        except Exception as e:
+            print(f"Erreur indexation du contenu: {e}")
+
+        if not cancel.is_set():
+            state.finished_at = time.perf_counter()
+            if state.total:
+                print(f"Contenu indexé: {state.done} livre(s), {state.chunks} morceau(x), "
+                      f"{state.bytes_read / (1024 * 1024):.1f} Mo lus en "
+                      f"{state.finished_at - state.started_at:.1f} s "
+                      f"({self.megabytes_per_second(state):.1f} Mo/s), {state.failed} en échec, "
+                      f"{pool.killed} processus tué(s)")
+
+    def _diff(self, jobs: List[Tuple]) -> List[Tuple]:
+        """Garder les livres dont le texte n'est pas indexé ou a changé"""
+        states: Dict[str, Tuple[int, float]] = {}
+        paths = [job[0] for job in jobs]
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for path_str, size, mtime in self.db.query(
+                    f"SELECT path, size, mtime FROM content_books WHERE path IN ({marks})",
+                    chunk, label="contenu: états"):
+                states[path_str] = (size, mtime)
+        changed = [job for job in jobs if states.get(job[0]) != (job[2], job[3])]
+        if self.failures is not None:
+            changed = [job for job in changed
+                       if not self.failures.is_quarantined(STAGE_CONTENT, job[0], job[2], job[3])]
+        if changed:
+            print(f"Contenu: {len(changed)} livre(s) à indexer, {len(jobs) - len(changed)} inchangé(s)")
+        return changed
+
+    def _flush(self, results: List[Tuple], state: ContentRun):
+        with self.db.write("contenu: lot") as con:
+            # Vérifié sous le verrou d'écriture, comme LibraryIndexer._flush
+            if state.cancel.is_set():
+                return
+            delete_content(con, [r[0] for r in results])
+            if self.failures is not None:
+                self.failures.record(STAGE_CONTENT, [(r[0], r[1], r[2], *r[5]) for r in results], con)
+            for path_str, size, mtime, rows, read, _ in results:
+                cur = con.execute(
+                    "INSERT INTO content_books(path, size, mtime, chunks, bytes) VALUES (?,?,?,?,?)",
+                    (path_str, size, mtime, len(rows), read))
+                first = cur.lastrowid << CHUNK_BITS
+                con.executemany(
+                    "INSERT INTO content_fts(rowid, chapter, label, text) VALUES (?,?,?,?)",
+                    [(first + n, chapter, label, text) for n, (chapter, label, text) in enumerate(rows)])
+                state.chunks += len(rows)
@@ -0,0 +1,201 @@
+"""
+Chargement des couvertures en arrière-plan
+Extraction + redimensionnement dans des threads, la boucle principale ne
+fait que créer les pygame.Surface à partir des pixels prêts.
+"""
+
+import heapq
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from epub_reader import extract_epub_cover
+from imaging import make_thumbnail
+from parse_failures import STAGE_COVER, ParseFailures, timed_parse
+from pdf_reader import extract_pdf_cover
+from thumbnail_store import ThumbnailStore, decode_thumbnail
+
+# (chemin, mode, (largeur, hauteur), pixels) ; mode None = pas de couverture
+CoverResult = Tuple[str, Optional[str], Tuple[int, int], bytes]
+
+
+def load_cover_pixels(path_str: str, book_type: str, max_size: Tuple[int, int],
+                      cover_path: Optional[str] = None) -> Tuple[Optional[str], Tuple[int, int], bytes]:
+    """Extraire et réduire une couverture, retourne (mode, taille, pixels)"""
+    cover_image = make_cover_thumbnail(path_str, book_type, max_size, cover_path=cover_path)
+    if cover_image is None:
+        return None, (0, 0), b''
+    return cover_image.mode, cover_image.size, cover_image.tobytes()
+
+
+def make_cover_thumbnail(path_str: str, book_type: str, max_size: Tuple[int, int], strict: bool = False,
+                         cover_path: Optional[str] = None):
+    """Vignette PIL de la couverture (RGB ou RGBA), None si absente.
+
+    strict: un fichier illisible lève son exception au lieu de rendre None.
+    cover_path: couverture d'un EPUB déjà connue (voir extract_epub_cover).
+    """
+    cover_image = None
+    if book_type == 'epub':
+        cover_image = extract_epub_cover(Path(path_str), strict=strict, cover_path=cover_path)
+    elif book_type == 'pdf':
+        cover_image = extract_pdf_cover(Path(path_str), strict=strict)
+
+    if cover_image is None:
+        return None
+    return make_thumbnail(cover_image, max_size)
+
+
+class CoverLoader:
+    """Pool de threads qui décode les couvertures demandées, par priorité.
+
+    La boucle principale appelle `schedule` avec l'ensemble des couvertures
+    voulues et leur priorité (distance au viewport): les demandes absentes
+    de cet ensemble sont annulées, les autres sont servies dans l'ordre des
+    priorités. `collect` rend les résultats terminés sans jamais bloquer.
+    Les vignettes sont d'abord cherchées dans le cache disque, puis y sont
+    enregistrées. Avec `failures`, un fichier dont la couverture a déjà
+    fait échouer l'extraction n'est plus lu tant qu'il n'a pas changé.
+    """
+
+    def __init__(self, max_size: Tuple[int, int], store: Optional[ThumbnailStore] = None,
+                 workers: Optional[int] = None, failures: Optional[ParseFailures] = None):
+        self.max_size = max_size
+        self.store = store
+        self.failures = failures
+        self._results: "queue.Queue[CoverResult]" = queue.Queue()
+
+        # Tas (priorité, n°, chemin) + demandes en attente par chemin
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[Tuple, int, str]] = []
+        self._pending: Dict[str, Tuple[Tuple, int, Tuple[str, int, float, Optional[str]]]] = {}
+        self._in_flight: set = set()
+        self._seq = 0
+        self._stopped = False
+
+        count = workers or min(4, os.cpu_count() or 1)
+        self._threads: List[threading.Thread] = []
+        for i in range(count):
+            t = threading.Thread(target=self._work, name=f"CoverLoader-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def schedule(self, wanted: List[Tuple[Tuple, Dict]],
+                 cover_paths: Optional[Dict[str, Optional[str]]] = None) -> List[str]:
+        """Remplacer les demandes en attente par `wanted` [(priorité, livre)].
+
+        cover_paths: chemin -> couverture EPUB connue (colonne books.cover),
+        pour ne pas relire l'OPF des livres déjà indexés.
+
+        Retourne les chemins dont la demande a été annulée.
+        """
+        with self._cond:
+            old = self._pending
+            self._pending = {}
+            for priority, book in wanted:
+                path_str = str(book['path'])
+                if path_str in self._in_flight:
+                    continue
+                previous = old.get(path_str)
+                seq = previous[1] if previous else self._next_seq()
+                cover_path = cover_paths.get(path_str) if cover_paths else None
+                self._pending[path_str] = (priority, seq,
+                                           (book['type'], book.get('size', 0), book.get('mtime', 0.0),
+                                            cover_path))
+
+            self._heap = [(priority, seq, path_str)
+                          for path_str, (priority, seq, _) in self._pending.items()]
+            heapq.heapify(self._heap)
+            if self._heap:
+                self._cond.notify_all()
+
+        return [p for p in old if p not in self._pending]
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def clear_pending(self):
+        """Abandonner les demandes pas encore traitées (changement de dossier)"""
+        with self._cond:
+            self._pending = {}
+            self._heap = []
+
+    def collect(self, limit: int) -> List[CoverResult]:
+        """Résultats prêts (au plus `limit`), sans attendre"""
+        results = []
+        while len(results) < limit:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        return results
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._pending = {}
+            self._heap = []
+            self._cond.notify_all()
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _next_job(self) -> Optional[Tuple[str, str, int, float, Optional[str]]]:
+        with self._cond:
+            while not self._stopped:
+                while self._heap:
+                    priority, seq, path_str = heapq.heappop(self._heap)
+                    entry = self._pending.get(path_str)
+                    if entry is None or entry[1] != seq:
+                        continue
+                    del self._pending[path_str]
+                    self._in_flight.add(path_str)
+                    return (path_str, *entry[2])
+                self._cond.wait()
+        return None
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            path_str = job[0]
+            try:
+                mode, size, data = self._load(*job)
+            except Exception:
+                mode, size, data = None, (0, 0), b''
+            self._results.put((path_str, mode, size, data))
+            with self._cond:
+                self._in_flight.discard(path_str)
+
+    def _load(self, path_str: str, book_type: str, file_size: int, mtime: float,
+              cover_path: Optional[str] = None) -> Tuple[Optional[str], Tuple[int, int], bytes]:
+        if self.store is None and self.failures is None:
+            return load_cover_pixels(path_str, book_type, self.max_size, cover_path)
+
+        stored = self.store.get(path_str, file_size, mtime) if self.store is not None else None
+        if stored is not None:
+            image = decode_thumbnail(stored)
+        else:
+            image, complete = self._make(path_str, book_type, file_size, mtime, cover_path)
+            # « Sans couverture » n'est enregistré que si l'extraction a abouti
+            if complete and self.store is not None:
+                self.store.put(path_str, file_size, mtime, image)
+
+        if image is None:
+            return None, (0, 0), b''
+        return image.mode, image.size, image.tobytes()
+
+    def _make(self, path_str: str, book_type: str, file_size: int, mtime: float,
+              cover_path: Optional[str] = None):
+        """(vignette ou None, extraction aboutie) ; False si en quarantaine ou en échec"""
+        if self.failures is not None and self.failures.is_quarantined(STAGE_COVER, path_str, file_size, mtime):
+            return None, False
+        image, error, duration = timed_parse(make_cover_thumbnail, path_str, book_type, self.max_size,
+                                             strict=True, cover_path=cover_path)
+        if self.failures is not None:
+            self.failures.record(STAGE_COVER, [(path_str, file_size, mtime, error, duration)])
+        return image, error is None
@@ -0,0 +1,323 @@
+"""
+Lecture des fichiers EPUB - Paquet OPF, métadonnées et couvertures
+Fonctions de module utilisables depuis un pool de processus; le paquet
+OPF est analysé une seule fois par fichier et partagé (mémoïsation).
+La mémoïsation ne vaut que dans un processus: entre l'indexation (pool de
+processus) et les couvertures (threads), c'est le chemin de la couverture
+enregistré par l'indexeur (colonne books.cover) qui évite de relire l'OPF.
+"""
+
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import unquote
+import zipfile
+from xml.etree import ElementTree as ET
+from io import BytesIO
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from imaging import MAX_COVER_BYTES
+
+
+CONTAINER_NS = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container'}
+
+
+def empty_metadata() -> Dict:
+    """Métadonnées vides (format commun EPUB/PDF)"""
+    return {
+        'title': '',
+        'author': '',
+        'publisher': '',
+        'description': '',
+        'language': '',
+        'date': ''
+    }
+
+
+class EpubPackage(NamedTuple):
+    """Contenu utile du paquet OPF d'un EPUB (chemins relatifs à l'archive)"""
+    opf_path: str
+    metadata: Dict
+    identifier: str
+    manifest: Dict[str, Tuple[str, str, str]]  # id -> (chemin, media-type, properties)
+    spine: List[str]                            # chemins des documents, ordre de lecture
+    cover_path: Optional[str]
+
+
+# Mémoïsation par identité de fichier (chemin, taille, mtime) ; un paquet
+# illisible est mémoïsé avec son exception
+_PACKAGE_MEMO_SIZE = 512
+_package_memo: "OrderedDict[Tuple[str, int, int], Union[EpubPackage, Exception, None]]" = OrderedDict()
+_package_memo_lock = threading.Lock()
+
+# Au-delà, l'OPF n'est pas analysé en entier pour la seule couverture
+STREAM_OPF_BYTES = 256 * 1024
+
+DC_FIELDS = {'title': 'title', 'creator': 'author', 'publisher': 'publisher',
+             'description': 'description', 'language': 'language', 'date': 'date'}
+
+
+def _local_name(tag) -> str:
+    if not isinstance(tag, str):
+        return ''
+    return tag[tag.rfind('}') + 1:]
+
+
+def _file_identity(epub_path: Path) -> Tuple[str, int, int]:
+    st = os.stat(epub_path)
+    return str(epub_path), st.st_size, st.st_mtime_ns
+
+
+def _memo_get(key):
+    with _package_memo_lock:
+        if key in _package_memo:
+            _package_memo.move_to_end(key)
+            return True, _package_memo[key]
+    return False, None
+
+
+def _memo_put(key, package: Union[EpubPackage, Exception, None]):
+    with _package_memo_lock:
+        _package_memo[key] = package
+        if len(_package_memo) > _PACKAGE_MEMO_SIZE:
+            _package_memo.popitem(last=False)
+
+
+def read_opf_path(zf: zipfile.ZipFile) -> Optional[str]:
+    """Chemin du fichier OPF d'après META-INF/container.xml"""
+    root = ET.fromstring(zf.read('META-INF/container.xml'))
+    rootfile = root.find('.//c:rootfile', CONTAINER_NS)
+    if rootfile is None:
+        return None
+    return rootfile.get('full-path')
+
+
+def _resolver(opf_path: str):
+    opf_dir = posixpath.dirname(opf_path)
+    prefix = opf_dir + '/' if opf_dir else ''
+
+    def resolve(href: str) -> str:
+        # Cas courant (href simple) sans normpath/unquote: appelé pour chaque item
+        if '%' not in href and './' not in href and not href.startswith('/'):
+            return prefix + href
+        return posixpath.normpath(posixpath.join(opf_dir, unquote(href)))
+    return resolve
+
+
+def parse_package(zf: zipfile.ZipFile, opf_path: Optional[str] = None) -> Optional[EpubPackage]:
+    """Lire container.xml puis l'OPF, en un seul parcours de l'arbre OPF.
+
+    Le manifest est indexé par id pendant ce parcours: la résolution de la
+    couverture est ensuite un accès direct (linéaire en taille d'OPF).
+    """
+    if opf_path is None:
+        opf_path = read_opf_path(zf)
+        if opf_path is None:
+            return None
+
+    opf_root = ET.fromstring(zf.read(opf_path))
+    resolve = _resolver(opf_path)
+
+    metadata = empty_metadata()
+    identifier = ''
+    manifest: Dict[str, Tuple[str, str, str]] = {}
+    spine_ids: List[str] = []
+    cover_ids: List[str] = []
+    cover_href = None
+
+    for el in opf_root.iter():
+        name = _local_name(el.tag)
+        if name == 'item':
+            attrib = el.attrib
+            item_id = attrib.get('id')
+            href = attrib.get('href')
+            if item_id and href:
+                properties = attrib.get('properties', '')
+                manifest[item_id] = (resolve(href), attrib.get('media-type', ''), properties)
+                # EPUB 3
+                if properties and cover_href is None and 'cover-image' in properties.split():
+                    cover_href = manifest[item_id][0]
+        elif name == 'itemref':
+            idref = el.get('idref')
+            if idref:
+                spine_ids.append(idref)
+        elif name == 'meta':
+            # EPUB 2 (parfois plusieurs, dont certaines vers des id absents)
+            if el.get('name') == 'cover' and el.get('content'):
+                cover_ids.append(el.get('content'))
+        elif name == 'identifier':
+            if not identifier and el.text:
+                identifier = el.text.strip()
+        elif name in DC_FIELDS:
+            key = DC_FIELDS[name]
+            if not metadata[key] and el.text and el.text.strip():
+                metadata[key] = el.text.strip()
+
+    cover_path = cover_href
+    for cover_id in cover_ids:
+        if cover_id in manifest:
+            cover_path = manifest[cover_id][0]
+            break
+
+    spine = [manifest[i][0] for i in spine_ids if i in manifest]
+    return EpubPackage(opf_path, metadata, identifier, manifest, spine, cover_path)
+
+
+def find_cover_path(zf: zipfile.ZipFile, opf_path: str) -> Optional[str]:
+    """Chemin de la couverture par lecture en flux de l'OPF (iterparse).
+
+    S'arrête dès que la couverture est connue, ou à la fin du manifest:
+    pour les OPF géants la suite du fichier n'est jamais lue.
+    """
+    resolve = _resolver(opf_path)
+    cover_ids = set()
+    cover_image = None
+    seen: Dict[str, str] = {}  # items vus avant les meta cover (OPF mal ordonnés)
+
+    with zf.open(opf_path) as f:
+        for _, el in ET.iterparse(f, events=('end',)):
+            name = _local_name(el.tag)
+            if name == 'meta':
+                if el.get('name') == 'cover' and el.get('content'):
+                    cover_id = el.get('content')
+                    if cover_id in seen:
+                        return resolve(seen[cover_id])
+                    cover_ids.add(cover_id)
+            elif name == 'item':
+                item_id = el.get('id')
+                href = el.get('href')
+                if href:
+                    if item_id in cover_ids:
+                        return resolve(href)
+                    if cover_image is None and 'cover-image' in el.get('properties', '').split():
+                        # EPUB 3: suffit si aucune meta cover (métadonnées avant le manifest)
+                        if not cover_ids:
+                            return resolve(href)
+                        cover_image = href
+                    if item_id:
+                        seen[item_id] = href
+            elif name == 'manifest':
+                break
+            el.clear()
+
+    return resolve(cover_image) if cover_image else None
+
+
+def _cover_candidates(zf: zipfile.ZipFile) -> List[str]:
+    """Images dont le nom contient « cover » (repli si l'OPF ne la désigne pas)"""
+    return [name for name in zf.namelist()
+            if 'cover' in name.lower() and name.lower().endswith(('.jpg', '.jpeg', '.png'))]
+
+
+def _find_member(zf: zipfile.ZipFile, name: str,
+                 lowered: Optional[Dict[str, zipfile.ZipInfo]] = None) -> Optional[zipfile.ZipInfo]:
+    """ZipInfo d'un membre, avec repli insensible à la casse (href mal écrit).
+
+    lowered: dictionnaire (vide au départ) partagé par les appels sur une
+    même archive ; rempli au premier repli (nom en minuscules -> ZipInfo),
+    il évite de reparcourir la liste des membres à chaque nom cherché.
+    """
+    try:
+        return zf.getinfo(name)
+    except KeyError:
+        pass
+    if lowered is None:
+        lowered = {}
+    if not lowered:
+        # reversed: à casse près, le premier membre de l'archive l'emporte
+        lowered.update((info.filename.lower(), info) for info in reversed(zf.infolist()))
+    return lowered.get(name.lower())
+
+
+def read_package(epub_path: Path, strict: bool = False) -> Optional[EpubPackage]:
+    """Paquet OPF d'un EPUB, mémoïsé par (chemin, taille, mtime); None si illisible.
+
+    strict: l'erreur de lecture est levée (y compris depuis la mémoïsation).
+    """
+    try:
+        key = _file_identity(epub_path)
+    except OSError:
+        if strict:
+            raise
+        return None
+
+    found, package = _memo_get(key)
+    if not found:
+        try:
+            with zipfile.ZipFile(epub_path, 'r') as zf:
+                package = parse_package(zf)
+        except Exception as e:
+            package = e
+        _memo_put(key, package)
+
+    if isinstance(package, Exception):
+        if strict:
+            raise package
+        return None
+    return package
+
+
+def read_epub_metadata(epub_path: Path, strict: bool = False) -> Dict:
+    """Lire les métadonnées Dublin Core d'un fichier EPUB (strict: erreurs levées)"""
+    package = read_package(epub_path, strict)
+    if package is None:
+        return empty_metadata()
+    return dict(package.metadata)
+
+
+def extract_epub_cover(epub_path: Path, strict: bool = False,
+                       cover_path: Optional[str] = None) -> Optional["Image.Image"]:
+    """Extraire l'image de couverture d'un EPUB (non décodée).
+
+    L'archive n'est ouverte qu'une fois: le paquet OPF est lu depuis la
+    mémoïsation ou analysé ici (et mémoïsé pour les métadonnées). Un OPF
+    très gros n'est lu qu'en flux jusqu'à la couverture. cover_path:
+    couverture désignée par l'OPF déjà connue ('' si aucune), l'OPF n'est
+    alors pas relu. strict: une archive illisible lève son exception au
+    lieu de rendre None.
+    """
+    if Image is None:
+        return None
+
+    try:
+        key = _file_identity(epub_path)
+        with zipfile.ZipFile(epub_path, 'r') as zf:
+            found, package = _memo_get(key)
+            if found:
+                cover_path = package.cover_path if isinstance(package, EpubPackage) else None
+            elif cover_path is None:
+                try:
+                    opf_path = read_opf_path(zf)
+                    if opf_path and zf.getinfo(opf_path).file_size > STREAM_OPF_BYTES:
+                        cover_path = find_cover_path(zf, opf_path)
+                    else:
+                        package = parse_package(zf, opf_path) if opf_path else None
+                        _memo_put(key, package)
+                        cover_path = package.cover_path if package else None
+                except Exception:
+                    pass
+
+            candidates = [cover_path] if cover_path else []
+            candidates += _cover_candidates(zf)
+            lowered: Dict[str, zipfile.ZipInfo] = {}
+            for name in candidates:
+                info = _find_member(zf, name, lowered)
+                if info is None or info.file_size > MAX_COVER_BYTES:
+                    continue
+                try:
+                    return Image.open(BytesIO(zf.read(info)))
+                except Exception:
+                    pass
+
+    except Exception:
+        if strict:
+            raise
+
+    return None
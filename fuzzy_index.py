@@ -0,0 +1,132 @@
+"""
+Recherche approchée - Index de trigrammes sur nom, titre et auteur
+Mots repliés (sans accents ni casse) -> trigrammes -> livres ; une requête
+ne lit que les listes de ses propres trigrammes (pas de distance d'édition
+calculée sur toute la bibliothèque).
+"""
+
+import heapq
+import re
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Set, Tuple
+
+from live_search import fold
+
+# Similarité minimale (Jaccard sur les trigrammes) d'un mot candidat
+FUZZY_MIN_SIMILARITY = 0.3
+# Mots candidats gardés par mot de la requête, résultats rendus
+FUZZY_MAX_WORDS = 200
+FUZZY_MAX_RESULTS = 200
+# Longueur de saisie à partir de laquelle la recherche instantanée sans
+# résultat passe la main à la recherche approchée
+FUZZY_MIN_CHARS = 3
+
+_WORD = re.compile(r'\w\w+')
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrammes d'un mot, bordé comme dans pg_trgm (« dos » : '  d', ' do', 'dos', 'os ')"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def book_words(book: Dict, metadata: Dict[str, Dict]) -> Set[str]:
+    """Mots repliés du nom (sans extension), du titre et de l'auteur d'un livre"""
+    name = book['name']
+    if book.get('type') != 'folder':
+        name = name.rsplit('.', 1)[0]
+        md = metadata.get(str(book['path']))
+        if md:
+            name = ' '.join((name, md.get('title', ''), md.get('author', '')))
+    return set(_WORD.findall(fold(name)))
+
+
+class TrigramIndex:
+    """Index inversé en mémoire, construit depuis le listing et ses métadonnées.
+
+    - `postings` : trigramme -> mots qui le contiennent
+    - `word_books` : mot -> livres (indices dans `books`)
+
+    `invalidate` marque l'index comme périmé (nouveau scan, métadonnées
+    reçues) ; il est reconstruit par `build` avant la requête suivante.
+    """
+
+    def __init__(self):
+        self.books: List[Dict] = []
+        self.words: List[str] = []
+        self.word_grams: List[int] = []
+        self.word_books: List[List[int]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.build_ms = 0.0
+        self._generation = 0
+        self._built = -1
+
+    def invalidate(self):
+        self._generation += 1
+
+    def is_stale(self) -> bool:
+        return self._built != self._generation
+
+    def build(self, books: List[Dict], metadata: Dict[str, Dict], cancel=None) -> bool:
+        """(Re)construire l'index ; False si `cancel` a été levé entre-temps"""
+        t0 = time.perf_counter()
+        generation = self._generation
+        word_ids: Dict[str, int] = {}
+        word_books: List[List[int]] = []
+        for i, book in enumerate(books):
+            if cancel is not None and i % 1000 == 0 and cancel.is_set():
+                return False
+            for word in book_words(book, metadata):
+                wid = word_ids.get(word)
+                if wid is None:
+                    wid = word_ids[word] = len(word_books)
+                    word_books.append([])
+                word_books[wid].append(i)
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        word_grams = []
+        for wid, word in enumerate(word_ids):
+            grams = trigrams(word)
+            word_grams.append(len(grams))
+            for gram in grams:
+                postings[gram].append(wid)
+
+        self.books, self.words, self.word_grams = books, list(word_ids), word_grams
+        self.word_books, self.postings = word_books, dict(postings)
+        self._built = generation
+        self.build_ms = (time.perf_counter() - t0) * 1000
+        return True
+
+    def similar_words(self, word: str, limit: int = FUZZY_MAX_WORDS) -> List[Tuple[float, int]]:
+        """[(similarité, n° de mot)] des mots proches de `word`, du plus proche au moins proche"""
+        grams = trigrams(word)
+        shared = Counter(chain.from_iterable(self.postings.get(g, ()) for g in grams))
+        count = len(grams)
+        word_grams = self.word_grams
+        candidates = []
+        for wid, n in shared.items():
+            similarity = n / (count + word_grams[wid] - n)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                candidates.append((similarity, wid))
+        return heapq.nlargest(limit, candidates)
+
+    def search(self, text: str, limit: int = FUZZY_MAX_RESULTS) -> List[Tuple[int, float]]:
+        """[(indice du livre, score)] classés ; score = similarité moyenne des mots de la requête"""
+        query = _WORD.findall(fold(text))
+        if not query:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for word in query:
+            best: Dict[int, float] = {}
+            for similarity, wid in self.similar_words(word):
+                for i in self.word_books[wid]:
+                    if similarity > best.get(i, 0.0):
+                        best[i] = similarity
+            for i, similarity in best.items():
+                scores[i] += similarity
+
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(i, score / len(query)) for i, score in ranked]
@@ -0,0 +1,67 @@
+"""
+Traitement des images de couverture - Vignettes à résolution réduite
+"""
+
+from typing import Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Au-delà, l'image n'est pas décodée (bombe de décompression / couverture aberrante)
+MAX_DECODE_PIXELS = 40_000_000
+# Taille maximale (non compressée) d'un fichier de couverture lu dans une archive
+MAX_COVER_BYTES = 32 * 1024 * 1024
+
+
+class ImageTooLarge(Exception):
+    """Image refusée avant décodage"""
+
+
+def normalize_mode(image: "Image.Image") -> "Image.Image":
+    """Convertir une seule fois vers RGB ou RGBA (formats acceptés par pygame)"""
+    mode = image.mode
+    if mode in ('RGB', 'RGBA'):
+        return image
+    if mode in ('LA', 'PA', 'RGBa'):
+        return image.convert('RGBA')
+    if mode == 'P':
+        return image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    if mode.startswith('I;16') or mode == 'I':
+        # Niveaux de gris 16 bits: ramener sur 8 bits avant RGB
+        image = image.point(lambda v: v * (1 / 256)).convert('L')
+    return image.convert('RGB')
+
+
+def make_thumbnail(image: "Image.Image", max_size: Tuple[int, int]) -> "Image.Image":
+    """Réduire une image ouverte (non chargée) en décodant le moins de pixels possible.
+
+    JPEG: `draft()` demande au décodeur une mise à l'échelle DCT (1/2, 1/4,
+    1/8) au plus proche de la taille cible. Autres formats: décodage complet
+    puis `reduce()` (moyenne par blocs) avant le rééchantillonnage final.
+    Le résultat est toujours en RGB ou RGBA.
+    """
+    w, h = image.size
+    if w * h > MAX_DECODE_PIXELS * 64:
+        raise ImageTooLarge(f"{w}x{h}")
+
+    image.draft(image.mode if image.mode in ('RGB', 'L') else None, max_size)
+
+    w, h = image.size
+    if w * h > MAX_DECODE_PIXELS:
+        raise ImageTooLarge(f"{w}x{h}")
+
+    # Avant reduce(), qui moyenne les valeurs (inutilisable sur une palette).
+    # Les scans noir et blanc restent sur un octet par pixel jusqu'à la fin.
+    if image.mode in ('1', 'L'):
+        image = image.convert('L')
+    else:
+        image = normalize_mode(image)
+
+    factor = min(w // max_size[0], h // max_size[1])
+    if factor >= 2:
+        image = image.reduce(factor)
+
+    image.thumbnail(max_size, reducing_gap=None)
+    return normalize_mode(image)
@@ -0,0 +1,260 @@
+"""
+Indexation des métadonnées - Pool de processus + écriture SQLite par lots
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import sqlite3
+
+from epub_reader import empty_metadata, read_package
+from library_db import LibraryDB
+from parse_failures import STAGE_METADATA, ParseError, ParseFailures, timed_parse
+from pdf_reader import read_pdf_metadata
+
+
+def index_book(job: Tuple[str, str, str, int, float]) -> Tuple[Tuple, ParseError, float]:
+    """Analyser un livre dans un processus de travail.
+
+    job = (name, path, type, size, mtime), retourne (ligne prête pour
+    EPDFViewer._db_upsert_batch, erreur d'analyse ou None, durée). Un livre
+    illisible donne une ligne aux métadonnées vides. La ligne garde aussi
+    la couverture désignée par l'OPF d'un EPUB ('' si aucune, None si
+    inconnue), que le chargement des couvertures n'a alors pas à relire.
+    """
+    name, path_str, book_type, size, mtime = job
+    md, error, duration, cover = None, None, 0.0, None
+    if book_type == 'epub':
+        package, error, duration = timed_parse(read_package, Path(path_str), strict=True)
+        if package is not None:
+            md, cover = dict(package.metadata), package.cover_path or ''
+    elif book_type == 'pdf':
+        md, error, duration = timed_parse(read_pdf_metadata, Path(path_str), strict=True)
+    if md is None:
+        md = empty_metadata()
+
+    row = (name, path_str, book_type, size,
+           md['title'], md['author'], md['publisher'],
+           md['description'], md['language'], md['date'], mtime, cover)
+    return row, error, duration
+
+
+def index_books(jobs: List[Tuple]) -> List[Tuple[Tuple, ParseError, float]]:
+    """`index_book` sur un lot de jobs (un aller-retour avec le processus par lot)"""
+    return [index_book(job) for job in jobs]
+
+
+def quarantined_row(job: Tuple) -> Tuple:
+    """Ligne aux métadonnées vides d'un fichier en quarantaine (non analysé)"""
+    name, path_str, book_type, size, mtime = job
+    md = empty_metadata()
+    return (name, path_str, book_type, size,
+            md['title'], md['author'], md['publisher'],
+            md['description'], md['language'], md['date'], mtime, None)
+
+
+class IndexRun:
+    """Une indexation: son signal d'arrêt et ses compteurs.
+
+    Un thread annulé termine au plus son résultat en cours ; il ne met à
+    jour que son propre IndexRun, jamais celui de l'indexation suivante.
+    """
+
+    def __init__(self):
+        self.cancel = threading.Event()
+        self.total = 0
+        self.done = 0
+        self.started_at = time.perf_counter()
+        self.finished_at = 0.0
+
+
+class LibraryIndexer:
+    """Remplit la table `books` en arrière-plan.
+
+    Un thread pilote un ProcessPoolExecutor (processus « spawn », les
+    fonctions de travail sont au niveau du module) et écrit les résultats dans
+    SQLite par gros lots (une transaction par lot sur la connexion
+    d'écriture partagée de `db`). Le scan est comparé à
+    la base sur (taille, mtime): seuls les fichiers nouveaux ou modifiés
+    sont analysés et les lignes des fichiers disparus sont supprimées.
+    Les lignes écrites sont aussi rendues à l'interface par `collect` ;
+    échecs et analyses lentes sont enregistrés dans `failures`.
+    """
+
+    def __init__(self,
+                 db: LibraryDB,
+                 upsert: Callable[[sqlite3.Connection, List[Tuple]], None],
+                 get_states: Callable[[sqlite3.Connection, Path, bool], Dict[str, Tuple[int, float]]],
+                 delete: Callable[[sqlite3.Connection, List[str]], None],
+                 batch_size: int = 500,
+                 max_workers: Optional[int] = None,
+                 failures: Optional[ParseFailures] = None):
+        self.db = db
+        self.upsert = upsert
+        self.get_states = get_states
+        self.delete = delete
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.failures = failures
+
+        self._state = IndexRun()
+        self._state.started_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._written: "queue.Queue[List[Tuple]]" = queue.Queue()
+
+    # ---------------- État ----------------
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def total(self) -> int:
+        return self._state.total
+
+    @property
+    def done(self) -> int:
+        return self._state.done
+
+    def files_per_second(self, state: Optional[IndexRun] = None) -> float:
+        state = state or self._state
+        end = state.finished_at if state.finished_at else time.perf_counter()
+        elapsed = end - state.started_at
+        if elapsed <= 0:
+            return 0.0
+        return state.done / elapsed
+
+    def progress_text(self) -> str:
+        return f"Indexation: {self.done}/{self.total} ({self.files_per_second():.0f} fichiers/s)"
+
+    # ---------------- Contrôle ----------------
+
+    def start(self, books: List[Dict], directory: Path, recursive: bool = False):
+        """Synchroniser la base avec le scan de `directory` (dossiers ignorés)"""
+        self.cancel()
+
+        jobs = [(b['name'], str(b['path']), b['type'], b.get('size', 0), b.get('mtime'))
+                for b in books if b.get('type') in ('epub', 'pdf')]
+
+        self._state = IndexRun()
+        self._thread = threading.Thread(target=self._run,
+                                        args=(jobs, directory, recursive, self._state),
+                                        name="LibraryIndexer", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Arrêter l'indexation en cours (les lots déjà écrits sont conservés).
+
+        Ne bloque pas: le thread s'arrête au prochain résultat reçu, sans
+        plus rien écrire ni compter pour l'indexation suivante.
+        """
+        if self._thread is not None:
+            self._state.cancel.set()
+            self._thread = None
+
+    def collect(self) -> List[Tuple]:
+        """Lignes écrites depuis le dernier appel (format de `index_book`), sans attendre"""
+        rows: List[Tuple] = []
+        while True:
+            try:
+                rows.extend(self._written.get_nowait())
+            except queue.Empty:
+                return rows
+
+    # ---------------- Thread ----------------
+
+    def _run(self, jobs: List[Tuple], directory: Path, recursive: bool, state: IndexRun):
+        cancel = state.cancel
+        executor = None
+        futures = []
+        try:
+            jobs = self._diff(jobs, directory, recursive)
+            state.total = len(jobs)
+            batch: List[Tuple] = []
+            outcomes = []
+            if self.failures is not None:
+                # Fichiers déjà en échec et inchangés: ligne vide, sans les relire
+                parse = []
+                for job in jobs:
+                    if cancel.is_set():
+                        return
+                    if self.failures.is_quarantined(STAGE_METADATA, job[1], job[3], job[4]):
+                        batch.append(quarantined_row(job))
+                        state.done += 1
+                    else:
+                        parse.append(job)
+                jobs = parse
+
+            if jobs and not cancel.is_set():
+                # spawn et non fork: lancé depuis un thread alors que d'autres
+                # (couvertures, recherche) peuvent tenir un verrou, qu'un
+                # processus forké hériterait verrouillé pour toujours
+                executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+                chunksize = max(1, min(64, len(jobs) // 64))
+                futures = [executor.submit(index_books, jobs[i:i + chunksize])
+                           for i in range(0, len(jobs), chunksize)]
+                for future in futures:
+                    if cancel.is_set():
+                        break
+                    for row, error, duration in future.result():
+                        batch.append(row)
+                        outcomes.append((row[1], row[3], row[10], error, duration))
+                        state.done += 1
+                    if len(batch) >= self.batch_size:
+                        self._flush(batch, outcomes, cancel)
+                        batch, outcomes = [], []
+
+            if batch:
+                self._flush(batch, outcomes, cancel)
+        except Exception as e:
+            print(f"Erreur indexation: {e}")
+        finally:
+            if executor is not None:
+                # cancel_futures (Python 3.9+) remplacé par une annulation explicite
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+        if not cancel.is_set():
+            state.finished_at = time.perf_counter()
+            if state.total:
+                print(f"Indexation terminée: {state.done} livre(s) en "
+                      f"{state.finished_at - state.started_at:.1f} s "
+                      f"({self.files_per_second(state):.0f} fichiers/s)")
+
+    def _diff(self, jobs: List[Tuple], directory: Path, recursive: bool) -> List[Tuple]:
+        """Garder les jobs nouveaux/modifiés et supprimer les fichiers disparus"""
+        with self.db.timed("indexation: états") as con:
+            states = self.get_states(con, directory, recursive)
+        seen = set()
+        changed = []
+        for job in jobs:
+            path_str = job[1]
+            seen.add(path_str)
+            if states.get(path_str) != (job[3], job[4]):
+                changed.append(job)
+
+        vanished = [p for p in states if p not in seen]
+        if vanished:
+            with self.db.write("indexation: suppression") as con:
+                self.delete(con, vanished)
+
+        if changed or vanished:
+            print(f"Indexation: {len(changed)} nouveau(x)/modifié(s), "
+                  f"{len(jobs) - len(changed)} inchangé(s), {len(vanished)} supprimé(s)")
+        return changed
+
+    def _flush(self, rows: List[Tuple], outcomes: List[Tuple], cancel: threading.Event):
+        with self.db.write("indexation: lot") as con:
+            # Vérifié sous le verrou d'écriture: un thread annulé n'écrit plus
+            # rien une fois l'indexation suivante lancée
+            if cancel.is_set():
+                return
+            self.upsert(con, rows)
+            if self.failures is not None:
+                self.failures.record(STAGE_METADATA, outcomes, con)
+        self._written.put(rows)
@@ -0,0 +1,162 @@
+"""
+Base SQLite books.db - Connexions persistantes
+Une connexion d'écriture unique (verrou + une transaction par lot) et une
+connexion de lecture par thread, ouvertes une seule fois: les PRAGMA ne
+sont exécutés qu'à l'ouverture et le cache de requêtes préparées de
+sqlite3 reste chaud. Durée des requêtes mesurée par libellé.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# cache_size négatif = Ko, par connexion
+CACHE_KB = 64 * 1024
+# Pages lues par mmap: partagées par toutes les connexions via le cache du système
+MMAP_BYTES = 256 * 1024 * 1024
+# Requêtes préparées gardées par connexion (128 par défaut dans sqlite3)
+CACHED_STATEMENTS = 256
+
+
+def _default_label(sql: str) -> str:
+    """Libellé de statistiques: début de la requête sur une ligne"""
+    text = ' '.join(sql.split())
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+class LibraryDB:
+    """Accès à books.db partagé par l'interface, l'indexeur et les vignettes.
+
+    - `write()` : transaction sur l'unique connexion d'écriture, sérialisée
+      entre threads (les écrivains ne se gênent plus avec SQLITE_BUSY)
+    - `reader()` : connexion en lecture seule propre au thread appelant
+    - `query()` / `timed()` : requêtes de lecture chronométrées
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        self._readers: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._readers_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._stats: Dict[str, List[float]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread=False uniquement pour pouvoir fermer depuis close();
+        # chaque connexion de lecture n'est utilisée que par son thread
+        con = sqlite3.connect(str(self.path), check_same_thread=False,
+                              cached_statements=CACHED_STATEMENTS)
+        con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("PRAGMA synchronous=NORMAL;")
+        con.execute("PRAGMA temp_store=MEMORY;")
+        con.execute(f"PRAGMA cache_size=-{CACHE_KB};")
+        con.execute(f"PRAGMA mmap_size={MMAP_BYTES};")
+        return con
+
+    # ---------------- Connexions ----------------
+
+    def reader(self) -> sqlite3.Connection:
+        """Connexion de lecture du thread courant (ouverte au premier appel)"""
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            con = self._open()
+            con.execute("PRAGMA query_only=ON;")
+            self._local.con = con
+            with self._readers_lock:
+                # Connexions des threads terminés (indexeurs précédents)
+                for thread, old in self._readers:
+                    if not thread.is_alive():
+                        old.close()
+                self._readers = [(t, c) for t, c in self._readers if t.is_alive()]
+                self._readers.append((threading.current_thread(), con))
+        return con
+
+    @contextmanager
+    def write(self, label: str = "écriture") -> Iterator[sqlite3.Connection]:
+        """Transaction sur la connexion d'écriture, validée à la sortie du bloc.
+
+        Réentrant: un `write()` imbriqué dans le même thread rejoint la
+        transaction englobante.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open()
+            con = self._writer
+            if con.in_transaction:
+                yield con
+                return
+
+            t0 = time.perf_counter()
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+                con.commit()
+            except BaseException:
+                con.rollback()
+                raise
+            finally:
+                self.record(label, time.perf_counter() - t0)
+
+    def close(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            for _, con in self._readers:
+                con.close()
+            self._readers = []
+        self._local = threading.local()
+
+    # ---------------- Lecture chronométrée ----------------
+
+    def query(self, sql: str, params: Sequence = (), label: Optional[str] = None) -> List[Tuple]:
+        t0 = time.perf_counter()
+        rows = self.reader().execute(sql, params).fetchall()
+        self.record(label or _default_label(sql), time.perf_counter() - t0)
+        return rows
+
+    def query_one(self, sql: str, params: Sequence = (), label: Optional[str] = None) -> Optional[Tuple]:
+        t0 = time.perf_counter()
+        row = self.reader().execute(sql, params).fetchone()
+        self.record(label or _default_label(sql), time.perf_counter() - t0)
+        return row
+
+    @contextmanager
+    def timed(self, label: str) -> Iterator[sqlite3.Connection]:
+        """Chronométrer un groupe de requêtes de lecture sous un seul libellé"""
+        t0 = time.perf_counter()
+        try:
+            yield self.reader()
+        finally:
+            self.record(label, time.perf_counter() - t0)
+
+    # ---------------- Statistiques ----------------
+
+    def record(self, label: str, seconds: float):
+        with self._stats_lock:
+            entry = self._stats.get(label)
+            if entry is None:
+                self._stats[label] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def stats(self) -> List[Tuple[str, int, float, float]]:
+        """[(libellé, appels, durée totale, durée max)] par durée totale décroissante"""
+        with self._stats_lock:
+            items = [(label, int(c), total, worst) for label, (c, total, worst) in self._stats.items()]
+        return sorted(items, key=lambda item: item[2], reverse=True)
+
+    def stats_report(self, limit: int = 10) -> str:
+        lines = ["Requêtes SQLite (durée totale, appels, moyenne, max):"]
+        for label, count, total, worst in self.stats()[:limit]:
+            lines.append(f"  {total * 1000:9.1f} ms  {count:6d}x  {total / count * 1000:7.2f} ms  "
+                         f"{worst * 1000:7.2f} ms  {label}")
+        return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""
+Recherche instantanée - Filtre du listing courant à chaque frappe
+Sous-chaînes sans accents ni casse sur nom, titre, auteur et éditeur ;
+une saisie qui prolonge une requête récente ne filtre que ses résultats.
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Requêtes récentes gardées en cache et nombre total d'indices conservés
+LIVE_CACHE_ENTRIES = 64
+LIVE_CACHE_MAX_IDS = 1_000_000
+
+# Saisie en syntaxe plein texte (phrases, filtres de colonne, opérateurs, re:):
+# pas de filtre instantané, la recherche FTS5 est lancée par Entrée
+LIVE_SYNTAX = re.compile(r'[":]|(?:^|\s)(?:AND|OR|NOT)(?:\s|$)')
+
+
+# Diacritiques combinants (blocs Unicode « Combining ... ») supprimés après NFKD
+_COMBINING = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+')
+
+
+def fold(text: str) -> str:
+    """Minuscules sans accents (« Misérables » -> « miserables »)"""
+    if text.isascii():
+        return text.lower()
+    return _COMBINING.sub('', unicodedata.normalize('NFKD', text.casefold()))
+
+
+def narrows(previous: Sequence[str], words: Sequence[str]) -> bool:
+    """True si tout livre trouvé par `words` l'est aussi par `previous`.
+
+    Chaque mot précédent doit être contenu dans le mot de même rang
+    (« vic » -> « victor », « victor » -> « victor hu »).
+    """
+    if len(words) < len(previous):
+        return False
+    return all(p in w for p, w in zip(previous, words))
+
+
+class LiveSearch:
+    """Filtre instantané sur le listing courant.
+
+    Les clés de recherche (texte replié de chaque livre) sont calculées par
+    `prepare` en arrière-plan, à défaut à la demande, et gardées jusqu'au
+    prochain `reset` ou `invalidate` ; le thread de `prepare` n'écrit pas
+    une clé calculée avant un `invalidate` survenu entre-temps. Les
+    résultats (indices dans le listing) des requêtes récentes sont gardés
+    dans un LRU: une requête déjà vue est immédiate, une requête qui en
+    prolonge une autre ne parcourt que ses résultats.
+    """
+
+    def __init__(self, max_entries: int = LIVE_CACHE_ENTRIES, max_ids: int = LIVE_CACHE_MAX_IDS):
+        self.max_entries = max_entries
+        self.max_ids = max_ids
+        self.books: List[Dict] = []
+        self._keys: List[Optional[str]] = []
+        self._index: Dict[str, int] = {}
+        self._cache: "OrderedDict[Tuple[str, ...], List[int]]" = OrderedDict()
+        self._cached_ids = 0
+        # Protège l'écriture des clés par le thread de `prepare` contre
+        # `reset` et `invalidate` ; `_invalidations` compte ces derniers
+        self._lock = threading.Lock()
+        self._invalidations = 0
+
+        self.hits = 0
+        self.narrowed = 0
+        self.full_scans = 0
+        self.last_ms = 0.0
+
+    def reset(self, books: List[Dict]):
+        """Nouveau listing (scan d'un dossier)"""
+        self.books = books
+        with self._lock:
+            self._keys = [None] * len(books)
+        self._index = {str(b['path']): i for i, b in enumerate(books)}
+        self.clear_cache()
+
+    def prepare(self, metadata: Dict[str, Dict]):
+        """Calculer les clés du listing dans un thread, avant la première frappe"""
+        books, keys = self.books, self._keys
+
+        def work():
+            for i, book in enumerate(books):
+                with self._lock:
+                    if self._keys is not keys:
+                        return  # listing remplacé entre-temps
+                    if keys[i] is not None:
+                        continue
+                    seen = self._invalidations
+                key = self._make_key(book, metadata)
+                with self._lock:
+                    # Clé périmée si un invalidate est passé pendant le calcul:
+                    # elle sera recalculée à la demande
+                    if self._invalidations == seen:
+                        keys[i] = key
+
+        threading.Thread(target=work, name="LiveSearchKeys", daemon=True).start()
+
+    def invalidate(self, paths: Sequence[str]):
+        """Métadonnées de `paths` modifiées: clés à recalculer, résultats oubliés"""
+        changed = False
+        with self._lock:
+            self._invalidations += 1
+            for path_str in paths:
+                i = self._index.get(path_str)
+                if i is not None:
+                    self._keys[i] = None
+                    changed = True
+        if changed:
+            self.clear_cache()
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._cached_ids = 0
+
+    def stats_text(self) -> str:
+        return (f"{self.last_ms:.1f} ms, cache {self.hits}, affinées {self.narrowed}, "
+                f"complètes {self.full_scans}")
+
+    # ---------------- Recherche ----------------
+
+    def filter(self, text: str, metadata: Dict[str, Dict]) -> List[Dict]:
+        """Livres du listing dont nom/titre/auteur/éditeur contiennent tous les mots"""
+        t0 = time.perf_counter()
+        words = tuple(fold(text).split())
+        if not words:
+            self.last_ms = (time.perf_counter() - t0) * 1000
+            return list(self.books)
+
+        ids = self._cache.get(words)
+        if ids is not None:
+            self._cache.move_to_end(words)
+            self.hits += 1
+        else:
+            base = None
+            for previous, previous_ids in self._cache.items():
+                if narrows(previous, words) and (base is None or len(previous_ids) < len(base)):
+                    base = previous_ids
+            if base is not None:
+                self.narrowed += 1
+                candidates = base
+            else:
+                self.full_scans += 1
+                candidates = range(len(self.books))
+
+            keys = self._keys_for(candidates, metadata)
+            if len(words) == 1:
+                word = words[0]
+                ids = [i for i in candidates if word in keys[i]]
+            else:
+                ids = [i for i in candidates if all(w in keys[i] for w in words)]
+            self._remember(words, ids)
+
+        books = self.books
+        results = [books[i] for i in ids]
+        self.last_ms = (time.perf_counter() - t0) * 1000
+        return results
+
+    def _keys_for(self, candidates, metadata: Dict[str, Dict]) -> List[Optional[str]]:
+        keys = self._keys
+        for i in candidates:
+            if keys[i] is None:
+                keys[i] = self._make_key(self.books[i], metadata)
+        return keys
+
+    @staticmethod
+    def _make_key(book: Dict, metadata: Dict[str, Dict]) -> str:
+        md = metadata.get(str(book['path'])) if book.get('type') != 'folder' else None
+        if md:
+            return fold(' '.join((book['name'], md.get('title', ''), md.get('author', ''),
+                                  md.get('publisher', ''))))
+        return fold(book['name'])
+
+    def _remember(self, words: Tuple[str, ...], ids: List[int]):
+        self._cache[words] = ids
+        self._cached_ids += len(ids)
+        while len(self._cache) > self.max_entries or (self._cached_ids > self.max_ids and len(self._cache) > 1):
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_ids -= len(evicted)
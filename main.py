@@ -12,22 +12,27 @@ from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 import tkinter as tk
 from tkinter import filedialog
-import zipfile
-from xml.etree import ElementTree as ET
-from io import BytesIO
 import sqlite3
 import time
 import re
+import textwrap
+import os
+from io import BytesIO
 
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
-
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None
+from epub_reader import empty_metadata, read_epub_metadata, extract_epub_cover
+from pdf_reader import read_pdf_metadata
+from indexer import LibraryIndexer
+from library_db import LibraryDB
+from parse_failures import STAGE_METADATA, ParseFailures
+from scanner import scan_books
+from cover_loader import CoverLoader
+from thumbnail_store import ThumbnailStore
+from surface_cache import SurfaceCache
+from search_index import init_search_index, parse_search, path_range, search
+from content_index import ContentIndexer, delete_content, init_content_index, search_content, strip_markup
+from fuzzy_index import FUZZY_MIN_CHARS, TrigramIndex
+from live_search import LIVE_SYNTAX, LiveSearch
+from search_job import SEARCH_BATCH, SEARCH_FLUSH_SECONDS, SEARCH_MESSAGES_PER_FRAME, SearchJob
 
 
 class EPDFViewer:
@@ -41,10 +46,14 @@ class EPDFViewer:
         self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
         pygame.display.set_caption("Visualiseur EPUB & PDF")
 
+        # Textes déjà rendus par (police, texte, couleur): libellés des cartes et du menu
+        self.text_cache = SurfaceCache(max_bytes=8 * 1024 * 1024)
+        # Cartes complètes (fond, couverture, libellés) par (chemin, taille de carte):
+        # une carte affichée ne coûte qu'un blit par frame
+        self.card_cache = SurfaceCache(max_bytes=32 * 1024 * 1024)
+
         # Polices
-        self.font_big = pygame.font.SysFont('Arial', 32)
-        self.font_normal = pygame.font.SysFont('Arial', 18)
-        self.font_small = pygame.font.SysFont('Arial', 15)
+        self.load_fonts()
 
         # Couleurs
         self.COLOR_BG = (102, 125, 235)
@@ -61,6 +70,7 @@ class EPDFViewer:
         # État
         self.books: List[Dict] = []
         self.all_books: List[Dict] = []
+        self.books_by_path: Dict[str, Dict] = {}
         self.current_directory: Optional[Path] = None
         self.scroll_offset = 0
         self.max_scroll = 0
@@ -83,7 +93,10 @@ class EPDFViewer:
                 {"label": "Trier par taille", "action": "sort_size"}
             ]},
             {"label": "Rechercher", "items": [
+                {"label": "Plein texte (Ctrl+F)", "action": "search"},
                 {"label": "Par nom (regex)...", "action": "search_regex"},
+                {"label": "Indexer le contenu (EPUB, PDF)", "action": "index_content"},
+                {"label": "Fichiers illisibles / lents", "action": "parse_report"},
                 {"label": "Afficher tout", "action": "show_all"}
             ]}
         ]
@@ -95,19 +108,38 @@ class EPDFViewer:
         self.grid_start_y = 120
 
         # Cache couvertures
-        self.cover_cache: Dict[str, pygame.Surface] = {}
-        self.cover_cache_order: List[str] = []
-        self.max_cache_size = 100
+        self.cover_cache = SurfaceCache(max_bytes=64 * 1024 * 1024)
         self.cover_loading: set = set()
-        self.covers_to_load: List[Dict] = []
 
         # Scrollbar
         self.scrollbar_dragging = False
         self.scrollbar_width = 12
         self.scrollbar_x = self.width - self.scrollbar_width - 5
 
-        # Optimisation chargement couvertures
-        self.covers_per_frame = 2
+        # Chargement des couvertures hors du thread de rendu: la boucle ne fait
+        # que convertir les pixels prêts en Surface (au plus N par frame)
+        self.covers_per_frame = 16
+
+        # Rendu: seules les zones invalidées sont redessinées et présentées
+        # (display.update) ; sans rien à redessiner ni travail en cours, la
+        # boucle attend les événements au lieu de tourner à 60 images/s
+        self.fps = 60
+        self.full_redraw = True
+        self.dirty_rects: List[pygame.Rect] = []
+        self.max_dirty_rects = 32
+        self.busy_wait_ms = 50
+        self.idle_wait_ms = 500
+        # Textes d'état de l'en-tête (progression, cache) relus au plus 4 fois/s
+        self.header_state = None
+        self.header_check_interval = 0.25
+        self.header_checked_at = 0.0
+        self.frames_drawn = 0
+
+        # Préchargement dans le sens du défilement (vitesse en px/s)
+        self.scroll_velocity = 0.0
+        self.last_scroll_offset = 0
+        self.last_scroll_time = time.perf_counter()
+        self.max_prefetch_rows = 6
 
         # Popup détails
         self.show_details_popup = False
@@ -126,17 +158,46 @@ class EPDFViewer:
         # Bouton retour
         self.back_button_rect = None
 
-        # Compteur cache
-        self.cache_clean_count = 0
+        # Champ de recherche de l'en-tête (filtre à chaque frappe, Entrée = plein texte)
+        self.live_search = LiveSearch()
+        # Recherche approchée (fautes de frappe), construite à la première requête
+        self.fuzzy_index = TrigramIndex()
+        self.search_text = ""
+        self.search_box_active = False
+        self.search_box_rect = None
 
-        # Progression
-        self.show_search_progress = False
+        # Recherche en arrière-plan et sa progression
+        self.search_job = SearchJob()
         self.search_progress_message = ""
         self.search_progress_percent = 0.0
+        # Résultats trouvés dans le texte des livres: chemin -> (chapitre, titre, extrait)
+        self.content_hits: Dict[str, Tuple[int, str, str]] = {}
 
         # SQLite
         self.db_path = Path.cwd() / "books.db"
+        self.db = LibraryDB(self.db_path)
         self._init_db()
+        # Fichiers en échec (ou lents) à l'analyse: non relus tant qu'ils ne changent pas
+        self.parse_failures = ParseFailures(self.db)
+        if self.parse_failures.quarantined_count():
+            print(f"Fichiers en quarantaine: {self.parse_failures.quarantined_count()}")
+
+        # Vignettes persistantes (table thumbnails) + chargeur en arrière-plan
+        self.thumbnail_store = ThumbnailStore(self.db, max_bytes=256 * 1024 * 1024)
+        self.cover_loader = CoverLoader((self.card_width - 10, 200), self.thumbnail_store,
+                                        failures=self.parse_failures)
+
+        # Indexation des métadonnées en arrière-plan
+        self.indexer = LibraryIndexer(self.db, self._db_upsert_batch,
+                                      self._db_get_file_states, self._db_delete_paths,
+                                      batch_size=1000, failures=self.parse_failures)
+        # Indexation du texte des EPUB et PDF (optionnelle, lancée depuis le menu)
+        self.content_indexer = ContentIndexer(self.db, failures=self.parse_failures)
+
+        # Dernier état connu (taille, mtime) de chaque fichier, pour invalider
+        # les caches des seuls fichiers modifiés lors d'un nouveau scan
+        self.file_states: Dict[str, Tuple[int, float]] = {}
+        self.current_recursive = False
 
         # Démarrage
         start_dir = Path.cwd()
@@ -145,44 +206,43 @@ class EPDFViewer:
 
     # ---------------- SQLite ----------------
 
-    def _connect_db(self) -> sqlite3.Connection:
-        con = sqlite3.connect(str(self.db_path))
-        con.execute("PRAGMA journal_mode=WAL;")
-        con.execute("PRAGMA synchronous=NORMAL;")
-        con.execute("PRAGMA temp_store=MEMORY;")
-        # cache_size négatif = Ko, ici ~200 Mo
-        con.execute("PRAGMA cache_size=-200000;")
-        return con
-
     def _init_db(self):
-        con = self._connect_db()
-        cur = con.cursor()
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS books (
-            id INTEGER PRIMARY KEY,
-            name TEXT,
-            path TEXT UNIQUE,
-            type TEXT,
-            size INTEGER,
-            title TEXT,
-            author TEXT,
-            publisher TEXT,
-            description TEXT,
-            language TEXT,
-            date TEXT
-        )
-        """)
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_books_name ON books(name)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books(title)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_books_author ON books(author)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_books_publisher ON books(publisher)")
-        con.commit()
-        con.close()
+        with self.db.write("schéma") as con:
+            con.execute("""
+            CREATE TABLE IF NOT EXISTS books (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                path TEXT UNIQUE,
+                type TEXT,
+                size INTEGER,
+                title TEXT,
+                author TEXT,
+                publisher TEXT,
+                description TEXT,
+                language TEXT,
+                date TEXT,
+                mtime REAL,
+                cover TEXT
+            )
+            """)
+            columns = {row[1] for row in con.execute("PRAGMA table_info(books)")}
+            if 'mtime' not in columns:
+                con.execute("ALTER TABLE books ADD COLUMN mtime REAL")
+            # Couverture désignée par l'OPF d'un EPUB ('' aucune, NULL inconnue)
+            if 'cover' not in columns:
+                con.execute("ALTER TABLE books ADD COLUMN cover TEXT")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_books_name ON books(name)")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books(title)")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_books_author ON books(author)")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_books_publisher ON books(publisher)")
+            self.fts_enabled = init_search_index(con)
+            self.content_enabled = self.fts_enabled and init_content_index(con)
 
     def _db_upsert_batch(self, con: sqlite3.Connection, rows: List[Tuple]):
         con.executemany("""
-        INSERT INTO books(name, path, type, size, title, author, publisher, description, language, date)
-        VALUES(?,?,?,?,?,?,?,?,?,?)
+        INSERT INTO books(name, path, type, size, title, author, publisher, description, language, date, mtime,
+                          cover)
+        VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
         ON CONFLICT(path) DO UPDATE SET
             name=excluded.name,
             type=excluded.type,
@@ -192,87 +252,160 @@ class EPDFViewer:
             publisher=excluded.publisher,
             description=excluded.description,
             language=excluded.language,
-            date=excluded.date
+            date=excluded.date,
+            mtime=excluded.mtime,
+            cover=excluded.cover
         """, rows)
 
+    def _db_get_file_states(self, con: sqlite3.Connection, directory: Path,
+                            recursive: bool) -> Dict[str, Tuple[int, float]]:
+        """(taille, mtime) des livres indexés sous `directory`"""
+        # Intervalle sur l'index UNIQUE(path) au lieu d'un LIKE
+        prefix, upper = path_range(directory)
+        cur = con.execute("SELECT path, size, mtime FROM books WHERE path >= ? AND path < ?",
+                          (prefix, upper))
+        states = {}
+        for path_str, size, mtime in cur:
+            if not recursive and path_str.find(os.sep, len(prefix)) != -1:
+                continue
+            states[path_str] = (size, mtime)
+        return states
+
+    def _db_delete_paths(self, con: sqlite3.Connection, paths: List[str]):
+        """Oublier des fichiers disparus: ligne `books` et texte indexé"""
+        con.executemany("DELETE FROM books WHERE path = ?", [(p,) for p in paths])
+        if self.content_enabled:
+            delete_content(con, paths)
+
+    @staticmethod
+    def _metadata_from_row(title, author, publisher, description, language, date, cover=None) -> Dict:
+        return {
+            "title": title or "",
+            "author": author or "",
+            "publisher": publisher or "",
+            "description": description or "",
+            "language": language or "",
+            "date": date or "",
+            # Couverture désignée par l'OPF (None: inconnue), pour CoverLoader
+            "cover": cover,
+        }
+
+    def _db_get_metadata_many(self, paths: List[str]) -> Dict[str, Dict]:
+        """Métadonnées indexées de plusieurs livres, une requête par lot.
+
+        Les lignes d'un fichier modifié depuis son indexation (taille ou
+        mtime différents du scan) sont ignorées.
+        """
+        found: Dict[str, Dict] = {}
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self.db.query(f"""
+                SELECT path, size, mtime, title, author, publisher, description, language, date, cover
+                FROM books WHERE path IN ({marks})
+            """, chunk, label="métadonnées (lot)")
+            for path_str, size, mtime, *values in rows:
+                state = self.file_states.get(path_str)
+                if state is not None and state != (size, mtime):
+                    continue
+                found[path_str] = self._metadata_from_row(*values)
+        return found
+
     def _db_get_metadata_by_path(self, file_path: Path) -> Optional[Dict]:
         try:
-            con = self._connect_db()
-            cur = con.cursor()
-            cur.execute("""
+            row = self.db.query_one("""
                 SELECT title, author, publisher, description, language, date
                 FROM books
                 WHERE path = ?
                 LIMIT 1
-            """, (str(file_path),))
-            row = cur.fetchone()
-            con.close()
+            """, (str(file_path),), label="métadonnées (livre)")
             if not row:
                 return None
-            return {
-                "title": row[0] or "",
-                "author": row[1] or "",
-                "publisher": row[2] or "",
-                "description": row[3] or "",
-                "language": row[4] or "",
-                "date": row[5] or "",
-            }
+            return self._metadata_from_row(*row)
         except Exception:
             return None
 
     # ---------------- Scan / UI ----------------
 
     def scan_directory(self, path: Path, recursive: bool = False):
+        self.search_job.cancel()
         self.books.clear()
         self.all_books.clear()
-        self.cover_cache.clear()
-        self.cover_cache_order.clear()
         self.cover_loading.clear()
-        self.covers_to_load.clear()
+        self.cover_loader.clear_pending()
         self.search_pattern = None
+        self.current_recursive = recursive
 
-        if not recursive:
-            for d in path.iterdir():
-                if d.is_dir() and not d.name.startswith('.'):
-                    self.all_books.append({
-                        'name': d.name,
-                        'path': d,
-                        'type': 'folder',
-                        'size': 0
-                    })
-
-        if recursive:
-            epub_files = list(path.rglob("*.epub"))
-            pdf_files = list(path.rglob("*.pdf"))
-        else:
-            epub_files = list(path.glob("*.epub"))
-            pdf_files = list(path.glob("*.pdf"))
-
-        for f in epub_files:
-            self.all_books.append({
-                'name': f.name,
-                'path': f,
-                'type': 'epub',
-                'size': f.stat().st_size
-            })
-
-        for f in pdf_files:
-            self.all_books.append({
-                'name': f.name,
-                'path': f,
-                'type': 'pdf',
-                'size': f.stat().st_size
-            })
+        self.all_books = scan_books(path, recursive)
+        self.books_by_path = {str(b['path']): b for b in self.all_books}
+
+        self.invalidate_changed_files()
 
         self.all_books.sort(key=lambda x: (x['type'] != 'folder', x['name'].lower()))
         self.books = self.all_books.copy()
+        self.live_search.reset(self.all_books)
+        self.fuzzy_index.invalidate()
+        self.search_text = ""
         self.update_scroll_limits()
 
         folders_count = sum(1 for b in self.books if b['type'] == 'folder')
         files_count = len(self.books) - folders_count
         print(f"Trouvé {folders_count} dossier(s) et {files_count} livre(s)")
 
+        self.hydrate_metadata()
+        self.live_search.prepare(self.book_metadata)
+        self.prefetch_stored_covers()
+        self.indexer.start(self.all_books, path, recursive)
+
+    def invalidate_changed_files(self):
+        """Oublier couverture et métadonnées des fichiers modifiés depuis le dernier scan"""
+        for book in self.all_books:
+            if book['type'] == 'folder':
+                continue
+            path_str = str(book['path'])
+            state = (book['size'], book['mtime'])
+            previous = self.file_states.get(path_str)
+            if previous is not None and previous != state:
+                self.cover_cache.pop(path_str)
+                self.cover_loading.discard(path_str)
+                self.book_metadata.pop(path_str, None)
+                self.forget_cards([path_str])
+            self.file_states[path_str] = state
+
+    def hydrate_metadata(self):
+        """Métadonnées de tout le listing lues dans books.db en une requête par lot.
+
+        Les fichiers absents de la base (ou modifiés) sont analysés par
+        l'indexeur, puis repris par `collect_indexed_metadata`.
+        """
+        missing = [str(b['path']) for b in self.all_books
+                   if b['type'] != 'folder' and str(b['path']) not in self.book_metadata]
+        if not missing:
+            return
+        t0 = time.perf_counter()
+        found = self._db_get_metadata_many(missing)
+        self.book_metadata.update(found)
+        self.forget_cards(found)
+        print(f"Métadonnées: {len(found)}/{len(missing)} lues dans la base en "
+              f"{(time.perf_counter() - t0) * 1000:.1f} ms, {len(missing) - len(found)} à analyser")
+
+    def collect_indexed_metadata(self):
+        """Reprendre les métadonnées que l'indexeur vient d'écrire (sans requête)"""
+        updated = []
+        for row in self.indexer.collect():
+            path_str, size, mtime = row[1], row[3], row[10]
+            if self.file_states.get(path_str) == (size, mtime):
+                self.book_metadata[path_str] = self._metadata_from_row(*row[4:10], row[11])
+                updated.append(path_str)
+        if updated:
+            self.live_search.invalidate(updated)
+            self.fuzzy_index.invalidate()
+            self.forget_cards(updated)
+            self.invalidate(self.grid_rect())
+
     def update_scroll_limits(self):
+        # Appelé à chaque changement de la liste ou de la taille de la fenêtre
+        self.invalidate()
         if not self.books:
             self.max_scroll = 0
             return
@@ -296,183 +429,139 @@ class EPDFViewer:
 
     # ---------------- Couvertures ----------------
 
-    def get_cover_surface(self, book: Dict, request_load: bool = True) -> Optional[pygame.Surface]:
-        path_str = str(book['path'])
-
-        if path_str in self.cover_cache:
-            if path_str in self.cover_cache_order:
-                self.cover_cache_order.remove(path_str)
-            self.cover_cache_order.append(path_str)
-            return self.cover_cache[path_str]
+    def get_cover_surface(self, book: Dict) -> Optional[pygame.Surface]:
+        """Couverture en cache (les demandes de chargement passent par schedule_covers)"""
+        found, surface = self.cover_cache.lookup(str(book['path']))
+        return surface if found else None
+
+    def update_scroll_velocity(self):
+        now = time.perf_counter()
+        dt = now - self.last_scroll_time
+        if dt > 0:
+            instant = (self.scroll_offset - self.last_scroll_offset) / dt
+            # Moyenne glissante pour ignorer les à-coups de la molette
+            self.scroll_velocity = 0.7 * self.scroll_velocity + 0.3 * instant
+        self.last_scroll_offset = self.scroll_offset
+        self.last_scroll_time = now
+
+    def schedule_covers(self):
+        """Demander les couvertures visibles d'abord, puis celles dans le sens du défilement.
+
+        Priorité = (distance en rangées au viewport, indice). Les demandes
+        sorties de la fenêtre (visible + préchargement) sont annulées.
+        """
+        self.update_scroll_velocity()
+
+        wanted = []
+        if self.show_details_popup and self.selected_book and self.selected_book.get('type') != 'folder':
+            wanted.append(((-1, 0), self.selected_book))
 
-        if request_load and path_str not in self.cover_loading:
-            self.cover_loading.add(path_str)
-            self.covers_to_load.append(book)
-
-        return None
+        if self.books:
+            cols = max(1, (self.width - 60) // (self.card_width + self.card_gap))
+            row_height = self.card_height + self.card_gap
+            first_row = max(0, (self.scroll_offset - self.grid_start_y) // row_height)
+            last_row = (self.scroll_offset + self.height - self.grid_start_y) // row_height
+
+            # Rangées à précharger: ~0.5 s de défilement devant, 1 derrière
+            ahead = min(self.max_prefetch_rows, 1 + int(abs(self.scroll_velocity) * 0.5 / row_height))
+            if self.scroll_velocity >= 0:
+                lo_row, hi_row = first_row - 1, last_row + ahead
+            else:
+                lo_row, hi_row = first_row - ahead, last_row + 1
+
+            start_index = max(0, lo_row * cols)
+            end_index = min(len(self.books), (hi_row + 1) * cols)
+            for i in range(start_index, end_index):
+                book = self.books[i]
+                if book['type'] == 'folder' or str(book['path']) in self.cover_cache:
+                    continue
+                row = i // cols
+                distance = first_row - row if row < first_row else max(0, row - last_row)
+                wanted.append(((distance, i), book))
+
+        cover_paths = {}
+        for _, book in wanted:
+            md = self.book_metadata.get(str(book['path']))
+            if md:
+                cover_paths[str(book['path'])] = md.get('cover')
+        for path_str in self.cover_loader.schedule(wanted, cover_paths):
+            self.cover_loading.discard(path_str)
+        for _, book in wanted:
+            self.cover_loading.add(str(book['path']))
 
     def load_pending_covers(self):
-        loaded = 0
-        while self.covers_to_load and loaded < self.covers_per_frame:
-            book = self.covers_to_load.pop(0)
-            path_str = str(book['path'])
-
-            if path_str in self.cover_cache:
+        for path_str, mode, size, data in self.cover_loader.collect(self.covers_per_frame):
+            # Demande abandonnée entre-temps (nouveau scan, fichier modifié)
+            if path_str not in self.cover_loading:
                 continue
+            self.cover_loading.discard(path_str)
 
             cover_surface = None
-
-            if book['type'] == 'epub' and Image:
+            if mode:
                 try:
-                    cover_image = self.extract_epub_cover(book['path'])
-                    if cover_image:
-                        cover_image.thumbnail((self.card_width - 10, 200))
-                        mode = cover_image.mode
-                        size = cover_image.size
-                        data = cover_image.tobytes()
-
-                        if mode == 'RGB':
-                            cover_surface = pygame.image.fromstring(data, size, 'RGB')
-                        elif mode == 'RGBA':
-                            cover_surface = pygame.image.fromstring(data, size, 'RGBA')
+                    # frombuffer partage les octets du worker (pas de copie),
+                    # convert() produit directement le format de l'écran
+                    cover_surface = self.to_display_format(pygame.image.frombuffer(data, size, mode))
                 except Exception:
                     pass
 
-            self.cover_cache[path_str] = cover_surface
-            self.cover_cache_order.append(path_str)
+            self.cache_cover(path_str, cover_surface)
+            self.invalidate_book(path_str)
 
-            if len(self.cover_cache) > self.max_cache_size:
-                oldest_key = self.cover_cache_order.pop(0)
-                if oldest_key in self.cover_cache:
-                    del self.cover_cache[oldest_key]
-                    self.cache_clean_count += 1
-                    if self.cache_clean_count % 50 == 0:
-                        print(f"Cache glissant: {len(self.cover_cache)}/{self.max_cache_size} vignettes")
+    def prefetch_stored_covers(self):
+        """Afficher dès la première frame les vignettes déjà présentes sur disque"""
+        start_index, end_index = self.visible_book_range()
+        keys = [(str(b['path']), b['size'], b['mtime'])
+                for b in self.books[start_index:end_index]
+                if b['type'] != 'folder' and str(b['path']) not in self.cover_cache]
 
-            loaded += 1
+        for path_str, (mode, size, data) in self.thumbnail_store.get_many(keys).items():
+            cover_surface = None
+            if mode:
+                try:
+                    namehint = "cover.png" if mode == 'RGBA' else "cover.jpg"
+                    cover_surface = self.to_display_format(pygame.image.load(BytesIO(data), namehint))
+                except Exception:
+                    continue
+            self.cache_cover(path_str, cover_surface)
 
-    def extract_epub_cover(self, epub_path: Path) -> Optional["Image.Image"]:
-        try:
-            with zipfile.ZipFile(epub_path, 'r') as zf:
-                container = zf.read('META-INF/container.xml')
-                root = ET.fromstring(container)
-
-                ns = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container'}
-                rootfile = root.find('.//c:rootfile', ns)
-                if rootfile is None:
-                    return None
-
-                opf_path = rootfile.get('full-path')
-                opf_dir = str(Path(opf_path).parent)
-
-                opf_content = zf.read(opf_path)
-                opf_root = ET.fromstring(opf_content)
-
-                for meta in opf_root.iter():
-                    if meta.get('name') == 'cover':
-                        cover_id = meta.get('content')
-                        for item in opf_root.iter():
-                            if item.get('id') == cover_id:
-                                href = item.get('href')
-                                if href:
-                                    cover_path = f"{opf_dir}/{href}" if opf_dir and opf_dir != '.' else href
-                                    cover_path = cover_path.replace('//', '/')
-                                    try:
-                                        cover_data = zf.read(cover_path)
-                                        return Image.open(BytesIO(cover_data))
-                                    except Exception:
-                                        pass
-
-                for name in zf.namelist():
-                    lower = name.lower()
-                    if 'cover' in lower and (lower.endswith('.jpg') or lower.endswith('.jpeg') or lower.endswith('.png')):
-                        try:
-                            cover_data = zf.read(name)
-                            return Image.open(BytesIO(cover_data))
-                        except Exception:
-                            pass
+    def to_display_format(self, surface: pygame.Surface) -> pygame.Surface:
+        """Copie au format de pixels de l'écran (blit sans conversion à chaque frame)"""
+        if surface.get_flags() & pygame.SRCALPHA or surface.get_alpha() is not None:
+            return surface.convert_alpha()
+        return surface.convert()
 
-        except Exception:
-            pass
+    def cache_cover(self, path_str: str, cover_surface: Optional[pygame.Surface]):
+        evictions = self.cover_cache.evictions
+        self.cover_cache.put(path_str, cover_surface)
+        self.forget_cards([path_str])
+        if self.cover_cache.evictions // 50 != evictions // 50:
+            print(f"Cache glissant: {len(self.cover_cache)} vignettes, {self.cover_cache.stats_text()}")
 
-        return None
+    def extract_epub_cover(self, epub_path: Path):
+        return extract_epub_cover(epub_path)
 
     # ---------------- Métadonnées ----------------
 
     def load_epub_metadata(self, epub_path: Path) -> Dict:
-        metadata = {
-            'title': '',
-            'author': '',
-            'publisher': '',
-            'description': '',
-            'language': '',
-            'date': ''
-        }
-
-        try:
-            with zipfile.ZipFile(epub_path, 'r') as zf:
-                container = zf.read('META-INF/container.xml')
-                root = ET.fromstring(container)
-
-                ns = {'c': 'urn:oasis:names:tc:opendocument:xmlns:container'}
-                rootfile = root.find('.//c:rootfile', ns)
-                if rootfile is None:
-                    return metadata
-
-                opf_path = rootfile.get('full-path')
-                opf_content = zf.read(opf_path)
-                opf_root = ET.fromstring(opf_content)
-
-                dc_ns = {'dc': 'http://purl.org/dc/elements/1.1/'}
-
-                def pick(xpath: str) -> str:
-                    el = opf_root.find(xpath, dc_ns)
-                    if el is not None and el.text:
-                        return el.text.strip()
-                    return ""
-
-                metadata['title'] = pick('.//dc:title')
-                metadata['author'] = pick('.//dc:creator')
-                metadata['publisher'] = pick('.//dc:publisher')
-                metadata['description'] = pick('.//dc:description')
-                metadata['language'] = pick('.//dc:language')
-                metadata['date'] = pick('.//dc:date')
-
-        except Exception:
-            pass
-
-        return metadata
+        return self._load_metadata(read_epub_metadata, epub_path)
 
     def load_pdf_metadata(self, pdf_path: Path) -> Dict:
-        metadata = {
-            'title': '',
-            'author': '',
-            'publisher': '',
-            'description': '',
-            'language': '',
-            'date': ''
-        }
+        return self._load_metadata(read_pdf_metadata, pdf_path)
 
-        if PdfReader:
+    def _load_metadata(self, reader, file_path: Path) -> Dict:
+        """Métadonnées lues hors de l'indexeur, sauf fichier en quarantaine"""
+        path_str = str(file_path)
+        state = self.file_states.get(path_str)
+        if state is None:
             try:
-                with open(pdf_path, 'rb') as f:
-                    pdf = PdfReader(f)
-                    info = pdf.metadata
-                    if info:
-                        if info.title:
-                            metadata['title'] = str(info.title)
-                        if info.author:
-                            metadata['author'] = str(info.author)
-                        if info.producer:
-                            metadata['publisher'] = str(info.producer)
-                        if info.subject:
-                            metadata['description'] = str(info.subject)
-                        if getattr(info, "creation_date", None):
-                            metadata['date'] = str(info.creation_date)
-            except Exception:
-                pass
-
-        return metadata
+                st = file_path.stat()
+                state = (st.st_size, st.st_mtime)
+            except OSError:
+                return empty_metadata()
+        md = self.parse_failures.run(STAGE_METADATA, path_str, state[0], state[1],
+                                     reader, file_path, strict=True)
+        return md if md is not None else empty_metadata()
 
     def format_file_size(self, size: int) -> str:
         for unit in ['octets', 'Ko', 'Mo', 'Go']:
@@ -482,20 +571,84 @@ class EPDFViewer:
         return f"{size:.1f} To"
 
     def clean_html_tags(self, text: str) -> str:
-        text = re.sub(r'<[^>]+>', '', text)
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&#39;', "'")
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return strip_markup(text)
 
     # ---------------- Analyse SQLite ----------------
 
     # ---------------- Recherche ----------------
 
+    def focus_search_box(self):
+        self.search_box_active = True
+        pygame.key.start_text_input()
+
+    def blur_search_box(self):
+        self.search_box_active = False
+        pygame.key.stop_text_input()
+
+    def handle_search_key(self, event) -> bool:
+        """Touches du champ de recherche actif. True si l'événement est consommé."""
+        if event.key == pygame.K_ESCAPE:
+            if self.search_job.cancel():
+                print(f"Recherche « {self.search_pattern} » annulée: {len(self.books)} résultat(s)")
+            elif self.search_text:
+                self.search_text = ""
+                self.apply_live_search()
+            else:
+                self.blur_search_box()
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            text = self.search_text.strip()
+            if text.startswith('~'):
+                if text[1:].strip():
+                    self.start_search(text, self._fuzzy_search(text[1:]))
+            elif text:
+                self.run_search(text)
+        elif event.key == pygame.K_BACKSPACE:
+            if event.mod & pygame.KMOD_CTRL:
+                self.search_text = self.search_text.rstrip()
+                self.search_text = self.search_text[:self.search_text.rfind(' ') + 1]
+            else:
+                self.search_text = self.search_text[:-1]
+            self.apply_live_search()
+        else:
+            return False
+        return True
+
+    def apply_live_search(self):
+        """Filtrer le listing à chaque frappe (hors syntaxe plein texte, lancée par Entrée).
+
+        Sans aucun résultat, une recherche approchée prend le relais en
+        arrière-plan (fautes de frappe, « dostoievsky » -> « Dostoïevski »).
+        """
+        text = self.search_text
+        if LIVE_SYNTAX.search(text) or text.lstrip().startswith('~'):
+            return
+        self.search_job.cancel()
+        self.books = self.live_search.filter(text, self.book_metadata)
+        self.search_pattern = text.strip() or None
+        self.scroll_offset = 0
+        self.update_scroll_limits()
+        if not self.books and len(text.strip()) >= FUZZY_MIN_CHARS:
+            self.start_search(f"~{text.strip()}", self._fuzzy_search(text))
+
+    def run_search(self, text: str):
+        """Recherche classée (FTS5) dans le dossier courant, regex optionnelle en post-filtre"""
+        fts_query, pattern = parse_search(text)
+        try:
+            regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        except re.error as e:
+            print(f"Pattern regex invalide: {e}")
+            return
+
+        if not fts_query:
+            if regex:
+                self.start_search(text, self._regex_search(regex, self.all_books))
+            return
+        if not self.fts_enabled:
+            print("Recherche plein texte indisponible (SQLite sans FTS5)")
+            return
+
+        self.start_search(text, self._fts_search(fts_query, regex))
+
     def open_regex_search_dialog(self):
         from tkinter import simpledialog
 
@@ -512,59 +665,189 @@ class EPDFViewer:
         if pattern:
             try:
                 regex = re.compile(pattern, re.IGNORECASE)
-                self.show_search_progress = True
-                total_books = len(self.all_books)
-                filtered_books = []
+            except re.error as e:
+                print(f"Pattern regex invalide: {e}")
+                return
+            self.start_search(pattern, self._regex_search(regex, self.all_books))
 
-                for i, book in enumerate(self.all_books):
-                    if i % 50 == 0 and total_books > 0:
-                        self.update_search_progress(f"Recherche: {i}/{total_books}", i / total_books)
+    def start_search(self, text: str, producer):
+        """Lancer une recherche en arrière-plan (la précédente est annulée).
 
-                    if book.get('type') == 'folder':
-                        if regex.search(book['name']):
-                            filtered_books.append(book)
-                        continue
+        La liste est vidée puis remplie au fil des résultats par
+        `collect_search_results`.
+        """
+        self.search_job.start(producer)
+        self.books = []
+        self.search_pattern = text
+        self.scroll_offset = 0
+        self.update_scroll_limits()
+        self.search_progress_message = f"Recherche « {text} »"
+        self.search_progress_percent = 0.0
+        self.forget_cards(self.content_hits)
+        self.content_hits = {}
+
+    def collect_search_results(self):
+        """Ajouter les résultats arrivés depuis la dernière frame"""
+        if not self.search_job.is_running():
+            return
+        changed = False
+        for kind, payload in self.search_job.collect(SEARCH_MESSAGES_PER_FRAME):
+            if kind == 'matches':
+                self.books.extend(payload)
+                changed = True
+            elif kind == 'content':
+                present = {str(b['path']) for b in self.books}
+                for book, chapter, label, snippet in payload:
+                    path_str = str(book['path'])
+                    self.content_hits[path_str] = (chapter, label, snippet)
+                    self.forget_cards([path_str])
+                    if path_str not in present:
+                        self.books.append(book)
+                changed = True
+            elif kind == 'metadata':
+                self.book_metadata.update(payload)
+                self.forget_cards(payload)
+                self.invalidate(self.grid_rect())
+            elif kind == 'progress':
+                done, total = payload
+                self.search_progress_percent = done / total if total else 1.0
+            elif kind == 'done':
+                print(f"Recherche « {self.search_pattern} »: {len(self.books)} résultat(s) en "
+                      f"{payload * 1000:.1f} ms")
+                self.invalidate(self.header_rect())
+            elif kind == 'error':
+                print(f"Erreur lors de la recherche: {payload}")
+                self.show_all_books()
+                return
+        if changed:
+            self.update_scroll_limits()
 
-                    if regex.search(book['name']):
-                        filtered_books.append(book)
+    def _fts_search(self, fts_query: str, regex: Optional["re.Pattern"]):
+        """Producteur SearchJob: résultats FTS5 classés, post-filtrés par regex"""
+        directory, recursive = self.current_directory, self.current_recursive
+
+        def produce(job: SearchJob, cancel):
+            with self.db.timed("recherche FTS") as con:
+                job.on_cancel(con.interrupt)
+                rows = search(con, fts_query, directory=directory, recursive=recursive)
+                job.on_cancel(None)
+
+            total = len(rows)
+            for i in range(0, total, SEARCH_BATCH):
+                matches = []
+                for path_str, name, author, publisher in rows[i:i + SEARCH_BATCH]:
+                    book = self.books_by_path.get(path_str)
+                    if book is None:
+                        continue
+                    if regex and not any(v and regex.search(v) for v in (name, author, publisher)):
                         continue
+                    matches.append(book)
+                yield 'matches', matches
+                yield 'progress', (min(total, i + SEARCH_BATCH), total)
+
+            # Texte des livres (index du contenu), sauf filtre par colonne
+            if self.content_enabled and ' : ' not in fts_query:
+                with self.db.timed("recherche contenu") as con:
+                    job.on_cancel(con.interrupt)
+                    hits = search_content(con, fts_query, directory=directory, recursive=recursive)
+                    job.on_cancel(None)
+                found = []
+                for path_str, chapter, label, snippet in hits:
+                    book = self.books_by_path.get(path_str)
+                    if book is None:
+                        continue
+                    if regex:
+                        md = self.book_metadata.get(path_str, {})
+                        values = (book['name'], md.get('author', ''), md.get('publisher', ''))
+                        if not any(v and regex.search(v) for v in values):
+                            continue
+                    found.append((book, chapter, label, snippet))
+                if found:
+                    yield 'content', found
+        return produce
+
+    def _fuzzy_search(self, text: str):
+        """Producteur SearchJob: livres aux nom/titre/auteur proches de la saisie"""
+        def produce(job: SearchJob, cancel):
+            index = self.fuzzy_index
+            if index.is_stale():
+                if not index.build(self.all_books, self.book_metadata, cancel):
+                    return
+                print(f"Index de trigrammes: {len(index.words)} mots, {len(index.books)} livres "
+                      f"en {index.build_ms:.0f} ms")
+            yield 'matches', [index.books[i] for i, _ in index.search(text)]
+        return produce
+
+    def _regex_search(self, regex: "re.Pattern", books: List[Dict]):
+        """Producteur SearchJob: filtre par regex sur nom, auteur et éditeur.
+
+        Les métadonnées manquantes sont lues dans la base en une requête par
+        lot, les livres pas encore indexés sont analysés dans le thread.
+        """
+        def produce(job: SearchJob, cancel):
+            missing = [str(b['path']) for b in books
+                       if b.get('type') != 'folder' and str(b['path']) not in self.book_metadata]
+            known = self._db_get_metadata_many(missing)
+            if known:
+                yield 'metadata', known
+
+            total = len(books)
+            matches: List[Dict] = []
+            parsed: Dict[str, Dict] = {}
+            last_flush = time.perf_counter()
+            for i, book in enumerate(books):
+                if cancel.is_set():
+                    return
 
+                if regex.search(book['name']):
+                    matches.append(book)
+                elif book.get('type') != 'folder':
                     path_str = str(book['path'])
-                    if path_str not in self.book_metadata:
-                        # prioriser sqlite si possible
-                        md = self._db_get_metadata_by_path(book['path'])
-                        if md is None:
-                            if book['type'] == 'epub':
-                                md = self.load_epub_metadata(book['path'])
-                            elif book['type'] == 'pdf':
-                                md = self.load_pdf_metadata(book['path'])
-                            else:
-                                md = {}
-                        self.book_metadata[path_str] = md
-
-                    md = self.book_metadata.get(path_str, {})
+                    md = known.get(path_str)
+                    if md is None:
+                        md = self.book_metadata.get(path_str)
+                    if md is None:
+                        # Pas encore indexé
+                        if book['type'] == 'epub':
+                            md = self.load_epub_metadata(book['path'])
+                        elif book['type'] == 'pdf':
+                            md = self.load_pdf_metadata(book['path'])
+                        else:
+                            md = {}
+                        parsed[path_str] = md
                     author = md.get('author', '')
                     publisher = md.get('publisher', '')
                     if (author and regex.search(author)) or (publisher and regex.search(publisher)):
-                        filtered_books.append(book)
-
-                self.books = filtered_books
-                self.search_pattern = pattern
-                self.scroll_offset = 0
-                self.update_scroll_limits()
-
-                self.update_search_progress(f"Terminé: {len(self.books)} résultat(s)", 1.0)
-                pygame.time.wait(300)
-                self.show_search_progress = False
-
-            except re.error as e:
-                self.show_search_progress = False
-                print(f"Pattern regex invalide: {e}")
-            except Exception as e:
-                self.show_search_progress = False
-                print(f"Erreur lors de la recherche: {e}")
+                        matches.append(book)
+
+                now = time.perf_counter()
+                if now - last_flush >= SEARCH_FLUSH_SECONDS:
+                    if parsed:
+                        yield 'metadata', parsed
+                        parsed = {}
+                    if matches:
+                        yield 'matches', matches
+                        matches = []
+                    yield 'progress', (i + 1, total)
+                    last_flush = now
+
+            if parsed:
+                yield 'metadata', parsed
+            yield 'matches', matches
+            yield 'progress', (total, total)
+        return produce
+
+    def index_content(self):
+        """Indexer le texte des EPUB et PDF du dossier courant (recherche dans le contenu)"""
+        if not self.content_enabled:
+            print("Index du contenu indisponible (SQLite sans FTS5)")
+            return
+        self.content_indexer.start(self.all_books)
 
     def show_all_books(self):
+        self.search_job.cancel()
+        self.forget_cards(self.content_hits)
+        self.content_hits = {}
         self.books = self.all_books.copy()
         self.search_pattern = None
         self.scroll_offset = 0
@@ -582,13 +865,19 @@ class EPDFViewer:
             self.running = False
         elif action == 'refresh':
             if self.current_directory:
-                self.scan_directory(self.current_directory)
+                self.scan_directory(self.current_directory, self.current_recursive)
         elif action == 'sort_name':
             self.books.sort(key=lambda x: x['name'].lower())
         elif action == 'sort_size':
             self.books.sort(key=lambda x: x['size'], reverse=True)
+        elif action == 'search':
+            self.focus_search_box()
         elif action == 'search_regex':
             self.open_regex_search_dialog()
+        elif action == 'index_content':
+            self.index_content()
+        elif action == 'parse_report':
+            print(self.parse_failures.report())
         elif action == 'show_all':
             self.show_all_books()
 
@@ -597,25 +886,65 @@ class EPDFViewer:
     def run(self):
         while self.running:
             self.handle_events()
+            self.collect_indexed_metadata()
+            self.collect_search_results()
+            self.schedule_covers()
             self.load_pending_covers()
-            self.render()
-            self.clock.tick(60)
+            self.check_header()
+            if self.render():
+                self.clock.tick(self.fps)
+        self.indexer.cancel()
+        self.content_indexer.cancel()
+        self.search_job.stop()
+        self.cover_loader.stop()
+        self.thumbnail_store.flush()
+        print(f"Cache de textes: {len(self.text_cache)} textes, {self.text_cache.stats_text()}")
+        print(f"Cache de cartes: {len(self.card_cache)} cartes, {self.card_cache.stats_text()}")
+        print(self.db.stats_report())
+        self.db.close()
         pygame.quit()
 
+    def has_background_work(self) -> bool:
+        """Résultats attendus d'un thread (couvertures, indexation, recherche)"""
+        return bool(self.cover_loading or self.indexer.is_running() or
+                    self.content_indexer.is_running() or self.search_job.is_running())
+
+    def next_events(self) -> List[pygame.event.Event]:
+        """Événements en attente ; bloque dans event.wait si rien n'est à redessiner"""
+        if self.full_redraw or self.dirty_rects:
+            return pygame.event.get()
+        timeout = self.busy_wait_ms if self.has_background_work() else self.idle_wait_ms
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def scroll_to(self, offset: int):
+        offset = max(0, min(offset, self.max_scroll))
+        if offset != self.scroll_offset:
+            self.scroll_offset = offset
+            self.invalidate(self.grid_rect())
+
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.next_events():
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.TEXTINPUT,
+                              pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # Popups, menus, saisie, nouveau dossier: tout l'écran peut changer
+                self.invalidate()
+
             if event.type == pygame.QUIT:
                 self.running = False
 
             elif event.type == pygame.VIDEORESIZE:
                 self.width, self.height = event.w, event.h
                 self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+                self.reset_text_cache()
                 self.scrollbar_x = self.width - self.scrollbar_width - 5
                 self.update_scroll_limits()
+                self.scroll_to(self.scroll_offset)
 
             elif event.type == pygame.MOUSEWHEEL:
-                self.scroll_offset -= event.y * 40
-                self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
+                self.scroll_to(self.scroll_offset - event.y * 40)
 
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.is_click_on_scrollbar(event.pos):
@@ -628,13 +957,22 @@ class EPDFViewer:
                 self.handle_right_click(event.pos)
 
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                self.scrollbar_dragging = False
+                if self.scrollbar_dragging:
+                    self.scrollbar_dragging = False
+                    self.invalidate(self.grid_rect())
 
             elif event.type == pygame.MOUSEMOTION:
                 if self.scrollbar_dragging:
                     self.handle_scrollbar_drag(event.pos)
 
+            elif event.type == pygame.TEXTINPUT:
+                if self.search_box_active:
+                    self.search_text += event.text
+                    self.apply_live_search()
+
             elif event.type == pygame.KEYDOWN:
+                if self.search_box_active and self.handle_search_key(event):
+                    continue
                 if event.key == pygame.K_ESCAPE:
                     if self.show_context_menu:
                         self.show_context_menu = False
@@ -644,10 +982,14 @@ class EPDFViewer:
                         self.show_open_confirmation = False
                     elif self.show_details_popup:
                         self.show_details_popup = False
+                    elif self.search_job.cancel():
+                        print(f"Recherche « {self.search_pattern} » annulée: {len(self.books)} résultat(s)")
                     else:
                         self.running = False
                 elif event.key == pygame.K_o and pygame.key.get_mods() & pygame.KMOD_CTRL:
                     self.open_folder_dialog()
+                elif event.key == pygame.K_f and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    self.focus_search_box()
 
     def is_click_on_scrollbar(self, pos) -> bool:
         if self.max_scroll <= 0:
@@ -671,7 +1013,9 @@ class EPDFViewer:
 
         relative_y = y - bar_y
         ratio = max(0, min(1, relative_y / bar_height))
-        self.scroll_offset = int(ratio * self.max_scroll)
+        self.scroll_to(int(ratio * self.max_scroll))
+        # Couleur du curseur pendant le glissement
+        self.invalidate(pygame.Rect(self.scrollbar_x, bar_y, self.scrollbar_width, bar_height))
 
     # ---------------- Clics / interactions ----------------
 
@@ -774,6 +1118,12 @@ class EPDFViewer:
                 return
             return
 
+        if self.search_box_rect and self.search_box_rect.collidepoint(x, y):
+            self.focus_search_box()
+            return
+        if self.search_box_active:
+            self.blur_search_box()
+
         if self.back_button_rect and self.back_button_rect.collidepoint(x, y):
             parent_dir = self.current_directory.parent
             if parent_dir != self.current_directory:
@@ -786,7 +1136,7 @@ class EPDFViewer:
         if 10 <= y < 35:
             menu_x = 450
             for i, menu in enumerate(self.menus):
-                text = self.font_small.render(menu['label'], True, self.COLOR_WHITE)
+                text = self.render_text(self.font_small, menu['label'], self.COLOR_WHITE)
                 menu_width = text.get_width() + 20
                 if menu_x <= x < menu_x + menu_width:
                     self.menu_open = None if self.menu_open == i else i
@@ -799,7 +1149,7 @@ class EPDFViewer:
             menu = self.menus[self.menu_open]
             menu_x = 450
             for j in range(self.menu_open):
-                text = self.font_small.render(self.menus[j]['label'], True, self.COLOR_WHITE)
+                text = self.render_text(self.font_small, self.menus[j]['label'], self.COLOR_WHITE)
                 menu_x += text.get_width() + 20
 
             submenu_y = 35
@@ -908,21 +1258,26 @@ class EPDFViewer:
             os.remove(self.selected_book['path'])
             print(f"Livre supprimé: {self.selected_book['name']}")
             self.books = [b for b in self.books if b['path'] != self.selected_book['path']]
+            self.all_books = [b for b in self.all_books if b['path'] != self.selected_book['path']]
+            self.live_search.reset(self.all_books)
+            self.live_search.prepare(self.book_metadata)
+            self.fuzzy_index.invalidate()
 
             path_str = str(self.selected_book['path'])
-            if path_str in self.cover_cache:
-                del self.cover_cache[path_str]
-            if path_str in self.cover_cache_order:
-                self.cover_cache_order.remove(path_str)
+            self.cover_cache.pop(path_str)
+            self.forget_cards([path_str])
             if path_str in self.book_metadata:
                 del self.book_metadata[path_str]
+            self.file_states.pop(path_str, None)
+            self.books_by_path.pop(path_str, None)
 
             # option: supprimer aussi de SQLite
             try:
-                con = self._connect_db()
-                con.execute("DELETE FROM books WHERE path = ?", (path_str,))
-                con.commit()
-                con.close()
+                with self.db.write("suppression") as con:
+                    con.execute("DELETE FROM books WHERE path = ?", (path_str,))
+                    if self.content_enabled:
+                        delete_content(con, [path_str])
+                self.parse_failures.forget([path_str])
             except Exception:
                 pass
 
@@ -947,14 +1302,159 @@ class EPDFViewer:
                 else:
                     md = {}
             self.book_metadata[path_str] = md
+            self.forget_cards([path_str])
 
     # ---------------- Rendu ----------------
 
-    def render(self):
+    def load_fonts(self):
+        """(Re)charger les polices ; les textes rendus avec les anciennes sont oubliés"""
+        self.font_big = pygame.font.SysFont('Arial', 32)
+        self.font_normal = pygame.font.SysFont('Arial', 18)
+        self.font_small = pygame.font.SysFont('Arial', 15)
+        self.reset_text_cache()
+        self.card_cache.clear()
+
+    def reset_text_cache(self):
+        """Oublier les textes rendus (redimensionnement, changement de polices)"""
+        self.text_cache.clear()
+
+    def forget_cards(self, paths):
+        """Oublier la carte précomposée de ces livres (couverture, métadonnées ou résultat changés)"""
+        for path_str in paths:
+            self.card_cache.pop((path_str, self.card_width, self.card_height))
+
+    def render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Texte antialiasé, rendu une seule fois par (police, texte, couleur)"""
+        key = (font, text, color)
+        found, surface = self.text_cache.lookup(key)
+        if not found:
+            surface = font.render(text, True, color).convert_alpha()
+            self.text_cache.put(key, surface)
+        return surface
+
+    def invalidate(self, rect: Optional[pygame.Rect] = None):
+        """Zone à redessiner à la prochaine frame (tout l'écran si `rect` est None)"""
+        if rect is None:
+            self.full_redraw = True
+            return
+        rect = pygame.Rect(rect).clip(self.screen.get_rect())
+        if rect.width and rect.height:
+            self.dirty_rects.append(rect)
+
+    def invalidate_book(self, path_str: str):
+        """Redessiner la carte d'un livre si elle est visible (et la popup qui le montre)"""
+        if self.show_details_popup and self.selected_book and str(self.selected_book['path']) == path_str:
+            self.invalidate()
+            return
+        start_index, end_index = self.visible_book_range()
+        for i in range(start_index, end_index):
+            if str(self.books[i]['path']) == path_str:
+                self.invalidate(self.book_card_rect(i).clip(self.grid_rect()))
+                return
+
+    def header_rect(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, self.width, self.grid_start_y)
+
+    def grid_rect(self) -> pygame.Rect:
+        return pygame.Rect(0, self.grid_start_y, self.width, self.height - self.grid_start_y)
+
+    def book_card_rect(self, index: int) -> pygame.Rect:
+        cols = max(1, (self.width - 60) // (self.card_width + self.card_gap))
+        x = 30 + (index % cols) * (self.card_width + self.card_gap)
+        y = self.grid_start_y + (index // cols) * (self.card_height + self.card_gap) - self.scroll_offset
+        return pygame.Rect(x, y, self.card_width, self.card_height)
+
+    def header_lines(self) -> Tuple[str, str]:
+        """(nombre de livres et cache, progression des indexations) affichés dans l'en-tête"""
+        info = ""
+        if self.books:
+            num_folders = sum(1 for b in self.books if b.get('type') == 'folder')
+            num_books = len(self.books) - num_folders
+            if self.search_pattern:
+                info = f"{num_books}/{len(self.all_books)} livre(s) - Filtre: {self.search_pattern}"
+            else:
+                if num_folders > 0:
+                    info = f"{num_folders} dossier(s) et {num_books} livre(s) - Cache: {self.cover_cache.stats_text()}"
+                else:
+                    info = f"{num_books} livre(s) - Cache: {self.cover_cache.stats_text()}"
+
+        progress = [indexer.progress_text() for indexer in (self.indexer, self.content_indexer)
+                    if indexer.is_running()]
+        return info, " | ".join(progress)
+
+    def check_header(self):
+        """Invalider l'en-tête si ses textes d'état ont changé (au plus 4 fois/s)"""
+        now = time.perf_counter()
+        if now - self.header_checked_at < self.header_check_interval:
+            return
+        self.header_checked_at = now
+        state = (self.header_lines(), self.search_job.is_running(),
+                 self.search_progress_message, round(self.search_progress_percent, 2))
+        if state != self.header_state:
+            self.header_state = state
+            self.invalidate(self.header_rect())
+
+    def render(self) -> bool:
+        """Redessiner les zones invalidées et ne présenter qu'elles. False si rien à faire."""
+        popup = (self.show_details_popup or self.show_open_confirmation or
+                 self.show_context_menu or self.show_delete_confirmation)
+        if self.full_redraw or (popup and self.dirty_rects):
+            # Une popup recouvre tout l'écran (voile): une seule passe complète
+            regions = [self.screen.get_rect()]
+        elif len(self.dirty_rects) > self.max_dirty_rects:
+            regions = [self.dirty_rects[0].unionall(self.dirty_rects[1:])]
+        else:
+            regions = self.dirty_rects
+        if not regions:
+            return False
+
+        for region in regions:
+            self.screen.set_clip(region)
+            self.draw_scene(region)
+        self.screen.set_clip(None)
+
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(regions)
+        self.full_redraw = False
+        self.dirty_rects = []
+        self.frames_drawn += 1
+        return True
+
+    def draw_scene(self, region: pygame.Rect):
+        """Dessiner ce qui recoupe `region` (zone de découpe déjà posée)"""
         self.screen.fill(self.COLOR_BG)
+
+        # Le menu déroulant déborde sur la grille
+        if region.top < self.grid_start_y or self.menu_open is not None:
+            self.render_header()
+
+        grid_clip = self.grid_rect().clip(region)
+        if grid_clip.width and grid_clip.height:
+            self.screen.set_clip(grid_clip)
+            self.render_books()
+            self.screen.set_clip(region)
+
+            if self.max_scroll > 0:
+                self.render_scrollbar()
+
+        if self.show_details_popup and self.selected_book:
+            self.render_details_popup()
+
+        if self.show_open_confirmation and self.selected_book:
+            self.render_open_confirmation_popup()
+
+        if self.show_context_menu and self.context_menu_book:
+            self.render_context_menu()
+
+        if self.show_delete_confirmation and self.selected_book:
+            self.render_delete_confirmation_popup()
+
+    def render_header(self):
         pygame.draw.rect(self.screen, self.COLOR_HEADER, (0, 0, self.width, 100))
 
-        title = self.font_big.render("Visualiseur EPUB & PDF", True, self.COLOR_WHITE)
+        title = self.render_text(self.font_big, "Visualiseur EPUB & PDF", self.COLOR_WHITE)
         self.screen.blit(title, (30, 10))
 
         menu_end_x = self.render_menu()
@@ -970,7 +1470,7 @@ class EPDFViewer:
             pygame.draw.rect(self.screen, (200, 200, 200),
                              (back_button_x, back_button_y, back_button_width, back_button_height), 2)
 
-            back_text = self.font_small.render("← Retour", True, self.COLOR_WHITE)
+            back_text = self.render_text(self.font_small, "← Retour", self.COLOR_WHITE)
             text_x = back_button_x + (back_button_width - back_text.get_width()) // 2
             text_y = back_button_y + (back_button_height - back_text.get_height()) // 2
             self.screen.blit(back_text, (text_x, text_y))
@@ -979,50 +1479,26 @@ class EPDFViewer:
         else:
             self.back_button_rect = None
 
-        if self.books:
-            num_folders = sum(1 for b in self.books if b.get('type') == 'folder')
-            num_books = len(self.books) - num_folders
-            if self.search_pattern:
-                info = f"{num_books}/{len(self.all_books)} livre(s) - Filtre: {self.search_pattern}"
-            else:
-                if num_folders > 0:
-                    info = f"{num_folders} dossier(s) et {num_books} livre(s) - Cache: {len(self.cover_cache)}/{self.max_cache_size}"
-                else:
-                    info = f"{num_books} livre(s) - Cache: {len(self.cover_cache)}/{self.max_cache_size}"
+        info, progress = self.header_lines()
+        if info:
             info_text = self.font_small.render(info, True, self.COLOR_WHITE)
             self.screen.blit(info_text, (30, 50))
 
-        clip_rect = pygame.Rect(0, self.grid_start_y, self.width, self.height - self.grid_start_y)
-        self.screen.set_clip(clip_rect)
-        self.render_books()
-        self.screen.set_clip(None)
+        if progress:
+            index_text = self.font_small.render(progress, True, self.COLOR_WHITE)
+            self.screen.blit(index_text, (30, 72))
 
-        if self.max_scroll > 0:
-            self.render_scrollbar()
+        self.render_search_box()
 
-        if self.show_details_popup and self.selected_book:
-            self.render_details_popup()
-
-        if self.show_open_confirmation and self.selected_book:
-            self.render_open_confirmation_popup()
-
-        if self.show_context_menu and self.context_menu_book:
-            self.render_context_menu()
-
-        if self.show_delete_confirmation and self.selected_book:
-            self.render_delete_confirmation_popup()
-
-        if self.show_search_progress:
+        if self.search_job.is_running():
             self.render_search_progress()
 
-        pygame.display.flip()
-
     def render_menu(self):
         menu_x = 450
         menu_y = 10
 
         for i, menu in enumerate(self.menus):
-            text = self.font_small.render(menu['label'], True, self.COLOR_WHITE)
+            text = self.render_text(self.font_small, menu['label'], self.COLOR_WHITE)
             menu_width = text.get_width() + 20
 
             if self.menu_open == i:
@@ -1040,7 +1516,7 @@ class EPDFViewer:
                 pygame.draw.rect(self.screen, (100, 100, 100), (menu_x, submenu_y, submenu_width, submenu_height), 1)
 
                 for j, item in enumerate(menu['items']):
-                    item_text = self.font_small.render(item['label'], True, self.COLOR_WHITE)
+                    item_text = self.render_text(self.font_small, item['label'], self.COLOR_WHITE)
                     self.screen.blit(item_text, (menu_x + 10, submenu_y + j * item_height + 5))
 
             menu_x += menu_width
@@ -1049,18 +1525,15 @@ class EPDFViewer:
 
     def render_books(self):
         if not self.books:
-            empty_text = self.font_normal.render("Aucun livre. Ouvrez un dossier.", True, (200, 200, 200))
+            empty_text = self.render_text(self.font_normal, "Aucun livre. Ouvrez un dossier.", (200, 200, 200))
             self.screen.blit(empty_text, (self.width // 2 - 140, self.height // 2))
             return
 
         cols = max(1, (self.width - 60) // (self.card_width + self.card_gap))
         start_x = 30
 
-        first_visible_row = max(0, (self.scroll_offset - self.card_height) // (self.card_height + self.card_gap))
-        last_visible_row = (self.scroll_offset + self.height) // (self.card_height + self.card_gap) + 1
-
-        start_index = first_visible_row * cols
-        end_index = min(len(self.books), (last_visible_row + 1) * cols)
+        start_index, end_index = self.visible_book_range()
+        clip = self.screen.get_clip()
 
         for i in range(start_index, end_index):
             book = self.books[i]
@@ -1070,45 +1543,67 @@ class EPDFViewer:
             x = start_x + col * (self.card_width + self.card_gap)
             y = self.grid_start_y + row * (self.card_height + self.card_gap) - self.scroll_offset
 
-            if y + self.card_height < self.grid_start_y or y > self.height:
+            if not clip.colliderect((x, y, self.card_width, self.card_height)):
                 continue
 
             self.render_book_card(x, y, book)
 
+    def visible_book_range(self) -> Tuple[int, int]:
+        """Indices [début, fin) des livres dont la carte peut être visible"""
+        cols = max(1, (self.width - 60) // (self.card_width + self.card_gap))
+        first_visible_row = max(0, (self.scroll_offset - self.card_height) // (self.card_height + self.card_gap))
+        last_visible_row = (self.scroll_offset + self.height) // (self.card_height + self.card_gap) + 1
+        return first_visible_row * cols, min(len(self.books), (last_visible_row + 1) * cols)
+
     def render_book_card(self, x: int, y: int, book: Dict):
-        pygame.draw.rect(self.screen, self.COLOR_CARD, (x, y, self.card_width, self.card_height))
-        pygame.draw.rect(self.screen, (180, 180, 180), (x, y, self.card_width, self.card_height), 1)
+        path_str = str(book['path'])
+        if book['type'] != 'folder' and path_str not in self.cover_cache:
+            # Couverture pas encore connue (chargement): carte dessinée directement
+            self.draw_book_card(self.screen, x, y, book)
+            return
+
+        key = (path_str, self.card_width, self.card_height)
+        found, card = self.card_cache.lookup(key)
+        if not found:
+            card = pygame.Surface((self.card_width, self.card_height)).convert()
+            self.draw_book_card(card, 0, 0, book)
+            self.card_cache.put(key, card)
+        self.screen.blit(card, (x, y))
+
+    def draw_book_card(self, target: pygame.Surface, x: int, y: int, book: Dict):
+        pygame.draw.rect(target, self.COLOR_CARD, (x, y, self.card_width, self.card_height))
+        pygame.draw.rect(target, (180, 180, 180), (x, y, self.card_width, self.card_height), 1)
 
         cover_height = 200
 
         if book['type'] == 'folder':
-            pygame.draw.rect(self.screen, (255, 200, 100), (x, y, self.card_width, cover_height))
-            folder_icon = self.font_big.render("📁", True, self.COLOR_WHITE)
+            pygame.draw.rect(target, (255, 200, 100), (x, y, self.card_width, cover_height))
+            folder_icon = self.render_text(self.font_big, "📁", self.COLOR_WHITE)
             icon_x = x + (self.card_width - folder_icon.get_width()) // 2
             icon_y = y + cover_height // 2 - 30
-            self.screen.blit(folder_icon, (icon_x, icon_y))
+            target.blit(folder_icon, (icon_x, icon_y))
         else:
-            pygame.draw.rect(self.screen, self.COLOR_CARD_COVER, (x, y, self.card_width, cover_height))
+            pygame.draw.rect(target, self.COLOR_CARD_COVER, (x, y, self.card_width, cover_height))
             path_str = str(book['path'])
             cover = self.get_cover_surface(book)
 
             if cover:
                 cx = x + (self.card_width - cover.get_width()) // 2
                 cy = y + (cover_height - cover.get_height()) // 2
-                self.screen.blit(cover, (cx, cy))
+                target.blit(cover, (cx, cy))
             else:
                 is_loading = path_str in self.cover_loading and path_str not in self.cover_cache
-                if is_loading and book['type'] == 'epub':
-                    loading_text = self.font_normal.render("...", True, self.COLOR_WHITE)
+                if is_loading:
+                    loading_text = self.render_text(self.font_normal, "...", self.COLOR_WHITE)
                     lx = x + (self.card_width - loading_text.get_width()) // 2
                     ly = y + cover_height // 2 - 10
-                    self.screen.blit(loading_text, (lx, ly))
+                    target.blit(loading_text, (lx, ly))
                 else:
                     type_text = "EPUB" if book['type'] == 'epub' else "PDF"
-                    placeholder = self.font_big.render(type_text, True, self.COLOR_WHITE)
+                    placeholder = self.render_text(self.font_big, type_text, self.COLOR_WHITE)
                     px = x + (self.card_width - placeholder.get_width()) // 2
                     py = y + cover_height // 2 - 15
-                    self.screen.blit(placeholder, (px, py))
+                    target.blit(placeholder, (px, py))
 
         name = book['name']
         if name.lower().endswith('.epub'):
@@ -1118,8 +1613,17 @@ class EPDFViewer:
         if len(name) > 22:
             name = name[:19] + "..."
 
-        name_text = self.font_small.render(name, True, self.COLOR_TEXT_DARK)
-        self.screen.blit(name_text, (x + 5, y + cover_height + 10))
+        name_text = self.render_text(self.font_small, name, self.COLOR_TEXT_DARK)
+        target.blit(name_text, (x + 5, y + cover_height + 10))
+
+        if book['type'] != 'folder':
+            metadata = self.book_metadata.get(str(book['path']))
+            author = metadata.get('author', '') if metadata else ''
+            if len(author) > 24:
+                author = author[:21] + "..."
+            if author:
+                author_text = self.render_text(self.font_small, author, (108, 117, 125))
+                target.blit(author_text, (x + 5, y + cover_height + 30))
 
         size_kb = book['size'] / 1024 if book.get('size') else 0
         if size_kb > 1024:
@@ -1127,9 +1631,17 @@ class EPDFViewer:
         else:
             size_str = f"{size_kb:.0f} Ko"
 
-        info = f"{book['type'].upper()} - {size_str}"
-        info_text = self.font_small.render(info, True, (100, 100, 100))
-        self.screen.blit(info_text, (x + 5, y + cover_height + 30))
+        hit = self.content_hits.get(str(book['path']))
+        if hit:
+            # Trouvé dans le texte: chapitre à la place du type et de la taille
+            info = f"Page {hit[0]}" if book['type'] == 'pdf' else f"Chap. {hit[0]}: {hit[1]}"
+            if len(info) > 24:
+                info = info[:21] + "..."
+            info_text = self.render_text(self.font_small, info, self.COLOR_HEADER)
+        else:
+            info = f"{book['type'].upper()} - {size_str}"
+            info_text = self.render_text(self.font_small, info, (100, 100, 100))
+        target.blit(info_text, (x + 5, y + cover_height + 50))
 
     def render_scrollbar(self):
         bar_y = self.grid_start_y
@@ -1174,7 +1686,7 @@ class EPDFViewer:
 
         cover_x = popup_x + 20
         cover_y = popup_y + 50
-        cover_surface = self.get_cover_surface(self.selected_book, request_load=True)
+        cover_surface = self.get_cover_surface(self.selected_book)
 
         if cover_surface:
             cover_w, cover_h = cover_surface.get_size()
@@ -1240,6 +1752,19 @@ class EPDFViewer:
         self.screen.blit(size_text, (info_x + 80, info_y))
         info_y += line_height + 10
 
+        hit = self.content_hits.get(path_str)
+        if hit:
+            chapter, label, snippet = hit
+            where = f"page {chapter}" if self.selected_book['type'] == 'pdf' else f"chap. {chapter}, {label[:40]}"
+            hit_label = self.font_normal.render(f"Trouvé: {where}", True, self.COLOR_HEADER)
+            self.screen.blit(hit_label, (info_x, info_y))
+            info_y += line_height
+            for line in textwrap.wrap(snippet, 50)[:3]:
+                hit_text = self.font_small.render(line, True, (80, 80, 80))
+                self.screen.blit(hit_text, (info_x, info_y))
+                info_y += 22
+            info_y += 10
+
         description = metadata.get('description', '')
         if description:
             description = self.clean_html_tags(description)
@@ -1385,62 +1910,51 @@ class EPDFViewer:
         self.screen.blit(no_text, (btn_no_x + (btn_no_w - no_text.get_width()) // 2,
                                    btn_no_y + (btn_no_h - no_text.get_height()) // 2))
 
-    def render_search_progress(self):
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-
-        bar_width = 600
-        bar_height = 120
-        bar_x = (self.width - bar_width) // 2
-        bar_y = (self.height - bar_height) // 2
-
-        pygame.draw.rect(self.screen, self.COLOR_WHITE, (bar_x, bar_y, bar_width, bar_height))
-        pygame.draw.rect(self.screen, self.COLOR_HEADER, (bar_x, bar_y, bar_width, bar_height), 3)
-
-        title_text = self.font_normal.render("Opération en cours...", True, self.COLOR_TEXT_DARK)
-        self.screen.blit(title_text, (bar_x + (bar_width - title_text.get_width()) // 2, bar_y + 15))
-
-        msg_text = self.font_small.render(self.search_progress_message, True, (80, 80, 80))
-        self.screen.blit(msg_text, (bar_x + (bar_width - msg_text.get_width()) // 2, bar_y + 45))
-
-        progress_bar_x = bar_x + 30
-        progress_bar_y = bar_y + 75
-        progress_bar_width = bar_width - 60
-        progress_bar_height = 25
+    def render_search_box(self):
+        box_width = 300
+        box_height = 26
+        box_x = self.width - box_width - 30
+        box_y = 44
+        self.search_box_rect = pygame.Rect(box_x, box_y, box_width, box_height)
+
+        pygame.draw.rect(self.screen, self.COLOR_WHITE, self.search_box_rect)
+        border = (70, 130, 220) if self.search_box_active else (150, 150, 150)
+        pygame.draw.rect(self.screen, border, self.search_box_rect, 2)
+
+        if self.search_text:
+            text = self.font_small.render(self.search_text, True, self.COLOR_TEXT_DARK)
+            # Fin de la saisie visible si elle dépasse du champ
+            offset = max(0, text.get_width() - (box_width - 16))
+            self.screen.blit(text, (box_x + 8, box_y + 5), pygame.Rect(offset, 0, box_width - 16, box_height))
+            caret_x = box_x + 8 + min(text.get_width(), box_width - 16)
+        else:
+            hint = "Rechercher... (Entrée: plein texte)" if self.search_box_active else "Rechercher (Ctrl+F)"
+            text = self.font_small.render(hint, True, (150, 150, 150))
+            self.screen.blit(text, (box_x + 8, box_y + 5))
+            caret_x = box_x + 8
 
-        pygame.draw.rect(self.screen, (220, 220, 220),
-                         (progress_bar_x, progress_bar_y, progress_bar_width, progress_bar_height))
-        pygame.draw.rect(self.screen, (150, 150, 150),
-                         (progress_bar_x, progress_bar_y, progress_bar_width, progress_bar_height), 2)
+        if self.search_box_active:
+            pygame.draw.line(self.screen, self.COLOR_TEXT_DARK, (caret_x, box_y + 5), (caret_x, box_y + box_height - 6))
+            if LIVE_SYNTAX.search(self.search_text) and not self.search_job.is_running():
+                hint = self.font_small.render("Syntaxe plein texte: Entrée pour rechercher", True, self.COLOR_WHITE)
+                self.screen.blit(hint, (box_x + box_width - hint.get_width(), box_y + box_height + 4))
 
-        filled_width = int(progress_bar_width * self.search_progress_percent)
+    def render_search_progress(self):
+        """Barre de progression de la recherche dans l'en-tête (l'interface reste utilisable)"""
+        bar_width = 160
+        bar_height = 14
+        bar_x = self.width - bar_width - 30
+        bar_y = 76
+
+        msg_text = self.font_small.render(f"{self.search_progress_message} - Échap pour annuler",
+                                          True, self.COLOR_WHITE)
+        self.screen.blit(msg_text, (bar_x - msg_text.get_width() - 10, bar_y - 2))
+
+        pygame.draw.rect(self.screen, (220, 220, 220), (bar_x, bar_y, bar_width, bar_height))
+        filled_width = int(bar_width * self.search_progress_percent)
         if filled_width > 0:
-            pygame.draw.rect(self.screen, (70, 130, 220),
-                             (progress_bar_x, progress_bar_y, filled_width, progress_bar_height))
-
-        percent_text = self.font_small.render(f"{int(self.search_progress_percent * 100)}%", True, self.COLOR_TEXT_DARK)
-        self.screen.blit(percent_text, (bar_x + (bar_width - percent_text.get_width()) // 2, progress_bar_y + 5))
-
-    def update_search_progress(self, message: str, percent: float):
-        now = time.time()
-        if not hasattr(self, "_last_progress_draw"):
-            self._last_progress_draw = 0.0
-
-        self.search_progress_message = message
-        self.search_progress_percent = max(0.0, min(1.0, percent))
-
-        if now - self._last_progress_draw >= 0.1:
-            self.screen.fill(self.COLOR_BG)
-            pygame.draw.rect(self.screen, self.COLOR_HEADER, (0, 0, self.width, 100))
-            title = self.font_big.render("Visualiseur EPUB & PDF", True, self.COLOR_WHITE)
-            self.screen.blit(title, (30, 10))
-            self.render_search_progress()
-            pygame.display.flip()
-            self._last_progress_draw = now
-
-        pygame.event.pump()
+            pygame.draw.rect(self.screen, (70, 130, 220), (bar_x, bar_y, filled_width, bar_height))
+        pygame.draw.rect(self.screen, (150, 150, 150), (bar_x, bar_y, bar_width, bar_height), 1)
 
 
 def main():
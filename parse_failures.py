@@ -0,0 +1,175 @@
+"""
+Quarantaine des fichiers illisibles - Table `parse_failures` dans books.db
+Échecs et analyses lentes par (chemin, étape), clé (taille, mtime) : un
+fichier en échec n'est plus analysé à cette étape tant qu'il n'a pas changé.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from library_db import LibraryDB
+
+# Étapes d'analyse
+STAGE_METADATA = 'métadonnées'
+STAGE_COVER = 'couverture'
+STAGE_CONTENT = 'contenu'
+
+# Analyse réussie mais plus lente que ce seuil: gardée pour le rapport
+PARSE_SLOW_SECONDS = 1.0
+# Longueur maximale du message d'erreur enregistré
+MAX_MESSAGE_CHARS = 300
+
+# (classe de l'erreur, message) ou None si l'analyse a réussi
+ParseError = Optional[Tuple[str, str]]
+# (chemin, taille, mtime, erreur, durée en secondes)
+ParseOutcome = Tuple[str, int, float, ParseError, float]
+
+
+def describe_error(e: BaseException) -> Tuple[str, str]:
+    return type(e).__name__, str(e)[:MAX_MESSAGE_CHARS]
+
+
+def timed_parse(func: Callable, *args, **kwargs) -> Tuple[Any, ParseError, float]:
+    """(résultat ou None, erreur, durée) de `func`, utilisable dans un processus de travail"""
+    t0 = time.perf_counter()
+    try:
+        result, error = func(*args, **kwargs), None
+    except Exception as e:
+        result, error = None, describe_error(e)
+    return result, error, time.perf_counter() - t0
+
+
+class ParseFailures:
+    """Fichiers en échec (et analyses lentes) par étape.
+
+    Les entrées sont gardées en mémoire (quelques centaines de lignes au
+    plus) pour que `is_quarantined` ne coûte pas de requête ; les
+    écritures passent par la connexion d'écriture de `db`. Utilisable
+    depuis plusieurs threads.
+    """
+
+    def __init__(self, db: LibraryDB):
+        self.db = db
+        self._lock = threading.Lock()
+        # (chemin, étape) -> (taille, mtime, classe d'erreur ou '')
+        self._entries: Dict[Tuple[str, str], Tuple[int, float, str]] = {}
+        self.skipped = 0
+
+        with db.write("échecs: schéma") as con:
+            con.execute("""
+            CREATE TABLE IF NOT EXISTS parse_failures (
+                path TEXT,
+                stage TEXT,
+                size INTEGER,
+                mtime REAL,
+                error TEXT,
+                message TEXT,
+                duration REAL,
+                count INTEGER,
+                last_seen REAL,
+                PRIMARY KEY (path, stage)
+            )
+            """)
+            for path_str, stage, size, mtime, error in con.execute(
+                    "SELECT path, stage, size, mtime, error FROM parse_failures"):
+                self._entries[(path_str, stage)] = (size, mtime, error)
+
+    # ---------------- Lecture ----------------
+
+    def is_quarantined(self, stage: str, path_str: str, size: int, mtime: float) -> bool:
+        """True si ce fichier, inchangé, a déjà échoué à cette étape"""
+        entry = self._entries.get((path_str, stage))
+        if entry is None or not entry[2] or entry[:2] != (size, mtime):
+            return False
+        self.skipped += 1
+        return True
+
+    def quarantined_count(self) -> int:
+        return sum(1 for entry in self._entries.values() if entry[2])
+
+    # ---------------- Écriture ----------------
+
+    def run(self, stage: str, path_str: str, size: int, mtime: float,
+            func: Callable, *args, **kwargs) -> Any:
+        """Appeler `func` sauf si le fichier est en quarantaine ; None en cas d'échec"""
+        if self.is_quarantined(stage, path_str, size, mtime):
+            return None
+        result, error, duration = timed_parse(func, *args, **kwargs)
+        self.record(stage, [(path_str, size, mtime, error, duration)])
+        return result
+
+    def record(self, stage: str, outcomes: Iterable[ParseOutcome], con=None):
+        """Enregistrer des résultats d'analyse (dans la transaction `con` si fournie).
+
+        Échecs et analyses lentes sont ajoutés ou mis à jour ; une analyse
+        réussie et rapide efface l'entrée du fichier.
+        """
+        upserts = []
+        deletes = []
+        now = time.time()
+        with self._lock:
+            for path_str, size, mtime, error, duration in outcomes:
+                key = (path_str, stage)
+                if error is None and duration < PARSE_SLOW_SECONDS:
+                    if key in self._entries:
+                        del self._entries[key]
+                        deletes.append(key)
+                    continue
+                cls, message = error or ('', '')
+                self._entries[key] = (size, mtime, cls)
+                upserts.append((path_str, stage, size, mtime, cls, message, duration, now))
+        if not upserts and not deletes:
+            return
+
+        if con is None:
+            with self.db.write("échecs: enregistrement") as con:
+                self._write(con, upserts, deletes)
+        else:
+            self._write(con, upserts, deletes)
+
+    @staticmethod
+    def _write(con, upserts: List[Tuple], deletes: List[Tuple[str, str]]):
+        con.executemany("""
+            INSERT INTO parse_failures(path, stage, size, mtime, error, message, duration, count, last_seen)
+            VALUES (?,?,?,?,?,?,?,1,?)
+            ON CONFLICT(path, stage) DO UPDATE SET
+                size=excluded.size, mtime=excluded.mtime, error=excluded.error,
+                message=excluded.message, duration=excluded.duration,
+                count=parse_failures.count + 1, last_seen=excluded.last_seen
+        """, upserts)
+        con.executemany("DELETE FROM parse_failures WHERE path = ? AND stage = ?", deletes)
+
+    def forget(self, paths: List[str]):
+        """Oublier des fichiers supprimés"""
+        gone = set(paths)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in gone]:
+                del self._entries[key]
+        with self.db.write("échecs: suppression") as con:
+            con.executemany("DELETE FROM parse_failures WHERE path = ?", [(p,) for p in paths])
+
+    # ---------------- Rapport ----------------
+
+    def report(self, limit: int = 20) -> str:
+        """Fichiers en échec puis analyses les plus lentes, par étape"""
+        failing = self.db.query("""
+            SELECT stage, path, error, message, duration, count FROM parse_failures
+            WHERE error != '' ORDER BY stage, count DESC, duration DESC LIMIT ?
+        """, (limit,), label="échecs: rapport")
+        slowest = self.db.query("""
+            SELECT stage, path, error, duration FROM parse_failures
+            ORDER BY duration DESC LIMIT ?
+        """, (limit,), label="échecs: rapport")
+
+        lines = [f"Fichiers en quarantaine: {self.quarantined_count()} "
+                 f"({self.skipped} analyse(s) évitée(s) depuis le démarrage)"]
+        for stage, path_str, error, message, duration, count in failing:
+            lines.append(f"  [{stage}] {path_str}: {error} {message} "
+                         f"({duration * 1000:.0f} ms, {count} échec(s))")
+        if slowest:
+            lines.append("Analyses les plus lentes:")
+            for stage, path_str, error, duration in slowest:
+                status = f" - {error}" if error else ""
+                lines.append(f"  {duration:7.2f} s  [{stage}] {path_str}{status}")
+        return "\n".join(lines)
@@ -0,0 +1,896 @@
+"""
+Lecture des fichiers PDF - Métadonnées
+Fonctions de module (sans état) utilisables depuis un pool de processus
+
+Lecteur rapide: le fichier est projeté en mémoire (mmap) et seuls la fin
+du fichier (startxref, trailer, table ou flux xref) et les quelques objets
+utiles (Info, catalogue, XMP) sont lus. PyPDF2 ne sert qu'en secours,
+quand la structure n'est pas reconnue (xref cassée, chiffrement...).
+"""
+
+import base64
+import mmap
+import re
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from io import BytesIO
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+from epub_reader import empty_metadata
+from imaging import MAX_COVER_BYTES, MAX_DECODE_PIXELS
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Fin de fichier examinée pour trouver « startxref »
+TAIL_BYTES = 2048
+# Au-delà, un objet (dictionnaire) est considéré comme corrompu
+MAX_OBJECT_BYTES = 256 * 1024
+# Taille maximale d'un flux décompressé (xref, flux d'objets)
+MAX_STREAM_BYTES = 16 * 1024 * 1024
+# Métadonnées XMP plus grandes ignorées
+MAX_XMP_BYTES = 1024 * 1024
+# Protection contre les chaînes /Prev bouclées ou démesurées
+MAX_XREF_SECTIONS = 64
+
+
+class PdfSyntaxError(Exception):
+    """Structure non reconnue par le lecteur rapide"""
+
+
+class PdfName(str):
+    """Nom PDF (/Type) ; les chaînes PDF sont représentées par des bytes"""
+
+
+class PdfRef(NamedTuple):
+    num: int
+    gen: int
+
+
+class PdfStream(NamedTuple):
+    """Objet flux: dictionnaire et position des données dans le fichier"""
+    dict: Dict
+    start: int
+
+
+# ---------------- Analyse lexicale ----------------
+
+_SKIP = re.compile(rb'(?:[ \t\r\n\x0c\x00]+|%[^\r\n]*)*')
+_REGULAR = re.compile(rb'[^ \t\r\n\x0c\x00()<>\[\]{}/%]+')
+_REF_TAIL = re.compile(rb'[ \t\r\n\x0c\x00]+(\d+)[ \t\r\n\x0c\x00]+R(?![^ \t\r\n\x0c\x00()<>\[\]{}/%])')
+_STRING_SPECIAL = re.compile(rb'[()\\]')
+_NAME_ESCAPE = re.compile(rb'#([0-9A-Fa-f]{2})')
+_OBJ_HEADER = re.compile(rb'[ \t\r\n\x0c\x00]*(\d+)[ \t\r\n\x0c\x00]+(\d+)[ \t\r\n\x0c\x00]+obj')
+_STREAM_KEYWORD = re.compile(rb'[ \t\r\n\x0c\x00]*stream(?:\r\n|\n|\r)?')
+_STARTXREF = re.compile(rb'startxref[ \t\r\n\x0c\x00]+(\d+)')
+_XREF_SUBSECTION = re.compile(rb'(\d+)[ \t]+(\d+)[ \t\r\n\x0c\x00]*')
+_XREF_ENTRY = re.compile(rb'(\d{10})[ \t](\d{5})[ \t]([nf])(?:\r\n| \r| \n|\r|\n| )?')
+
+_ESCAPES = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f',
+            ord('('): b'(', ord(')'): b')', ord('\\'): b'\\'}
+
+
+def parse_object(buf, pos: int, end: int):
+    """Analyser un objet direct à partir de `pos` -> (valeur, position suivante)"""
+    pos = _SKIP.match(buf, pos, end).end()
+    if pos >= end:
+        raise PdfSyntaxError("objet tronqué")
+    c = buf[pos]
+
+    if c == 0x2F:  # /Nom
+        m = _REGULAR.match(buf, pos + 1, end)
+        if not m:
+            return PdfName(''), pos + 1
+        raw = m.group()
+        if b'#' in raw:
+            raw = _NAME_ESCAPE.sub(lambda e: bytes([int(e.group(1), 16)]), raw)
+        return PdfName(raw.decode('latin-1')), m.end()
+
+    if c == 0x3C:  # << dictionnaire >> ou <chaîne hexadécimale>
+        if buf[pos + 1:pos + 2] == b'<':
+            return _parse_dict(buf, pos + 2, end)
+        close = buf.find(b'>', pos + 1, end)
+        if close < 0:
+            raise PdfSyntaxError("chaîne hexadécimale non terminée")
+        digits = re.sub(rb'[^0-9A-Fa-f]', b'', buf[pos + 1:close])
+        if len(digits) % 2:
+            digits += b'0'
+        return bytes.fromhex(digits.decode('ascii')), close + 1
+
+    if c == 0x5B:  # [ tableau ]
+        items = []
+        pos += 1
+        while True:
+            pos = _SKIP.match(buf, pos, end).end()
+            if buf[pos:pos + 1] == b']':
+                return items, pos + 1
+            value, pos = parse_object(buf, pos, end)
+            items.append(value)
+
+    if c == 0x28:  # (chaîne littérale)
+        return _parse_literal_string(buf, pos + 1, end)
+
+    m = _REGULAR.match(buf, pos, end)
+    if not m:
+        raise PdfSyntaxError(f"caractère inattendu {bytes([c])!r} à {pos}")
+    token, pos = m.group(), m.end()
+    if token.isdigit():
+        ref = _REF_TAIL.match(buf, pos, end)
+        if ref:
+            return PdfRef(int(token), int(ref.group(1))), ref.end()
+        return int(token), pos
+    if token == b'true':
+        return True, pos
+    if token == b'false':
+        return False, pos
+    if token == b'null':
+        return None, pos
+    try:
+        return (float(token) if b'.' in token else int(token)), pos
+    except ValueError:
+        raise PdfSyntaxError(f"jeton inattendu {token[:20]!r}") from None
+
+
+def _parse_dict(buf, pos: int, end: int) -> Tuple[Dict, int]:
+    result = {}
+    while True:
+        pos = _SKIP.match(buf, pos, end).end()
+        if buf[pos:pos + 2] == b'>>':
+            return result, pos + 2
+        key, pos = parse_object(buf, pos, end)
+        if not isinstance(key, PdfName):
+            raise PdfSyntaxError("clé de dictionnaire invalide")
+        result[key], pos = parse_object(buf, pos, end)
+
+
+def _parse_literal_string(buf, pos: int, end: int) -> Tuple[bytes, int]:
+    out = bytearray()
+    depth = 1
+    while True:
+        m = _STRING_SPECIAL.search(buf, pos, end)
+        if not m:
+            raise PdfSyntaxError("chaîne non terminée")
+        out += buf[pos:m.start()]
+        pos = m.end()
+        c = buf[m.start()]
+        if c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos
+            out.append(c)
+        else:  # barre oblique inverse
+            if pos >= end:
+                raise PdfSyntaxError("chaîne non terminée")
+            e = buf[pos]
+            pos += 1
+            if e in _ESCAPES:
+                out += _ESCAPES[e]
+            elif 0x30 <= e <= 0x37:
+                digits = bytes([e])
+                while len(digits) < 3 and pos < end and 0x30 <= buf[pos] <= 0x37:
+                    digits += bytes([buf[pos]])
+                    pos += 1
+                out.append(int(digits, 8) & 0xFF)
+            elif e == 0x0D:  # continuation de ligne
+                if buf[pos:pos + 1] == b'\n':
+                    pos += 1
+            elif e != 0x0A:
+                out.append(e)
+
+
+# ---------------- Décodage des flux ----------------
+
+def _inflate(data: bytes, limit: int = MAX_STREAM_BYTES) -> bytes:
+    decompressor = zlib.decompressobj()
+    out = decompressor.decompress(data, limit)
+    if decompressor.unconsumed_tail:
+        raise PdfSyntaxError("flux décompressé trop volumineux")
+    return out
+
+
+def _png_unpredict(data: bytes, columns: int, bpp: int = 1) -> bytes:
+    """Inverser les prédicteurs PNG (DecodeParms /Predictor >= 10)"""
+    row_len = columns + 1
+    prev = bytes(columns)
+    out = bytearray()
+    for i in range(0, len(data) - row_len + 1, row_len):
+        kind = data[i]
+        row = bytearray(data[i + 1:i + row_len])
+        if kind == 1:  # Sub
+            for j in range(bpp, columns):
+                row[j] = (row[j] + row[j - bpp]) & 0xFF
+        elif kind == 2:  # Up
+            row = bytearray((a + b) & 0xFF for a, b in zip(row, prev))
+        elif kind == 3:  # Average
+            for j in range(columns):
+                left = row[j - bpp] if j >= bpp else 0
+                row[j] = (row[j] + ((left + prev[j]) >> 1)) & 0xFF
+        elif kind == 4:  # Paeth
+            for j in range(columns):
+                a = row[j - bpp] if j >= bpp else 0
+                b = prev[j]
+                c = prev[j - bpp] if j >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                row[j] = (row[j] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+        elif kind != 0:
+            raise PdfSyntaxError(f"prédicteur PNG inconnu {kind}")
+        out += row
+        prev = row
+    return bytes(out)
+
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+# ---------------- Fichier PDF ----------------
+
+class PdfFile:
+    """Accès paresseux aux objets d'un PDF projeté en mémoire.
+
+    Seules les sections xref (tables: en-têtes de sous-sections, flux:
+    décompressés) sont lues à l'ouverture ; chaque objet est ensuite lu
+    à son offset. Toute incohérence lève `PdfSyntaxError`.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self.buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self.size = len(self.buf)
+        # Octets parasites avant l'en-tête: les offsets sont relatifs à %PDF-
+        self.base = max(0, self.buf.find(b'%PDF-', 0, 1024))
+        self.trailer: Dict = {}
+        self._sections: List[Tuple] = []
+        self._objects: Dict[int, object] = {}
+        self._object_streams: Dict[int, Tuple[bytes, Dict[int, int], int]] = {}
+        try:
+            self._load_xref()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        self.buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- xref -----
+
+    def _load_xref(self):
+        tail_start = max(0, self.size - TAIL_BYTES)
+        at = self.buf.rfind(b'startxref', tail_start)
+        m = _STARTXREF.match(self.buf, at) if at >= 0 else None
+        if not m:
+            raise PdfSyntaxError("startxref introuvable")
+
+        offset = int(m.group(1))
+        seen = set()
+        while offset is not None:
+            if offset in seen or len(seen) >= MAX_XREF_SECTIONS:
+                break
+            seen.add(offset)
+            trailer = self._load_section(self.base + offset)
+            if isinstance(trailer.get('XRefStm'), int):
+                # Fichier hybride: flux xref complémentaire de la table
+                self._load_section(self.base + trailer['XRefStm'])
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            prev = trailer.get('Prev')
+            offset = prev if isinstance(prev, int) else None
+
+    def _load_section(self, pos: int) -> Dict:
+        buf = self.buf
+        pos = _SKIP.match(buf, pos).end()
+        if buf[pos:pos + 4] == b'xref':
+            return self._load_xref_table(pos + 4)
+
+        header = _OBJ_HEADER.match(buf, pos)
+        if not header:
+            raise PdfSyntaxError(f"section xref introuvable à {pos}")
+        d, after = parse_object(buf, header.end(), min(self.size, header.end() + MAX_OBJECT_BYTES))
+        if not isinstance(d, dict) or d.get('Type') != 'XRef':
+            raise PdfSyntaxError("flux xref attendu")
+        data = self.stream_data(PdfStream(d, self._stream_start(after)))
+        widths = d.get('W')
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise PdfSyntaxError("/W invalide")
+        index = d.get('Index') or [0, d.get('Size', 0)]
+        ranges = list(zip(index[0::2], index[1::2]))
+        self._sections.append(('stream', ranges, widths, data))
+        return d
+
+    def _load_xref_table(self, pos: int) -> Dict:
+        buf = self.buf
+        subsections = []
+        while True:
+            pos = _SKIP.match(buf, pos).end()
+            if buf[pos:pos + 7] == b'trailer':
+                trailer, _ = parse_object(buf, pos + 7, min(self.size, pos + 7 + MAX_OBJECT_BYTES))
+                if not isinstance(trailer, dict):
+                    raise PdfSyntaxError("trailer invalide")
+                self._sections.append(('table', subsections))
+                return trailer
+            m = _XREF_SUBSECTION.match(buf, pos)
+            if not m:
+                raise PdfSyntaxError(f"sous-section xref invalide à {pos}")
+            start, count = int(m.group(1)), int(m.group(2))
+            pos = m.end()
+            entry_len = 20
+            if count:
+                entry = _XREF_ENTRY.match(buf, pos)
+                if not entry:
+                    raise PdfSyntaxError(f"entrée xref invalide à {pos}")
+                entry_len = entry.end() - pos
+            subsections.append((start, count, pos, entry_len))
+            # Les entrées ne sont pas lues: saut direct à la sous-section suivante
+            pos += count * entry_len
+
+    def _lookup(self, num: int):
+        """('offset', position) | ('compressed', flux, index) | None"""
+        for section in self._sections:
+            if section[0] == 'table':
+                for start, count, first, entry_len in section[1]:
+                    if start <= num < start + count:
+                        m = _XREF_ENTRY.match(self.buf, first + (num - start) * entry_len)
+                        if not m:
+                            raise PdfSyntaxError(f"entrée xref invalide pour l'objet {num}")
+                        if m.group(3) == b'n':
+                            return 'offset', self.base + int(m.group(1))
+                        break
+            else:
+                _, ranges, (w1, w2, w3), data = section
+                row = 0
+                for start, count in ranges:
+                    if start <= num < start + count:
+                        i = (row + num - start) * (w1 + w2 + w3)
+                        kind = int.from_bytes(data[i:i + w1], 'big') if w1 else 1
+                        f2 = int.from_bytes(data[i + w1:i + w1 + w2], 'big')
+                        f3 = int.from_bytes(data[i + w1 + w2:i + w1 + w2 + w3], 'big')
+                        if kind == 1:
+                            return 'offset', self.base + f2
+                        if kind == 2:
+                            return 'compressed', f2, f3
+                        break
+                    row += count
+        return None
+
+    # ----- objets -----
+
+    def get(self, value):
+        """Résoudre une référence indirecte (les valeurs directes sont rendues telles quelles)"""
+        if not isinstance(value, PdfRef):
+            return value
+        num = value.num
+        if num in self._objects:
+            return self._objects[num]
+
+        entry = self._lookup(num)
+        obj = None
+        if entry is not None and entry[0] == 'offset':
+            obj = self._read_object_at(entry[1], num)
+        elif entry is not None:
+            obj = self._read_compressed(entry[1], entry[2], num)
+        self._objects[num] = obj
+        return obj
+
+    def _read_object_at(self, pos: int, num: int):
+        header = _OBJ_HEADER.match(self.buf, pos)
+        if not header or int(header.group(1)) != num:
+            raise PdfSyntaxError(f"objet {num} absent à l'offset {pos}")
+        value, after = parse_object(self.buf, header.end(), min(self.size, header.end() + MAX_OBJECT_BYTES))
+        if isinstance(value, dict):
+            m = _STREAM_KEYWORD.match(self.buf, after)
+            if m:
+                return PdfStream(value, m.end())
+        return value
+
+    def _stream_start(self, after_dict: int) -> int:
+        m = _STREAM_KEYWORD.match(self.buf, after_dict)
+        if not m:
+            raise PdfSyntaxError("mot-clé stream attendu")
+        return m.end()
+
+    def _read_compressed(self, stream_num: int, index: int, num: int):
+        cached = self._object_streams.get(stream_num)
+        if cached is None:
+            stream = self.get(PdfRef(stream_num, 0))
+            if not isinstance(stream, PdfStream):
+                raise PdfSyntaxError(f"flux d'objets {stream_num} introuvable")
+            data = self.stream_data(stream)
+            first = stream.dict.get('First', 0)
+            numbers = [int(v) for v in data[:first].split()]
+            offsets = dict(zip(numbers[0::2], numbers[1::2]))
+            cached = (data, offsets, first)
+            self._object_streams[stream_num] = cached
+        data, offsets, first = cached
+        if num not in offsets:
+            raise PdfSyntaxError(f"objet {num} absent du flux {stream_num}")
+        return parse_object(data, first + offsets[num], len(data))[0]
+
+    def raw_stream(self, stream: PdfStream) -> bytes:
+        """Données brutes (encodées) d'un flux"""
+        length = self.get(stream.dict.get('Length'))
+        if not isinstance(length, int) or length < 0 or stream.start + length > self.size:
+            raise PdfSyntaxError("/Length invalide")
+        return self.buf[stream.start:stream.start + length]
+
+    def stream_data(self, stream: PdfStream) -> bytes:
+        """Données décodées d'un flux (FlateDecode et prédicteurs PNG uniquement)"""
+        data = self.raw_stream(stream)
+        filters = _as_list(self.get(stream.dict.get('Filter')))
+        params = _as_list(self.get(stream.dict.get('DecodeParms')))
+        for i, name in enumerate(filters):
+            data = _decode_filter(name, data, self.get(params[i]) if i < len(params) else None)
+        return data
+
+
+def _decode_filter(name, data: bytes, parms, limit: int = MAX_STREAM_BYTES) -> bytes:
+    """Appliquer un filtre sans perte (Flate + prédicteur PNG, ASCIIHex, ASCII85)"""
+    if name in ('ASCIIHexDecode', 'AHx'):
+        end = data.find(b'>')
+        digits = re.sub(rb'[^0-9A-Fa-f]', b'', data if end < 0 else data[:end])
+        return bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii'))
+    if name in ('ASCII85Decode', 'A85'):
+        end = data.find(b'~>')
+        data = re.sub(rb'[ \t\r\n\x0c\x00]', b'', data if end < 0 else data[:end])
+        return base64.a85decode(data[2:] if data.startswith(b'<~') else data)
+    if name not in ('FlateDecode', 'Fl'):
+        raise PdfSyntaxError(f"filtre non pris en charge: {name}")
+
+    data = _inflate(data, limit)
+    if isinstance(parms, dict) and parms.get('Predictor', 1) >= 10:
+        colors = parms.get('Colors', 1)
+        bpc = parms.get('BitsPerComponent', 8)
+        bpp = max(1, colors * bpc // 8)
+        data = _png_unpredict(data, (parms.get('Columns', 1) * colors * bpc + 7) // 8, bpp)
+    return data
+
+
+# ---------------- Textes et dates ----------------
+
+# PDFDocEncoding: identique à Latin-1 sauf 0x80-0xA0
+_PDFDOC_HIGH = ('•†‡…—–ƒ⁄‹›−‰'
+                '„“”‘’‚™ﬁﬂŁŒŠ'
+                'ŸŽıłœšž�€')
+_PDFDOC_TABLE = {0x80 + i: ch for i, ch in enumerate(_PDFDOC_HIGH)}
+
+_PDF_DATE = re.compile(r"(?:D:)?(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?"
+                       r"(?:([Zz+\-])(\d{2})?'?(\d{2})?'?)?")
+
+
+def decode_text(value) -> str:
+    """Chaîne texte PDF (UTF-16 avec BOM, UTF-8 avec BOM ou PDFDocEncoding)"""
+    if isinstance(value, bytes):
+        if value.startswith(b'\xfe\xff'):
+            text = value[2:].decode('utf-16-be', 'replace')
+        elif value.startswith(b'\xff\xfe'):
+            text = value[2:].decode('utf-16-le', 'replace')
+        elif value.startswith(b'\xef\xbb\xbf'):
+            text = value[3:].decode('utf-8', 'replace')
+        else:
+            text = value.decode('latin-1').translate(_PDFDOC_TABLE)
+        return text.strip('\x00').strip()
+    if value is None or isinstance(value, (dict, list, PdfStream)):
+        return ''
+    return str(value).strip()
+
+
+def format_pdf_date(text: str) -> str:
+    """« D:20200131120000+01'00' » -> « 2020-01-31 12:00:00+01:00 » (format de PyPDF2)"""
+    m = _PDF_DATE.match(text.strip())
+    if not m:
+        return text
+    year, month, day, hour, minute, second, sign, tz_h, tz_m = m.groups()
+    try:
+        tz = None
+        if sign in ('Z', 'z'):
+            tz = timezone.utc
+        elif sign:
+            delta = timedelta(hours=int(tz_h or 0), minutes=int(tz_m or 0))
+            tz = timezone(-delta if sign == '-' else delta)
+        return str(datetime(int(year), int(month or 1), int(day or 1), int(hour or 0),
+                            int(minute or 0), int(second or 0), tzinfo=tz))
+    except ValueError:
+        return text
+
+
+# ---------------- XMP ----------------
+
+XMP_NS = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'pdf': 'http://ns.adobe.com/pdf/1.3/',
+    'xmp': 'http://ns.adobe.com/xap/1.0/',
+}
+
+
+def _xmp_values(root: ET.Element, prefix: str, name: str) -> List[str]:
+    """Valeurs d'une propriété XMP (rdf:Alt/Seq/Bag, texte simple ou attribut)"""
+    tag = f"{{{XMP_NS[prefix]}}}{name}"
+    values = []
+    for el in root.iter(tag):
+        items = [li.text.strip() for li in el.iter(f"{{{XMP_NS['rdf']}}}li") if li.text and li.text.strip()]
+        if items:
+            values.extend(items)
+        elif el.text and el.text.strip():
+            values.append(el.text.strip())
+    for description in root.iter(f"{{{XMP_NS['rdf']}}}Description"):
+        if description.get(tag):
+            values.append(description.get(tag).strip())
+    return values
+
+
+def parse_xmp(data: bytes) -> Dict:
+    """Métadonnées (format commun) d'un paquet XMP"""
+    metadata = empty_metadata()
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return metadata
+
+    titles = _xmp_values(root, 'dc', 'title')
+    creators = _xmp_values(root, 'dc', 'creator')
+    publishers = _xmp_values(root, 'dc', 'publisher') or _xmp_values(root, 'pdf', 'Producer')
+    descriptions = _xmp_values(root, 'dc', 'description')
+    languages = _xmp_values(root, 'dc', 'language')
+    dates = _xmp_values(root, 'xmp', 'CreateDate')
+
+    if titles:
+        metadata['title'] = titles[0]
+    if creators:
+        metadata['author'] = ', '.join(creators)
+    if publishers:
+        metadata['publisher'] = publishers[0]
+    if descriptions:
+        metadata['description'] = descriptions[0]
+    if languages:
+        metadata['language'] = languages[0]
+    if dates:
+        try:
+            metadata['date'] = str(datetime.fromisoformat(dates[0]))
+        except ValueError:
+            metadata['date'] = dates[0]
+    return metadata
+
+
+# ---------------- Métadonnées ----------------
+
+INFO_FIELDS = {
+    'Title': 'title',
+    'Author': 'author',
+    'Producer': 'publisher',
+    'Subject': 'description',
+}
+
+
+def read_pdf_metadata_fast(pdf_path: Path) -> Dict:
+    """Métadonnées via mmap: dictionnaire Info, puis XMP et /Lang du catalogue
+    pour les champs manquants. Lève une exception si la structure n'est pas
+    reconnue."""
+    metadata = empty_metadata()
+    with PdfFile(pdf_path) as pdf:
+        if 'Encrypt' in pdf.trailer:
+            raise PdfSyntaxError("PDF chiffré")
+
+        info = pdf.get(pdf.trailer.get('Info'))
+        if isinstance(info, dict):
+            for key, field in INFO_FIELDS.items():
+                metadata[field] = decode_text(pdf.get(info.get(key)))
+            date = decode_text(pdf.get(info.get('CreationDate')))
+            if date:
+                metadata['date'] = format_pdf_date(date)
+
+        catalog = pdf.get(pdf.trailer.get('Root'))
+        if isinstance(catalog, dict):
+            metadata['language'] = decode_text(pdf.get(catalog.get('Lang')))
+            stream = pdf.get(catalog.get('Metadata'))
+            if isinstance(stream, PdfStream) and not all(metadata.values()):
+                length = pdf.get(stream.dict.get('Length'))
+                if isinstance(length, int) and length <= MAX_XMP_BYTES:
+                    try:
+                        xmp = parse_xmp(pdf.stream_data(stream))
+                    except (PdfSyntaxError, zlib.error):
+                        xmp = {}
+                    for field, value in xmp.items():
+                        if value and not metadata[field]:
+                            metadata[field] = value
+    return metadata
+
+
+def read_pdf_metadata_pypdf(pdf_path: Path, strict: bool = False) -> Dict:
+    """Lecture complète avec PyPDF2 (lente, tolère les xref cassées ; strict: erreurs levées)"""
+    metadata = empty_metadata()
+
+    if PdfReader:
+        try:
+            with open(pdf_path, 'rb') as f:
+                pdf = PdfReader(f)
+                info = pdf.metadata
+                if info:
+                    if info.title:
+                        metadata['title'] = str(info.title)
+                    if info.author:
+                        metadata['author'] = str(info.author)
+                    if info.producer:
+                        metadata['publisher'] = str(info.producer)
+                    if info.subject:
+                        metadata['description'] = str(info.subject)
+                    if getattr(info, "creation_date", None):
+                        metadata['date'] = str(info.creation_date)
+        except Exception:
+            if strict:
+                raise
+
+    return metadata
+
+
+def read_pdf_metadata(pdf_path: Path, strict: bool = False) -> Dict:
+    """Lire les métadonnées d'un fichier PDF (lecteur rapide, PyPDF2 en secours).
+
+    strict: si PyPDF2 échoue aussi, son exception est levée.
+    """
+    try:
+        return read_pdf_metadata_fast(pdf_path)
+    except Exception:
+        return read_pdf_metadata_pypdf(pdf_path, strict)
+
+
+# ---------------- Texte ----------------
+
+def iter_pdf_text(pdf_path: Path) -> Iterator[Tuple[int, str]]:
+    """(n° de page, texte) de chaque page, avec PyPDF2 (rien s'il est absent).
+
+    Lent et sans limite de temps sur certains fichiers: à n'appeler que
+    depuis un processus isolé (sandbox_pool).
+    """
+    if PdfReader is None:
+        return
+    with open(pdf_path, 'rb') as f:
+        pdf = PdfReader(f)
+        if pdf.is_encrypted and not pdf.decrypt(''):
+            return
+        for number, page in enumerate(pdf.pages, 1):
+            yield number, page.extract_text() or ''
+
+
+# ---------------- Couverture ----------------
+
+# Temps maximal consacré à la couverture d'un PDF (hors réduction de l'image)
+PDF_COVER_TIME_BUDGET = 2.0
+# Images plus petites ignorées (logos, puces)
+MIN_COVER_SIDE = 96
+MAX_PAGE_TREE_DEPTH = 32
+MAX_FORM_DEPTH = 2
+
+_IMAGE_CODECS = {'DCTDecode': 'DCT', 'DCT': 'DCT', 'JPXDecode': 'JPX',
+                 'CCITTFaxDecode': 'CCITT', 'CCF': 'CCITT'}
+_DEVICE_MODES = {'DeviceGray': 'L', 'CalGray': 'L', 'DeviceRGB': 'RGB', 'CalRGB': 'RGB',
+                 'DeviceCMYK': 'CMYK', 'G': 'L', 'RGB': 'RGB', 'CMYK': 'CMYK'}
+_ICC_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+
+
+def _check_deadline(deadline: float):
+    if time.monotonic() > deadline:
+        raise TimeoutError("budget de temps dépassé")
+
+
+def _first_page(pdf: PdfFile) -> Optional[Dict]:
+    """Première page, avec les Resources héritées de l'arbre des pages"""
+    catalog = pdf.get(pdf.trailer.get('Root'))
+    node = pdf.get(catalog.get('Pages')) if isinstance(catalog, dict) else None
+    resources = None
+    for _ in range(MAX_PAGE_TREE_DEPTH):
+        if not isinstance(node, dict):
+            return None
+        resources = node.get('Resources', resources)
+        kids = pdf.get(node.get('Kids'))
+        if node.get('Type') == 'Page' or not isinstance(kids, list):
+            return dict(node, Resources=resources)
+        if not kids:
+            return None
+        node = pdf.get(kids[0])
+    return None
+
+
+def _page_images(pdf: PdfFile, resources, depth: int = 0) -> List[Tuple[int, PdfStream]]:
+    """Images (surface, flux) des ressources d'une page, y compris dans les Form"""
+    resources = pdf.get(resources)
+    xobjects = pdf.get(resources.get('XObject')) if isinstance(resources, dict) else None
+    if not isinstance(xobjects, dict):
+        return []
+
+    images = []
+    for ref in xobjects.values():
+        stream = pdf.get(ref)
+        if not isinstance(stream, PdfStream):
+            continue
+        subtype = stream.dict.get('Subtype')
+        if subtype == 'Image' and not stream.dict.get('ImageMask'):
+            w, h = pdf.get(stream.dict.get('Width')), pdf.get(stream.dict.get('Height'))
+            if isinstance(w, int) and isinstance(h, int) and min(w, h) >= MIN_COVER_SIDE:
+                images.append((w * h, stream))
+        elif subtype == 'Form' and depth < MAX_FORM_DEPTH:
+            images.extend(_page_images(pdf, stream.dict.get('Resources'), depth + 1))
+    return images
+
+
+def _color_space(pdf: PdfFile, value):
+    """(mode PIL, palette RGB ou None) d'un espace colorimétrique ; None si non pris en charge"""
+    value = pdf.get(value)
+    if isinstance(value, str):
+        mode = _DEVICE_MODES.get(value)
+        return (mode, None) if mode else None
+    if not isinstance(value, list) or not value:
+        return None
+
+    family = value[0]
+    if family == 'ICCBased' and len(value) > 1:
+        profile = pdf.get(value[1])
+        n = profile.dict.get('N') if isinstance(profile, PdfStream) else None
+        mode = _ICC_MODES.get(n)
+        return (mode, None) if mode else None
+    if family in ('CalRGB', 'CalGray'):
+        return _DEVICE_MODES[family], None
+    if family in ('Indexed', 'I') and len(value) == 4:
+        base = _color_space(pdf, value[1])
+        lookup = pdf.get(value[3])
+        if isinstance(lookup, PdfStream):
+            lookup = pdf.stream_data(lookup)
+        if base is None or base[0] == 'CMYK' or not isinstance(lookup, bytes):
+            return None
+        if base[0] == 'L':
+            lookup = bytes(v for g in lookup for v in (g, g, g))
+        return 'P', lookup[:3 * (pdf.get(value[2]) + 1)]
+    return None
+
+
+def _ccitt_tiff(data: bytes, width: int, height: int, parms: Dict, invert: bool) -> bytes:
+    """Envelopper un flux CCITT dans un TIFF minimal décodable par Pillow (libtiff)"""
+    k = parms.get('K', 0)
+    height = parms.get('Rows') or height
+    if k < 0:
+        compression, t4_options = 4, None
+    else:
+        compression = 3
+        t4_options = (1 if k > 0 else 0) | (4 if parms.get('EncodedByteAlign') else 0)
+    # 0 = WhiteIsZero: convention du fax ; 1 inverse le rendu (BlackIs1 / Decode [1 0])
+    photometric = 1 if invert else 0
+
+    tags = [(256, 4, width), (257, 4, height), (258, 3, 1), (259, 3, compression),
+            (262, 3, photometric), (273, 4, 0), (277, 3, 1), (278, 4, height), (279, 4, len(data))]
+    if t4_options is not None:
+        tags.append((292, 4, t4_options))
+    tags.sort()
+    data_offset = 8 + 2 + len(tags) * 12 + 4
+    ifd = struct.pack('<H', len(tags))
+    for tag, kind, value in tags:
+        if tag == 273:
+            value = data_offset
+        if kind == 3:
+            ifd += struct.pack('<HHIHH', tag, kind, 1, value, 0)
+        else:
+            ifd += struct.pack('<HHII', tag, kind, 1, value)
+    return b'II*\x00' + struct.pack('<I', 8) + ifd + struct.pack('<I', 0) + data
+
+
+def _decode_image(pdf: PdfFile, stream: PdfStream) -> Optional["Image.Image"]:
+    """Image PIL (non décodée si possible) d'un XObject Image ; None si non pris en charge"""
+    d = stream.dict
+    width, height = pdf.get(d.get('Width')), pdf.get(d.get('Height'))
+    if width * height > MAX_DECODE_PIXELS:
+        return None
+    length = pdf.get(d.get('Length'))
+    if not isinstance(length, int) or length > MAX_COVER_BYTES:
+        return None
+
+    filters = [pdf.get(f) for f in _as_list(pdf.get(d.get('Filter')))]
+    params = [pdf.get(p) for p in _as_list(pdf.get(d.get('DecodeParms')))]
+    params += [None] * (len(filters) - len(params))
+    codec = _IMAGE_CODECS.get(filters[-1]) if filters else None
+    transport = filters[:-1] if codec else filters
+
+    bpc = pdf.get(d.get('BitsPerComponent', 8))
+    color = _color_space(pdf, d.get('ColorSpace', 'DeviceGray'))
+    if codec is None:
+        if color is None:
+            return None
+        components = {'L': 1, 'P': 1, 'RGB': 3, 'CMYK': 4}[color[0]]
+        expected = height * ((width * components * bpc + 7) // 8)
+    else:
+        expected = MAX_COVER_BYTES
+
+    data = pdf.raw_stream(stream)
+    for name, parms in zip(transport, params):
+        # Marge pour l'octet de prédicteur PNG en tête de chaque ligne
+        data = _decode_filter(name, data, parms, expected + height + 1)
+
+    decode = pdf.get(d.get('Decode'))
+    inverted = isinstance(decode, list) and len(decode) >= 2 and decode[0] == 1 and decode[1] == 0
+
+    if codec in ('DCT', 'JPX'):
+        # Non décodée: make_thumbnail pourra utiliser draft()
+        return Image.open(BytesIO(data))
+    if codec == 'CCITT':
+        parms = params[-1] if isinstance(params[-1], dict) else {}
+        invert = bool(parms.get('BlackIs1')) != inverted
+        return Image.open(BytesIO(_ccitt_tiff(data, width, height, parms, invert)))
+
+    mode, palette = color
+    if mode == 'P':
+        if bpc not in (1, 2, 4, 8):
+            return None
+        image = Image.frombytes('P', (width, height), data, 'raw', 'P' if bpc == 8 else f'P;{bpc}')
+        image.putpalette(palette)
+        return image
+    if mode == 'L' and bpc == 1:
+        image = Image.frombytes('1', (width, height), data, 'raw', '1;I' if inverted else '1')
+        return image
+    if bpc != 8:
+        if mode != 'L' or bpc not in (2, 4):
+            return None
+        return Image.frombytes('L', (width, height), data, 'raw', f'L;{bpc}')
+    return Image.frombytes(mode, (width, height), data)
+
+
+def extract_pdf_cover(pdf_path: Path, time_budget: float = PDF_COVER_TIME_BUDGET,
+                      strict: bool = False) -> Optional["Image.Image"]:
+    """Couverture d'un PDF: la plus grande image de la première page (non réduite).
+
+    Pas de rendu de page: seuls les XObject Image de la page 1 sont lus
+    (JPEG, JPEG 2000, CCITT, pixels Flate), ce qui suffit pour les scans
+    (une image par page). Au-delà de `time_budget` secondes ou de
+    MAX_COVER_BYTES octets encodés, la couverture est abandonnée (strict:
+    TimeoutError ou erreur de lecture levée au lieu de rendre None).
+    """
+    if Image is None:
+        return None
+
+    deadline = time.monotonic() + time_budget
+    try:
+        with PdfFile(pdf_path) as pdf:
+            if 'Encrypt' in pdf.trailer:
+                return None
+            page = _first_page(pdf)
+            if page is None:
+                return None
+            candidates = sorted(_page_images(pdf, page.get('Resources')),
+                                key=lambda c: c[0], reverse=True)
+            for _, stream in candidates:
+                _check_deadline(deadline)
+                try:
+                    image = _decode_image(pdf, stream)
+                except (PdfSyntaxError, zlib.error, ValueError, OSError):
+                    image = None
+                if image is not None:
+                    return image
+    except Exception:
+        if strict:
+            raise
+
+    return None
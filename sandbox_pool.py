@@ -0,0 +1,250 @@
+"""
+Processus de travail isolés - Limites de CPU, de mémoire et de durée par fichier
+Un fichier qui boucle ou épuise la mémoire ne tue que son processus, qui
+est remplacé ; les autres fichiers continuent d'être traités.
+"""
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from multiprocessing.connection import wait as wait_ready
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: seul le délai d'horloge s'applique
+    resource = None
+
+# Temps CPU et mémoire (espace d'adressage) accordés par fichier
+SANDBOX_CPU_SECONDS = 60
+SANDBOX_MEMORY_BYTES = 1024 * 1024 * 1024
+# Délai d'horloge: temps CPU + marge (disque lent, processus en attente)
+SANDBOX_WALL_MARGIN = 30
+
+# (événement, job, contenu) rendus par SandboxPool.run :
+#   'item'   : valeur produite par la fonction (générateur) pour ce job
+#   'done'   : durée du job en secondes
+#   'failed' : (erreur, message, durée) ; erreur = classe de l'exception,
+#              ou SIGXCPU (temps CPU), TimeoutError (délai), signal/code de sortie
+SandboxEvent = Tuple[str, Any, Any]
+
+
+def _set_cpu_limit(seconds: int):
+    """Limite CPU du processus = temps déjà consommé + `seconds` (SIGXCPU au-delà)"""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker(conn, func: Callable, cpu_seconds: int, memory_bytes: int):
+    """Boucle d'un processus de travail: reçoit (n°, job), renvoie ses valeurs une à une"""
+    if resource is not None and memory_bytes:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        except (ValueError, OSError):
+            pass
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        task_id, job = task
+        if resource is not None and cpu_seconds:
+            try:
+                _set_cpu_limit(cpu_seconds)
+            except (ValueError, OSError):
+                pass
+        try:
+            for item in func(job):
+                conn.send(('item', task_id, item))
+            conn.send(('done', task_id, None))
+        except MemoryError:
+            conn.send(('failed', task_id, ('MemoryError', "mémoire insuffisante")))
+        except Exception as e:
+            conn.send(('failed', task_id, (type(e).__name__, str(e)[:300])))
+
+
+class _Slot:
+    """Un processus de travail et le job qu'il traite"""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.job = None
+        self.task_id = -1
+        self.started = 0.0
+        self.deadline = 0.0
+        self.tasks = 0
+
+
+class SandboxPool:
+    """Pool de processus (méthode spawn) pour des fonctions fragiles.
+
+    `func(job)` est un générateur exécuté dans un processus de travail ;
+    ses valeurs sont rendues au fil de l'eau par `run`. Chaque job dispose
+    de `cpu_seconds` de temps CPU (RLIMIT_CPU, le noyau tue le processus
+    au-delà) et le processus de `memory_bytes` d'espace d'adressage
+    (RLIMIT_AS, hors Windows). Un job qui dépasse son délai d'horloge est
+    tué. Un processus tué est remplacé au job suivant ; un processus est
+    aussi remplacé après `max_tasks` jobs (mémoire rendue au système).
+    """
+
+    def __init__(self, func: Callable[[Any], Iterator[Any]],
+                 workers: Optional[int] = None,
+                 cpu_seconds: int = SANDBOX_CPU_SECONDS,
+                 memory_bytes: int = SANDBOX_MEMORY_BYTES,
+                 max_tasks: int = 0):
+        self.func = func
+        self.workers = workers or os.cpu_count() or 1
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.max_tasks = max_tasks
+        self.wall_seconds = cpu_seconds + SANDBOX_WALL_MARGIN
+
+        self.killed = 0
+        self.spawned = 0
+        self._context = multiprocessing.get_context('spawn')
+        self._next_id = 0
+
+    def run(self, jobs: Iterable, cancel: threading.Event) -> Iterator[SandboxEvent]:
+        """Traiter `jobs` ; s'arrête (processus arrêtés) dès que `cancel` est levé"""
+        remaining = iter(jobs)
+        slots: List[Optional[_Slot]] = [None] * self.workers
+        exhausted = False
+        try:
+            while not cancel.is_set():
+                for i, slot in enumerate(slots):
+                    if exhausted or (slot is not None and slot.job is not None):
+                        continue
+                    job = next(remaining, None)
+                    if job is None:
+                        exhausted = True
+                        break
+                    if slot is None:
+                        slot = slots[i] = self._spawn()
+                    try:
+                        self._assign(slot, job)
+                    except OSError:
+                        # Processus mort au repos (mémoire, ...): remplacé, job renvoyé une fois
+                        self._kill(slot)
+                        slot = slots[i] = self._spawn()
+                        try:
+                            self._assign(slot, job)
+                        except OSError as e:
+                            self._kill(slot)
+                            slots[i] = None
+                            yield 'failed', job, (type(e).__name__, str(e) or "envoi impossible", 0.0)
+
+                busy = [s for s in slots if s is not None and s.job is not None]
+                if not busy:
+                    if exhausted:
+                        return
+                    continue  # envois tous en échec: jobs suivants
+
+                timeout = max(0.0, min(min(s.deadline for s in busy) - time.monotonic(), 0.5))
+                ready = set(wait_ready([s.conn for s in busy] + [s.process.sentinel for s in busy], timeout))
+                for i, slot in enumerate(slots):
+                    if slot is None or slot.job is None:
+                        continue
+                    if slot.conn in ready or slot.process.sentinel in ready:
+                        yield from self._receive(slot)
+                    if slot.job is None:
+                        if self.max_tasks and slot.tasks >= self.max_tasks:
+                            self._retire(slot)
+                            slots[i] = None
+                        continue
+                    if not slot.process.is_alive():
+                        job, elapsed = slot.job, time.monotonic() - slot.started
+                        error, message = self._exit_reason(slot.process)
+                        slots[i] = None
+                        self.killed += 1
+                        yield 'failed', job, (error, message, elapsed)
+                    elif time.monotonic() > slot.deadline:
+                        job, elapsed = slot.job, time.monotonic() - slot.started
+                        self._kill(slot)
+                        slots[i] = None
+                        yield 'failed', job, ('TimeoutError', f"délai dépassé ({self.wall_seconds} s)", elapsed)
+        finally:
+            for slot in slots:
+                if slot is not None:
+                    if slot.job is None:
+                        self._retire(slot)
+                    else:
+                        self._kill(slot)
+
+    # ---------------- Processus ----------------
+
+    def _spawn(self) -> _Slot:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=_worker,
+                                        args=(child, self.func, self.cpu_seconds, self.memory_bytes),
+                                        name="SandboxWorker", daemon=True)
+        process.start()
+        child.close()
+        self.spawned += 1
+        return _Slot(process, parent)
+
+    def _assign(self, slot: _Slot, job):
+        self._next_id += 1
+        slot.job = job
+        slot.task_id = self._next_id
+        slot.started = time.monotonic()
+        slot.deadline = slot.started + self.wall_seconds
+        slot.conn.send((slot.task_id, job))
+
+    def _receive(self, slot: _Slot) -> Iterator[SandboxEvent]:
+        """Messages disponibles du processus de `slot` (jusqu'à la fin de son job)"""
+        while slot.job is not None:
+            try:
+                if not slot.conn.poll():
+                    return
+                kind, task_id, payload = slot.conn.recv()
+            except (EOFError, OSError):
+                return  # processus mort: traité par l'appelant
+            if task_id != slot.task_id:
+                continue
+            if kind == 'item':
+                yield 'item', slot.job, payload
+            else:
+                job, elapsed = slot.job, time.monotonic() - slot.started
+                slot.job = None
+                slot.tasks += 1
+                yield kind, job, (elapsed if kind == 'done' else (*payload, elapsed))
+
+    def _exit_reason(self, process) -> Tuple[str, str]:
+        process.join(0.1)
+        code = process.exitcode
+        if code is not None and code < 0:
+            sig = -code
+            if sig == getattr(signal, 'SIGXCPU', None):
+                return 'SIGXCPU', f"temps CPU dépassé ({self.cpu_seconds} s)"
+            if sig == getattr(signal, 'SIGKILL', None):
+                return 'SIGKILL', "processus tué (mémoire ?)"
+            return f"signal {sig}", "processus tué"
+        return f"code {code}", "processus terminé"
+
+    def _kill(self, slot: _Slot):
+        self.killed += 1
+        slot.process.kill()
+        slot.process.join(1)
+        slot.conn.close()
+
+    @staticmethod
+    def _retire(slot: _Slot):
+        try:
+            slot.conn.send(None)
+        except OSError:
+            pass
+        slot.process.join(1)
+        if slot.process.is_alive():
+            slot.process.kill()
+            slot.process.join(1)
+        slot.conn.close()
@@ -0,0 +1,70 @@
+"""
+Scan des dossiers - Parcours unique avec os.scandir
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List
+
+BOOK_EXTENSIONS = {'.epub': 'epub', '.pdf': 'pdf'}
+
+
+def book_type_for(name: str) -> str:
+    """Type de livre d'après l'extension (insensible à la casse), '' sinon"""
+    dot = name.rfind('.')
+    if dot <= 0:
+        return ''
+    return BOOK_EXTENSIONS.get(name[dot:].lower(), '')
+
+
+def scan_books(directory: Path, recursive: bool = False) -> List[Dict]:
+    """Lister dossiers, EPUB et PDF en un seul parcours.
+
+    Chaque répertoire n'est lu qu'une fois et la taille/mtime viennent du
+    DirEntry (sans appel stat() supplémentaire sous Windows). En mode
+    récursif seuls les livres sont retournés, comme l'ancien rglob, et les
+    liens symboliques vers des dossiers ne sont pas suivis (pas de boucle).
+    """
+    entries: List[Dict] = []
+    pending = [str(directory)]
+
+    while pending:
+        current = pending.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+
+        with it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=not recursive):
+                        if recursive:
+                            pending.append(entry.path)
+                        elif not name.startswith('.'):
+                            entries.append({
+                                'name': name,
+                                'path': Path(entry.path),
+                                'type': 'folder',
+                                'size': 0
+                            })
+                        continue
+
+                    book_type = book_type_for(name)
+                    if not book_type or not entry.is_file():
+                        continue
+
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                entries.append({
+                    'name': name,
+                    'path': Path(entry.path),
+                    'type': book_type,
+                    'size': st.st_size,
+                    'mtime': st.st_mtime
+                })
+
+    return entries
@@ -0,0 +1,215 @@
+"""
+Recherche plein texte - Index SQLite FTS5 sur la table `books`
+Table virtuelle à contenu externe tenue à jour par des triggers, requêtes
+classées (bm25) avec préfixes, phrases exactes et filtres par colonne.
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Colonnes indexées et poids bm25 (même ordre)
+FTS_COLUMNS = ('name', 'title', 'author', 'publisher', 'description')
+FTS_WEIGHTS = (4.0, 10.0, 8.0, 2.0, 1.0)
+
+# Nombre maximal de résultats classés renvoyés par une recherche
+SEARCH_MAX_RESULTS = 5000
+# bm25 coûte ~2 µs par ligne trouvée: au-delà, seul le sous-ensemble
+# trouvé dans les noms/titres/auteurs est classé
+BM25_MAX_MATCHES = 15000
+
+# Préfixes de filtre par colonne acceptés dans la saisie (« auteur:hugo »)
+COLUMN_ALIASES = {
+    'nom': 'name', 'name': 'name', 'fichier': 'name',
+    'titre': 'title', 'title': 'title',
+    'auteur': 'author', 'author': 'author',
+    'editeur': 'publisher', 'éditeur': 'publisher', 'publisher': 'publisher',
+    'description': 'description', 'resume': 'description', 'résumé': 'description',
+}
+
+_OPERATORS = ('AND', 'OR', 'NOT')
+_TOKEN = re.compile(r'(?:([^\s:"]+):)?(?:"([^"]*)"?|(\S+))')
+_REGEX_SUFFIX = re.compile(r'(?:^|\s)re:(.*)$')
+
+
+def init_search_index(con: sqlite3.Connection) -> bool:
+    """Créer la table FTS5 et ses triggers. False si FTS5 est indisponible.
+
+    Ne valide pas: à appeler dans la transaction d'écriture de l'appelant.
+    """
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+    old_values = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+
+    exists = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'").fetchone()
+    try:
+        con.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            {columns},
+            content='books', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"Recherche plein texte indisponible (FTS5): {e}")
+        return False
+
+    con.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, {columns}) VALUES (new.id, {new_values});
+    END
+    """)
+    con.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+    END
+    """)
+    con.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF {columns} ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        INSERT INTO books_fts(rowid, {columns}) VALUES (new.id, {new_values});
+    END
+    """)
+
+    if not exists:
+        # Base existante: indexer les livres déjà présents
+        con.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+    return True
+
+
+def path_range(directory: Path) -> Tuple[str, str]:
+    """Bornes [début, fin) des chemins sous `directory` (intervalle sur l'index de path)"""
+    prefix = str(directory)
+    if not prefix.endswith(os.sep):
+        prefix += os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def scope_filter(directory: Optional[Path], recursive: bool, column: str = 'b.path') -> Tuple[str, Tuple]:
+    """(condition SQL, paramètres) limitant `column` au dossier affiché ; vide sans dossier"""
+    if directory is None:
+        return "", ()
+    prefix, upper = path_range(directory)
+    sql = f" AND {column} >= ? AND {column} < ?"
+    params: Tuple = (prefix, upper)
+    if not recursive:
+        # Pas de séparateur après le préfixe: fichier directement dans le dossier
+        sql += f" AND instr(substr({column}, ?), ?) = 0"
+        params += (len(prefix) + 1, os.sep)
+    return sql, params
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def parse_search(text: str) -> Tuple[str, Optional[str]]:
+    """Saisie utilisateur -> (requête FTS5, motif regex de post-filtrage ou None).
+
+    - mot         : préfixe (« mis » trouve « Misérables »)
+    - "une phrase": phrase exacte
+    - auteur:hugo, titre:"les mis" : restreint à une colonne
+    - AND / OR / NOT : opérateurs FTS5 (les mots sont combinés par AND)
+    - re:motif    : en fin de saisie, regex appliquée aux résultats
+    """
+    regex = None
+    m = _REGEX_SUFFIX.search(text)
+    if m:
+        regex = m.group(1).strip() or None
+        text = text[:m.start()]
+
+    terms = []
+    for m in _TOKEN.finditer(text):
+        prefix, phrase, word = m.groups()
+        column = COLUMN_ALIASES.get(prefix.lower()) if prefix else None
+        if prefix and column is None:
+            # « 12:30 » ou préfixe inconnu: recherché tel quel
+            word = f"{prefix}:{phrase if phrase is not None else word or ''}"
+            phrase = None
+
+        if phrase is not None:
+            if not phrase.strip():
+                continue
+            term = _quote(phrase)
+        else:
+            if word in _OPERATORS and not column:
+                if terms and terms[-1] not in _OPERATORS:
+                    terms.append(word)
+                continue
+            word = word.rstrip('*')
+            if not word:
+                continue
+            term = _quote(word) + '*'
+
+        terms.append(f"{column} : {term}" if column else term)
+
+    while terms and terms[-1] in _OPERATORS:
+        terms.pop()
+    return ' '.join(terms), regex
+
+
+def _count(con: sqlite3.Connection, fts_query: str, scope: Tuple[str, Tuple]) -> int:
+    where, params = scope
+    return con.execute(f"""
+        SELECT count(*) FROM books_fts JOIN books b ON b.id = books_fts.rowid
+        WHERE books_fts MATCH ?{where}
+    """, (fts_query, *params)).fetchone()[0]
+
+
+def _match_ids(con: sqlite3.Connection, fts_query: str, limit: int, ranked: bool,
+               scope: Tuple[str, Tuple]) -> List[int]:
+    """Ids trouvés dans le dossier affiché ; LIMIT appliqué après ce filtre"""
+    where, params = scope
+    order = f"ORDER BY bm25(books_fts, {', '.join(str(w) for w in FTS_WEIGHTS)})" if ranked else ""
+    cur = con.execute(f"""
+        SELECT books_fts.rowid FROM books_fts JOIN books b ON b.id = books_fts.rowid
+        WHERE books_fts MATCH ?{where} {order} LIMIT ?
+    """, (fts_query, *params, limit))
+    return [row[0] for row in cur]
+
+
+def _rows_by_id(con: sqlite3.Connection, ids: List[int]) -> List[Tuple[str, str, str, str]]:
+    """Lignes de `books` dans l'ordre de `ids`, une requête par lot"""
+    found = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        for row in con.execute(f"SELECT id, path, name, author, publisher FROM books WHERE id IN ({marks})",
+                               chunk):
+            found[row[0]] = row[1:]
+    return [found[i] for i in ids if i in found]
+
+
+def search(con: sqlite3.Connection, fts_query: str,
+           limit: int = SEARCH_MAX_RESULTS,
+           directory: Optional[Path] = None,
+           recursive: bool = False) -> List[Tuple[str, str, str, str]]:
+    """Livres correspondant à la requête, du plus pertinent au moins pertinent.
+
+    La base garde tous les dossiers déjà ouverts: avec `directory`, seuls
+    les livres de ce dossier (et sous-dossiers si `recursive`) sont
+    cherchés, avant classement et limite.
+
+    Retourne [(chemin, nom, auteur, éditeur)] ; lève sqlite3.OperationalError
+    si la requête FTS5 est invalide.
+    """
+    scope = scope_filter(directory, recursive)
+    if _count(con, fts_query, scope) <= BM25_MAX_MATCHES:
+        ids = _match_ids(con, fts_query, limit, True, scope)
+    else:
+        # Requête peu sélective: d'abord les livres trouvés dans nom/titre/auteur
+        # (classés s'ils restent peu nombreux), puis les autres sans classement.
+        # Sans NOT, une correspondance dans ces colonnes implique la requête entière.
+        head_query = f"{{name title author}} : ({fts_query})"
+        if 'NOT' in fts_query.split():
+            head_query = f"({fts_query}) AND {head_query}"
+        ids = _match_ids(con, head_query, limit, _count(con, head_query, scope) <= BM25_MAX_MATCHES, scope)
+        if len(ids) < limit:
+            seen = set(ids)
+            rest = [i for i in _match_ids(con, fts_query, limit + len(ids), False, scope) if i not in seen]
+            ids += rest[:limit - len(ids)]
+    return _rows_by_id(con, ids)
@@ -0,0 +1,134 @@
+"""
+Recherche en arrière-plan - Un thread de travail, une recherche à la fois
+La boucle principale récupère les résultats au fil de l'eau (`collect`) et
+continue de rendre l'interface pendant la recherche.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# (type, contenu) ; types produits par les recherches :
+#   'matches'  : [livre, ...] à ajouter aux résultats
+#   'content'  : [(livre, chapitre, titre du chapitre, extrait)] trouvés dans le texte
+#   'metadata' : {chemin: métadonnées} lues ou analysées pendant la recherche
+#   'progress' : (traités, total)
+# ajoutés par SearchJob :
+#   'done'     : durée en secondes
+#   'error'    : message
+SearchMessage = Tuple[str, Any]
+Producer = Callable[["SearchJob", threading.Event], Iterator[SearchMessage]]
+
+# Résultats envoyés par lot (classés) ou au plus tard toutes les 50 ms (filtres)
+SEARCH_BATCH = 200
+SEARCH_FLUSH_SECONDS = 0.05
+# Messages traités par frame par la boucle principale
+SEARCH_MESSAGES_PER_FRAME = 20
+
+
+class SearchJob:
+    """Exécute des recherches (générateurs de messages) dans un thread dédié.
+
+    `start` annule la recherche en cours et programme la nouvelle ; les
+    messages d'une recherche annulée ne sont jamais rendus par `collect`.
+    Le thread est conservé d'une recherche à l'autre (sa connexion SQLite
+    de lecture aussi).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._next: Optional[Tuple[Producer, threading.Event, "queue.Queue[SearchMessage]"]] = None
+        self._cancel = threading.Event()
+        self._results: "queue.Queue[SearchMessage]" = queue.Queue()
+        self._interrupt: Optional[Callable[[], None]] = None
+        self._active = threading.Event()
+        self._running = False
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._work, name="SearchJob", daemon=True)
+        self._thread.start()
+
+    # ---------------- Contrôle (thread principal) ----------------
+
+    def start(self, producer: Producer):
+        with self._cond:
+            self._cancel_current()
+            self._cancel = threading.Event()
+            self._results = queue.Queue()
+            self._next = (producer, self._cancel, self._results)
+            self._running = True
+            self._cond.notify()
+
+    def cancel(self) -> bool:
+        """Annuler la recherche en cours ou programmée. True s'il y en avait une."""
+        with self._cond:
+            was_running = self._running
+            self._cancel_current()
+            self._next = None
+            self._running = False
+            return was_running
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def collect(self, limit: int) -> List[SearchMessage]:
+        """Messages de la recherche courante (au plus `limit`), sans attendre"""
+        messages = []
+        while len(messages) < limit:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] in ('done', 'error'):
+                self._running = False
+            messages.append(message)
+        return messages
+
+    def stop(self):
+        with self._cond:
+            self._cancel_current()
+            self._next = None
+            self._stopped = True
+            self._cond.notify()
+
+    def _cancel_current(self):
+        self._cancel.set()
+        interrupt = self._interrupt
+        if interrupt is not None:
+            interrupt()
+
+    # ---------------- Thread ----------------
+
+    def on_cancel(self, interrupt: Optional[Callable[[], None]]):
+        """Appelé par une recherche: fonction qui interrompt son opération bloquante
+        (ex. `sqlite3.Connection.interrupt`), None pour la retirer"""
+        with self._cond:
+            self._interrupt = interrupt
+            if interrupt is not None and self._active.is_set():
+                interrupt()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while self._next is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                producer, cancel, results = self._next
+                self._next = None
+                self._active = cancel
+
+            t0 = time.perf_counter()
+            try:
+                for message in producer(self, cancel):
+                    if cancel.is_set():
+                        break
+                    results.put(message)
+                else:
+                    results.put(('done', time.perf_counter() - t0))
+            except Exception as e:
+                if not cancel.is_set():
+                    results.put(('error', str(e)))
+            finally:
+                self.on_cancel(None)
@@ -0,0 +1,79 @@
+"""
+Cache LRU de surfaces limité en octets
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import pygame
+
+# Coût forfaitaire d'une entrée sans surface (livre sans couverture)
+EMPTY_ENTRY_BYTES = 64
+
+
+def surface_bytes(surface: Optional[pygame.Surface]) -> int:
+    """Mémoire occupée par les pixels d'une surface"""
+    if surface is None:
+        return EMPTY_ENTRY_BYTES
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceCache:
+    """LRU en O(1) (OrderedDict) dont la limite porte sur la mémoire des pixels.
+
+    Une valeur None est une entrée valide (« pas d'image ») : utiliser
+    `lookup` pour distinguer absence et None.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[pygame.Surface], int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Optional[pygame.Surface]]:
+        """(trouvé, surface), marque l'entrée comme récemment utilisée"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key: Hashable, surface: Optional[pygame.Surface]):
+        self.pop(key)
+        size = surface_bytes(surface)
+        self._entries[key] = (surface, size)
+        self.current_bytes += size
+
+        # Toujours garder la dernière entrée, même si elle dépasse seule le budget
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.current_bytes -= old_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats_text(self) -> str:
+        return (f"{self.current_bytes / (1024 * 1024):.1f}/{self.max_bytes / (1024 * 1024):.0f} Mo, "
+                f"{self.hit_rate() * 100:.0f}% hits, {self.evictions} évictions")
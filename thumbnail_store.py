@@ -0,0 +1,168 @@
+"""
+Cache persistant des vignettes - Table SQLite `thumbnails` dans books.db
+Vignettes déjà réduites, clé (chemin, taille, mtime), budget disque + LRU
+"""
+
+import threading
+import time
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from library_db import LibraryDB
+
+# (mode, (largeur, hauteur), image encodée) ; mode None = livre sans couverture
+StoredThumbnail = Tuple[Optional[str], Tuple[int, int], bytes]
+
+# À incrémenter quand la production des vignettes change: les entrées
+# d'une version antérieure sont ignorées puis réécrites.
+# 2 : couvertures P/L/LA/CMYK prises en charge (auparavant « sans couverture »)
+# 3 : couvertures PDF (image de la première page)
+FORMAT_VERSION = 3
+
+# Les dates de dernière lecture sont gardées en mémoire et écrites par lot
+# au plus toutes les ACCESS_FLUSH_SECONDS (et avant chaque purge) ; l'ordre
+# LRU n'a pas besoin d'être plus précis.
+ACCESS_FLUSH_SECONDS = 30.0
+
+
+class ThumbnailStore:
+    """Vignettes encodées (JPEG pour RGB, PNG pour RGBA) stockées dans SQLite.
+
+    Une entrée n'est valide que si taille et mtime du fichier n'ont pas
+    changé. Quand le total dépasse `max_bytes`, les vignettes les moins
+    récemment lues sont supprimées. Utilisable depuis plusieurs threads
+    (lectures sur la connexion du thread, écritures sur celle de `db`).
+    Une lecture n'écrit rien: les dates d'accès sont écrites par lot.
+    """
+
+    def __init__(self, db: LibraryDB, max_bytes: int = 256 * 1024 * 1024):
+        self.db = db
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+
+        with db.write("vignettes: schéma") as con:
+            con.execute("""
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                path TEXT PRIMARY KEY,
+                file_size INTEGER,
+                mtime REAL,
+                mode TEXT,
+                width INTEGER,
+                height INTEGER,
+                data BLOB,
+                bytes INTEGER,
+                last_access REAL,
+                version INTEGER
+            )
+            """)
+            columns = {row[1] for row in con.execute("PRAGMA table_info(thumbnails)")}
+            if 'version' not in columns:
+                con.execute("ALTER TABLE thumbnails ADD COLUMN version INTEGER")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_thumbnails_access ON thumbnails(last_access)")
+            self.total_bytes = con.execute("SELECT COALESCE(SUM(bytes), 0) FROM thumbnails").fetchone()[0]
+
+    # ---------------- Lecture ----------------
+
+    def get_many(self, keys: List[Tuple[str, int, float]]) -> Dict[str, StoredThumbnail]:
+        """Vignettes valides pour des (chemin, taille, mtime), en une requête par lot"""
+        found: Dict[str, StoredThumbnail] = {}
+        if not keys:
+            return found
+
+        wanted = {path: (size, mtime) for path, size, mtime in keys}
+        paths = list(wanted)
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self.db.query(f"""
+                SELECT path, file_size, mtime, mode, width, height, data, version
+                FROM thumbnails WHERE path IN ({marks})
+            """, chunk, label="vignettes: lecture")
+            for path, size, mtime, mode, w, h, data, version in rows:
+                if wanted[path] == (size, mtime) and version == FORMAT_VERSION:
+                    found[path] = (mode, (w, h), data or b'')
+
+        if found:
+            now = time.time()
+            with self._lock:
+                self._accessed.update(dict.fromkeys(found, now))
+                if time.monotonic() - self._flushed_at >= ACCESS_FLUSH_SECONDS:
+                    self._flush_access()
+        return found
+
+    def get(self, path: str, size: int, mtime: float) -> Optional[StoredThumbnail]:
+        return self.get_many([(path, size, mtime)]).get(path)
+
+    # ---------------- Écriture ----------------
+
+    def put(self, path: str, size: int, mtime: float, image: Optional["Image.Image"]):
+        """Enregistrer une vignette (ou l'absence de couverture si image=None)"""
+        mode, w, h, data = None, 0, 0, b''
+        if image is not None:
+            buf = BytesIO()
+            if image.mode == 'RGBA':
+                image.save(buf, 'PNG', optimize=False)
+            else:
+                image.save(buf, 'JPEG', quality=90)
+            mode, (w, h), data = image.mode, image.size, buf.getvalue()
+
+        with self._lock:
+            self._accessed.pop(path, None)
+            with self.db.write("vignettes: écriture") as con:
+                old = con.execute("SELECT bytes FROM thumbnails WHERE path = ?", (path,)).fetchone()
+                con.execute("""
+                    INSERT OR REPLACE INTO thumbnails(path, file_size, mtime, mode, width, height, data, bytes,
+                                                      last_access, version)
+                    VALUES(?,?,?,?,?,?,?,?,?,?)
+                """, (path, size, mtime, mode, w, h, data, len(data), time.time(), FORMAT_VERSION))
+            self.total_bytes += len(data) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._prune()
+
+    def flush(self):
+        """Écrire les dates de dernière lecture en attente (à appeler avant de fermer la base)"""
+        with self._lock:
+            self._flush_access()
+
+    def _flush_access(self):
+        # Appelé avec self._lock
+        self._flushed_at = time.monotonic()
+        if not self._accessed:
+            return
+        accessed, self._accessed = self._accessed, {}
+        with self.db.write("vignettes: dernier accès") as con:
+            con.executemany("UPDATE thumbnails SET last_access = ? WHERE path = ?",
+                            [(t, p) for p, t in accessed.items()])
+
+    def _prune(self):
+        """Supprimer les vignettes les moins récemment lues (jusqu'à 90% du budget)"""
+        self._flush_access()
+        target = int(self.max_bytes * 0.9)
+        to_delete = []
+        freed = 0
+        with self.db.write("vignettes: purge") as con:
+            for path, size in con.execute("SELECT path, bytes FROM thumbnails ORDER BY last_access"):
+                if self.total_bytes - freed <= target:
+                    break
+                to_delete.append((path,))
+                freed += size or 0
+            con.executemany("DELETE FROM thumbnails WHERE path = ?", to_delete)
+        self.total_bytes -= freed
+        print(f"Cache disque: {len(to_delete)} vignette(s) supprimée(s), "
+              f"{self.total_bytes / (1024 * 1024):.1f} Mo utilisés")
+
+
+def decode_thumbnail(stored: StoredThumbnail) -> Optional["Image.Image"]:
+    """Décoder une vignette stockée en image PIL (None si sans couverture)"""
+    mode, _, data = stored
+    if not mode or Image is None:
+        return None
+    image = Image.open(BytesIO(data))
+    return image.convert(mode) if image.mode != mode else image